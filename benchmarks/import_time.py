@@ -0,0 +1,67 @@
+"""Import time of the package and of its entry points.
+
+Each scenario runs in a fresh interpreter, so nothing is cached between runs. The median is reported in milliseconds.
+With `--max-ms`, the script fails (exit code 1) when `import dragiyski.ui` is slower than the limit or loads libSDL2.
+
+    python benchmarks/import_time.py --runs 20 --max-ms 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+scenarios = {
+    'import': 'import dragiyski.ui',
+    'display': 'import dragiyski.ui; dragiyski.ui.display',
+    'window': 'import dragiyski.ui; dragiyski.ui.Window'
+}
+
+measure = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, 'sdl2' in sys.modules)
+'''
+
+
+def run(statement: str, runs: int):
+    environment = dict(os.environ)
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    environment['PYTHONPATH'] = os.pathsep.join([source, environment.get('PYTHONPATH', '')])
+    times = []
+    sdl_loaded = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', measure.format(statement=statement)],
+            env=environment, capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(output[0]))
+        sdl_loaded = output[1] == 'True'
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'sdl2_loaded': sdl_loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None, help='fail if `import dragiyski.ui` is slower')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    options = parser.parse_args()
+
+    results = {name: run(statement, options.runs) for (name, statement) in scenarios.items()}
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for (name, result) in results.items():
+            print(f'{name:10} median {result["median_ms"]:8.2f} ms  min {result["min_ms"]:8.2f} ms  sdl2 loaded: {result["sdl2_loaded"]}')
+    if options.max_ms is not None:
+        result = results['import']
+        if result['sdl2_loaded'] or result['median_ms'] > options.max_ms:
+            print(f'FAIL: `import dragiyski.ui` took {result["median_ms"]:.2f} ms (limit {options.max_ms} ms), sdl2 loaded: {result["sdl2_loaded"]}', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
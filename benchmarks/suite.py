@@ -0,0 +1,324 @@
+"""Latency, throughput and memory of the hot paths: event thread calls, event pump, listeners, windows and geometry.
+
+Runs headless (see `dragiyski.ui.headless`) unless `SDL_VIDEODRIVER` is set. The results are written as JSON (with
+`--output`) so that runs of different versions can be compared. Times are in nanoseconds.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --only execute --only geometry
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+
+import dragiyski.ui as ui
+
+if 'SDL_VIDEODRIVER' not in os.environ:
+    ui.headless.enable()
+
+
+def latency(function, count: int) -> dict:
+    """Call a function `count` times and report the distribution of the call time."""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        function()
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return {
+        'count': count,
+        'median_ns': statistics.median(samples),
+        'p99_ns': samples[min(count - 1, int(count * 0.99))],
+        'min_ns': samples[0],
+        'per_second': count / (sum(samples) / 1e9)
+    }
+
+
+def bench_execute(options) -> dict:
+    from dragiyski.ui._thread import get_event_thread
+
+    def noop():
+        pass
+
+    thread = get_event_thread()
+    thread.execute(noop)
+    result = {'round_trip': latency(lambda: thread.execute(noop), options.count)}
+    start = time.perf_counter_ns()
+    tasks = [thread.post(noop) for _ in range(options.count)]
+    tasks[-1].wait()
+    elapsed = time.perf_counter_ns() - start
+    result['post_throughput'] = {'count': options.count, 'total_ns': elapsed, 'per_second': options.count / (elapsed / 1e9)}
+    return result
+
+
+def bench_event_pump(options) -> dict:
+    from sdl2 import SDL_Event, SDL_PushEvent, SDL_USEREVENT, SDL_WINDOWEVENT, SDL_WINDOWEVENT_EXPOSED
+    from dragiyski.ui._thread import get_event_thread
+    window = ui.Window.create(title='suite', position=ui.Window.Position(0, 0, 64, 64), visible=False)
+    try:
+        thread = get_event_thread()
+        result = {}
+        for (name, event_type) in (('user_event', SDL_USEREVENT), ('window_event', SDL_WINDOWEVENT)):
+            event = SDL_Event()
+            event.type = event_type
+            if event_type == SDL_WINDOWEVENT:
+                event.window.windowID = window.id
+                event.window.event = SDL_WINDOWEVENT_EXPOSED
+            # Stay below the capacity of the libSDL2 event queue (65535 events).
+            batch = min(options.count, 10000)
+            total = 0
+            start = time.perf_counter_ns()
+            while total < options.count:
+                for _ in range(batch):
+                    SDL_PushEvent(event)
+                # Tasks are processed after the events queued before them.
+                thread.execute(lambda: None)
+                total += batch
+            elapsed = time.perf_counter_ns() - start
+            result[name] = {'count': total, 'total_ns': elapsed, 'per_second': total / (elapsed / 1e9)}
+        return result
+    finally:
+        window.destroy()
+
+
+def bench_emit(options) -> dict:
+    from dragiyski.ui._event_emitter import EventEmitter
+    result = {}
+    for listener_count in (1, 10, 100, 1000):
+        emitter = EventEmitter()
+        done = threading.Event()
+        lock = threading.Lock()
+        remaining = [0]
+
+        def listener():
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        for _ in range(listener_count):
+            # Distinct callables, the emitter ignores duplicates.
+            emitter.add_event_listener('benchmark', lambda: listener())
+
+        def emit():
+            done.clear()
+            remaining[0] = listener_count
+            emitter.emit_event('benchmark')
+            done.wait()
+
+        result[str(listener_count)] = latency(emit, max(1, options.count // listener_count))
+    return result
+
+
+def bench_listener_scaling(options) -> dict:
+    """Throughput of CPU-bound listeners by the size of the listener pool; scales only on free-threaded Python builds."""
+    from dragiyski.ui import _event_emitter
+    emitter = _event_emitter.EventEmitter()
+    done = threading.Event()
+    lock = threading.Lock()
+    remaining = [0]
+
+    def listener(iterations):
+        total = 0
+        for index in range(iterations):
+            total += index * index
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    emitter.add_event_listener('benchmark', listener)
+    iterations = 2000
+    count = max(1, options.count // 10)
+    result = {}
+    try:
+        for workers in (1, 2, 4, 8):
+            _event_emitter.set_max_workers(workers)
+            done.clear()
+            remaining[0] = count
+            start = time.perf_counter_ns()
+            for _ in range(count):
+                emitter.emit_event('benchmark', iterations)
+            done.wait()
+            elapsed = time.perf_counter_ns() - start
+            result[str(workers)] = {'count': count, 'total_ns': elapsed, 'per_second': count / (elapsed / 1e9)}
+    finally:
+        _event_emitter.set_max_workers(None)
+    return result
+
+
+def bench_window_lifecycle(options) -> dict:
+    """Create and destroy windows with weak listeners of a short-lived view; the retained memory should stay flat."""
+    import gc
+    import tracemalloc
+    from dragiyski.ui._event_emitter import EventEmitter
+    emitter = EventEmitter()
+
+    class View:
+        def __init__(self):
+            self.payload = bytearray(65536)
+
+        def on_event(self, *args):
+            pass
+
+    def cycle():
+        window = ui.Window.create(title='suite', position=ui.Window.Position(0, 0, 64, 64), visible=False)
+        view = View()
+        emitter.add_event_listener('view', view.on_event, weak=True)
+        ui.ui_event('window_resized', window=window)(view.on_event)
+        window.destroy()
+
+    count = max(1, options.count // 10)
+    for _ in range(min(count, 50)):
+        cycle()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        result = {'cycle': latency(cycle, count)}
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    result['memory'] = {'count': count, 'retained_bytes': retained, 'retained_per_cycle': retained / count}
+    return result
+
+
+def bench_command_buffer(options) -> dict:
+    import numpy
+    window = ui.Window.create(title='suite', position=ui.Window.Position(0, 0, 256, 256), visible=False)
+    try:
+        renderer = window.renderer(software=True)
+        commands = ui.CommandBuffer()
+        rectangles = numpy.random.default_rng(0).integers(0, 128, (1000, 4), dtype=numpy.int32)
+        count = max(1, options.count // 100)
+
+        def record_each():
+            commands.reset()
+            for (x, y, width, height) in rectangles.tolist():
+                commands.fill_rect(x, y, width, height)
+
+        def record_bulk():
+            commands.reset()
+            commands.fill_rects(rectangles)
+
+        result = {'record_1000': latency(record_each, count), 'record_1000_bulk': latency(record_bulk, count)}
+        result['submit_1000'] = latency(lambda: renderer.submit(commands), count)
+        return result
+    finally:
+        window.destroy()
+
+
+def bench_primitives(options) -> dict:
+    """Vectorized drawing on a software renderer; `primitives_per_second` counts points, line segments or rectangles.
+
+    libSDL2 batches the render commands, so the rasterization of points and rectangles may be deferred to `present()`.
+    """
+    import numpy
+    window = ui.Window.create(title='suite', position=ui.Window.Position(0, 0, 512, 512), visible=False)
+    try:
+        renderer = window.renderer(software=True)
+        renderer.clear()
+        random = numpy.random.default_rng(0)
+        size = 10000
+        count = max(1, options.count // 100)
+        result = {}
+        for dtype in (numpy.int32, numpy.float32):
+            points = random.integers(0, 512, (size, 2)).astype(dtype)
+            rectangles = numpy.concatenate([random.integers(0, 500, (size, 2)), random.integers(1, 12, (size, 2))], axis=1).astype(dtype)
+            for (name, draw, elements) in (
+                ('draw_points', renderer.draw_points, points),
+                ('draw_lines', renderer.draw_lines, points),
+                ('fill_rects', renderer.fill_rects, rectangles),
+                ('draw_rects', renderer.draw_rects, rectangles)
+            ):
+                values = latency(lambda: draw(elements, (255, 255, 255)), count)
+                values['primitives_per_second'] = values['per_second'] * size
+                result[f'{name}_{numpy.dtype(dtype).name}'] = values
+        return result
+    finally:
+        window.destroy()
+
+
+def bench_display(options) -> dict:
+    display = ui.display
+    display.count()
+    return {
+        'count': latency(display.count, options.count),
+        'current_mode': latency(lambda: display.current_mode(0), options.count),
+        'modes': latency(lambda: display.modes(0), options.count),
+        'bounds': latency(lambda: display.bounds(0), options.count)
+    }
+
+
+def bench_geometry(options) -> dict:
+    from dragiyski.ui.geometry import Rectangle
+    rectangle = Rectangle(10, 20, 300, 200)
+    count = options.count * 10
+    return {
+        'construct': latency(lambda: Rectangle(10, 20, 300, 200), count),
+        'construct_edges': latency(lambda: Rectangle(left=10, top=10, right=309, bottom=209), count),
+        'read_edges': latency(lambda: (rectangle.left, rectangle.top, rectangle.right, rectangle.bottom), count),
+        'move_by': latency(lambda: rectangle.move_by(1, -1), count),
+        'resize_around': latency(lambda: rectangle.resize_around(0, 0, 300, 200), count)
+    }
+
+
+benchmarks = {
+    'execute': bench_execute,
+    'event_pump': bench_event_pump,
+    'emit': bench_emit,
+    'listener_scaling': bench_listener_scaling,
+    'window_lifecycle': bench_window_lifecycle,
+    'command_buffer': bench_command_buffer,
+    'primitives': bench_primitives,
+    'display': bench_display,
+    'geometry': bench_geometry
+}
+
+
+def environment() -> dict:
+    from sdl2 import SDL_GetCurrentVideoDriver, SDL_GetVersion, SDL_version
+    version = SDL_version()
+    SDL_GetVersion(version)
+    driver = SDL_GetCurrentVideoDriver()
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'gil_enabled': sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True,
+        'platform': platform.platform(),
+        'sdl': f'{version.major}.{version.minor}.{version.patch}',
+        'video_driver': driver.decode('utf-8') if driver is not None else None,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help='the number of iterations of each measurement')
+    parser.add_argument('--only', action='append', choices=sorted(benchmarks), help='run only the given benchmark (repeatable)')
+    parser.add_argument('--output', default=None, help='write the results as JSON into this file (`-` for stdout)')
+    options = parser.parse_args()
+
+    results = {}
+    for name in options.only or benchmarks:
+        results[name] = benchmarks[name](options)
+        if options.output != '-':
+            print(f'{name}:')
+            for (case, values) in results[name].items():
+                summary = ', '.join(f'{key} {value:.1f}' if isinstance(value, float) else f'{key} {value}' for key, value in values.items())
+                print(f'  {case:16} {summary}')
+    report = {'environment': environment(), 'results': results}
+    if options.output == '-':
+        print(json.dumps(report, indent=2))
+    elif options.output is not None:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
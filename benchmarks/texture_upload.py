@@ -0,0 +1,53 @@
+"""Sustained streaming texture upload throughput.
+
+Uploads full frames into a streaming texture of the software renderer and reports megapixels per second.
+Runs headless (see `dragiyski.ui.headless`) unless `SDL_VIDEODRIVER` is set.
+
+    python benchmarks/texture_upload.py --width 1920 --height 1080 --seconds 5
+"""
+import argparse
+import os
+import time
+
+import numpy
+import dragiyski.ui as ui
+from dragiyski.ui.display import PixelFormat
+
+if 'SDL_VIDEODRIVER' not in os.environ:
+    ui.headless.enable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--present', action='store_true', help='copy and present the texture after each upload')
+    options = parser.parse_args()
+
+    window = ui.Window.create(title='texture_upload', position=ui.Window.Position(0, 0, options.width, options.height), visible=False)
+    try:
+        renderer = window.renderer(software=True)
+        texture = renderer.create_texture(options.width, options.height, PixelFormat.ARGB8888)
+        frames = [numpy.full((options.height, options.width, 4), value, dtype=numpy.uint8) for value in (0, 255)]
+        count = 0
+        start = time.perf_counter()
+        deadline = start + options.seconds
+        while True:
+            texture.upload(frames[count & 1])
+            if options.present:
+                renderer.copy(texture)
+                renderer.present()
+            count += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+        elapsed = now - start
+        megapixels = count * options.width * options.height / 1e6
+        print(f'{count} frames of {options.width}x{options.height} in {elapsed:.3f}s: {count / elapsed:.1f} fps, {megapixels / elapsed:.1f} MP/s')
+    finally:
+        window.destroy()
+
+
+if __name__ == '__main__':
+    main()
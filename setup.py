@@ -19,5 +19,9 @@ setuptools.setup(
         "Topic :: Software Development :: User Interfaces"
     ],
     package_dir={"": "src"},
-    packages=setuptools.find_packages(where="src")
+    packages=setuptools.find_packages(where="src"),
+    install_requires=[
+        "PySDL2",
+        "numpy"
+    ]
 )
\ No newline at end of file
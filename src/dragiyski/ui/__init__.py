@@ -1,5 +1,41 @@
-from ._error import UIError
-from . import display
-from . import geometry
-from ._window import Window
-from .event import *
+# The package exports are imported on first access (PEP 562), so that `import dragiyski.ui` does not load libSDL2,
+# nor any of the modules that are not used by the application.
+
+_lazy_attributes = {
+    'UIError': '._error',
+    'subsystem_report': '._application',
+    'Window': '._window',
+    'Surface': '._surface',
+    'Renderer': '._renderer',
+    'Texture': '._renderer',
+    'CommandBuffer': '._command_buffer',
+    'FrameChannel': '._frame_channel',
+    'ResourceCache': '._cache',
+    'AssetLoader': '._asset',
+    'ui_event': '.event',
+    'Event': '.event',
+    'WindowEvent': '.event',
+    'WindowPositionEvent': '.event',
+    'WindowSizeEvent': '.event',
+    'DisplayEvent': '.event',
+    'DisplayOrientationEvent': '.event'
+}
+_lazy_modules = ('headless', 'display', 'geometry', 'event', 'input', 'joystick', 'metrics', 'trace', 'inject', 'watchdog', 'aio', 'audio', 'hit_test')
+
+__all__ = [*_lazy_attributes, *_lazy_modules]
+
+
+def __getattr__(name: str):
+    import importlib
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+    elif name in _lazy_modules:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,105 @@
+from typing import Callable, Optional
+from ._thread import add_event_listener, get_event_thread, is_event_thread, remove_event_listener, run_in_event_thread
+import asyncio
+import concurrent.futures
+import math
+import threading
+
+_event_loop = None
+_event_loop_lock = threading.Lock()
+
+
+class EventThreadLoop(asyncio.SelectorEventLoop):
+    """An asyncio event loop run by the UI event thread itself, between the libSDL2 events.
+
+    Instead of sleeping in the selector, the UI event thread waits in `SDL_WaitEventTimeout()` until the next timer of
+    the loop is due. Callbacks scheduled from other threads (`call_soon_threadsafe()`, `run_coroutine_threadsafe()`)
+    wake it with the command event of the event thread. Coroutines on this loop call libSDL2 directly.
+    """
+
+    # While the loop has sockets or pipes registered, libSDL2 cannot wake the event thread on their readiness: the
+    # selector is polled at least this often (in seconds) instead.
+    io_poll_interval = 0.01
+
+    def __init__(self, wake: Callable):
+        super().__init__()
+        self.__wake = wake
+
+    def _write_to_self(self):
+        # The event thread does not sleep in the selector, so the self-pipe would not wake it.
+        self.__wake()
+
+    def wait_timeout(self) -> int:
+        """The number of milliseconds the UI event thread can wait for libSDL2 events before the loop must run:
+        `0` if callbacks are ready, `-1` if there is nothing scheduled.
+        """
+        if len(self._ready) > 0:
+            return 0
+        timeout = -1
+        if len(self._scheduled) > 0:
+            timeout = max(0, math.ceil((self._scheduled[0].when() - self.time()) * 1000))
+        # The self-pipe is always registered.
+        if len(self._selector.get_map()) > 1:
+            poll = math.ceil(self.io_poll_interval * 1000)
+            timeout = poll if timeout < 0 else min(timeout, poll)
+        return timeout
+
+    def step(self):
+        """Run a single iteration of the loop: poll the selector without blocking, then run the callbacks that are due."""
+        self.call_soon(self.stop)
+        self.run_forever()
+
+
+def get_event_loop() -> EventThreadLoop:
+    """Get the asyncio event loop of the UI event thread, creating it on first use.
+
+    While the loop is open, the UI event thread pumps libSDL2 events (and the process does not exit), until `close()`.
+    """
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            thread = get_event_thread()
+            event_loop = EventThreadLoop(thread.wake)
+            add_event_listener(event_loop)
+            run_in_event_thread(thread.set_event_loop, event_loop)
+            _event_loop = event_loop
+        return _event_loop
+
+
+def run_coroutine(coroutine) -> 'concurrent.futures.Future':
+    """Schedule a coroutine on the asyncio loop of the UI event thread. Can be called from any thread."""
+    return asyncio.run_coroutine_threadsafe(coroutine, get_event_loop())
+
+
+def run(coroutine, timeout: Optional[float] = None):
+    """Run a coroutine on the asyncio loop of the UI event thread and wait for its result.
+
+    Raises:
+        RuntimeError: If called from the UI event thread, which would wait for itself.
+    """
+    if is_event_thread():
+        raise RuntimeError('run() cannot be called from the UI event thread; await the coroutine instead')
+    return run_coroutine(coroutine).result(timeout)
+
+
+def _shutdown(event_loop: EventThreadLoop):
+    get_event_thread().set_event_loop(None)
+    tasks = asyncio.all_tasks(event_loop)
+    for task in tasks:
+        task.cancel()
+    if len(tasks) > 0:
+        event_loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+    event_loop.close()
+    remove_event_listener(event_loop)
+
+
+def close():
+    """Cancel the pending tasks, close the asyncio loop of the UI event thread and return to waiting for libSDL2 events only."""
+    global _event_loop
+    with _event_loop_lock:
+        event_loop = _event_loop
+        if event_loop is None:
+            return
+        _event_loop = None
+        run_in_event_thread(_shutdown, event_loop)
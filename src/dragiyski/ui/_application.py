@@ -1,7 +1,35 @@
-from sdl2 import *
+from sdl2 import (
+    SDL_ClearError,
+    SDL_DISPLAYEVENT,
+    SDL_DISPLAYEVENT_CONNECTED,
+    SDL_DISPLAYEVENT_DISCONNECTED,
+    SDL_DISPLAYEVENT_ORIENTATION,
+    SDL_DROPFILE,
+    SDL_DROPTEXT,
+    SDL_Event,
+    SDL_INIT_AUDIO,
+    SDL_INIT_EVENTS,
+    SDL_INIT_GAMECONTROLLER,
+    SDL_INIT_HAPTIC,
+    SDL_INIT_JOYSTICK,
+    SDL_INIT_SENSOR,
+    SDL_INIT_TIMER,
+    SDL_INIT_VIDEO,
+    SDL_InitSubSystem,
+    SDL_ORIENTATION_LANDSCAPE,
+    SDL_ORIENTATION_LANDSCAPE_FLIPPED,
+    SDL_ORIENTATION_PORTRAIT,
+    SDL_ORIENTATION_PORTRAIT_FLIPPED,
+    SDL_QUIT,
+    SDL_WaitEvent,
+    SDL_WasInit,
+    SDL_free
+)
 from typing import Callable
 from ._error import UIError
+import functools
 import threading
+import time
 
 application_storage = threading.local()
 application_singleton = None
@@ -14,12 +42,54 @@ class ApplicationFactory(type):
         application_singleton = super(ApplicationFactory, cls).__call__(*args, **kwargs)
         return application_singleton
     
+subsystem_names = {
+    SDL_INIT_TIMER: 'timer',
+    SDL_INIT_AUDIO: 'audio',
+    SDL_INIT_VIDEO: 'video',
+    SDL_INIT_JOYSTICK: 'joystick',
+    SDL_INIT_HAPTIC: 'haptic',
+    SDL_INIT_GAMECONTROLLER: 'gamecontroller',
+    SDL_INIT_EVENTS: 'events',
+    SDL_INIT_SENSOR: 'sensor'
+}
+_subsystem_report = {}
+
+
+def init_subsystem(system: int):
+    """Initialize the libSDL2 subsystems in the `system` mask that are not initialized yet.
+
+    Each subsystem is initialized separately and timed for `subsystem_report()`. Must be called in the UI event thread.
+    """
+    if SDL_WasInit(system) == system:
+        return
+    for (flag, name) in subsystem_names.items():
+        if (system & flag) == 0 or SDL_WasInit(flag) != 0:
+            continue
+        before = SDL_WasInit(0)
+        SDL_ClearError()
+        start = time.perf_counter()
+        if SDL_InitSubSystem(flag) < 0:
+            raise UIError
+        elapsed = time.perf_counter() - start
+        # Subsystems initialized as a dependency (like events for video) are reported with zero time.
+        implied = SDL_WasInit(0) & ~before & ~flag
+        for (dependency, dependency_name) in subsystem_names.items():
+            if implied & dependency:
+                _subsystem_report.setdefault(dependency_name, 0.0)
+        _subsystem_report[name] = elapsed
+
+
+def subsystem_report() -> dict:
+    """The libSDL2 subsystems brought up by this module, in initialization order, with the initialization time in seconds."""
+    return dict(_subsystem_report)
+
+
 def ensure_subsystem(system):
     def subsystem_decorator(dependent: Callable):
+        @functools.wraps(dependent)
         def subsystem_initializer(*args, **kwargs):
-            if SDL_WasInit(system) == 0:
-                if SDL_InitSubSystem(system) < 0:
-                    raise UIError
+            if SDL_WasInit(system) != system:
+                init_subsystem(system)
             return dependent(*args, **kwargs)
         return subsystem_initializer
     return subsystem_decorator
@@ -42,7 +112,6 @@ class Application(metaclass=ApplicationFactory):
         application_storage.application = self
         from ._display import DisplayList
         self.__display = DisplayList(self)
-        SDL_InitSubSystem(SDL_INIT_EVERYTHING)
         
     @property
     def display(self):
@@ -50,9 +119,6 @@ class Application(metaclass=ApplicationFactory):
         
     @ensure_subsystem(SDL_INIT_EVENTS)
     def run(self):
-        if not SDL_WasInit(SDL_INIT_EVENTS):
-            if SDL_InitSubSystem(SDL_INIT_EVENTS) == 0:
-                raise UIError
         in_event_loop = True
         while in_event_loop:
             event = SDL_Event()
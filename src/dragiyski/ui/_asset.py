@@ -0,0 +1,202 @@
+from sdl2 import (
+    SDL_BITSPERPIXEL,
+    SDL_ClearError,
+    SDL_ConvertSurfaceFormat,
+    SDL_CreateRGBSurfaceWithFormatFrom,
+    SDL_FreeSurface,
+    SDL_LoadBMP_RW,
+    SDL_RWFromConstMem
+)
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Optional
+from traceback import print_exc
+from ._error import UIError
+from ._display import PixelFormat, bytes_per_pixel
+from ._surface import create_surface
+from ._thread import post_in_event_thread
+import ctypes
+import os
+import threading
+
+
+def _surface_from_pixels(pixels, width: int, height: int, pitch: int, pixel_format: PixelFormat, target_format: PixelFormat):
+    """Create an owned surface in the target format from pixels in memory. The pixels are copied (and converted)."""
+    source = SDL_CreateRGBSurfaceWithFormatFrom(pixels, width, height, SDL_BITSPERPIXEL(pixel_format.value), pitch, pixel_format.value)
+    if not source:
+        raise UIError
+    try:
+        surface = SDL_ConvertSurfaceFormat(source, target_format.value, 0)
+        if not surface:
+            raise UIError
+        return surface
+    finally:
+        SDL_FreeSurface(source)
+
+
+def decode_bmp(path: str, target_format: PixelFormat):
+    # Reading the file in python reports I/O errors as OSError, rather than an unrelated SDL_RWops error.
+    with open(path, 'rb') as file:
+        data = file.read()
+    SDL_ClearError()
+    stream = SDL_RWFromConstMem(data, len(data))
+    if not stream:
+        raise UIError
+    source = SDL_LoadBMP_RW(stream, 1)
+    if not source:
+        raise UIError
+    try:
+        surface = SDL_ConvertSurfaceFormat(source, target_format.value, 0)
+        if not surface:
+            raise UIError
+        return surface
+    finally:
+        SDL_FreeSurface(source)
+
+
+def decode_raw(path: str, target_format: PixelFormat, *, width: int, height: int, pixel_format: PixelFormat, pitch: Optional[int] = None):
+    if pitch is None:
+        pitch = width * bytes_per_pixel(pixel_format)
+    with open(path, 'rb') as file:
+        data = bytearray(file.read())
+    if len(data) < pitch * height:
+        raise ValueError(f'The file [{path}] is too short for a {width}x{height} image with pitch {pitch}')
+    SDL_ClearError()
+    pixels = (ctypes.c_uint8 * len(data)).from_buffer(data)
+    return _surface_from_pixels(pixels, width, height, pitch, pixel_format, target_format)
+
+
+# The default pixel format of numpy images by the number of channels (the size of the last dimension).
+_numpy_channel_formats = {
+    3: PixelFormat.RGB24,
+    4: PixelFormat.RGBA32
+}
+
+
+def decode_numpy(path: str, target_format: PixelFormat, *, pixel_format: Optional[PixelFormat] = None):
+    import numpy
+    array = numpy.ascontiguousarray(numpy.load(path, allow_pickle=False))
+    if array.dtype != numpy.uint8 or array.ndim != 3:
+        raise ValueError(f'The file [{path}] must contain an uint8 array of shape (height, width, channels)')
+    height, width, channels = array.shape
+    if pixel_format is None:
+        if channels not in _numpy_channel_formats:
+            raise ValueError(f'Cannot determine the pixel format of {channels} channels, specify `pixel_format`')
+        pixel_format = _numpy_channel_formats[channels]
+    if bytes_per_pixel(pixel_format) != channels:
+        raise ValueError(f'PixelFormat.{pixel_format.name} does not match {channels} channels')
+    SDL_ClearError()
+    return _surface_from_pixels(array.ctypes.data, width, height, width * channels, pixel_format, target_format)
+
+
+_decoders = {
+    '.bmp': decode_bmp,
+    '.npy': decode_numpy,
+    '.raw': decode_raw
+}
+
+
+class AssetLoader:
+    """Load images in a thread pool without blocking the UI event thread.
+
+    Files are decoded and converted to the target pixel format by the worker threads. If the loader has a renderer,
+    the decoded images are uploaded into textures in the UI event thread, in batches of up to `batch_size` images per
+    call. Otherwise, the result is an offscreen `Surface` owned by the caller.
+
+    Supported files are BMP (`.bmp`), numpy arrays of shape `(height, width, channels)` (`.npy`) and raw pixels
+    (`.raw`, requires `width`, `height` and `pixel_format`).
+    """
+
+    def __init__(self, *, pixel_format: PixelFormat = PixelFormat.ARGB8888, renderer=None, max_workers: Optional[int] = None, batch_size: int = 32):
+        if batch_size <= 0:
+            raise ValueError('param `batch_size` must be positive')
+        # Raises for planar formats, images are always converted into a packed format.
+        bytes_per_pixel(pixel_format)
+        self.__pixel_format = pixel_format
+        self.__renderer = renderer
+        self.__batch_size = batch_size
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dragiyski.ui.asset:')
+        self.__pending = []
+        self.__pending_lock = threading.Lock()
+        self.__upload_scheduled = False
+
+    @property
+    def pixel_format(self) -> PixelFormat:
+        return self.__pixel_format
+
+    def load(self, path, **kwargs) -> Future:
+        """Start loading an image file.
+
+        Args:
+            path (PathLike): The image file. The extension determines the decoder.
+            **kwargs: Decoder arguments: `width`, `height`, `pixel_format` and `pitch` for raw files, `pixel_format` for numpy files.
+
+        Returns:
+            Future: Resolves to a `Texture` (if the loader has a renderer) or a `Surface`. Can be cancelled until resolved.
+        """
+        path = os.fspath(path)
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in _decoders:
+            raise ValueError(f'Unsupported image file: {path}')
+        future = Future()
+        self.__executor.submit(self.__decode, future, _decoders[extension], path, kwargs)
+        return future
+
+    def load_many(self, paths: Iterable, **kwargs) -> list:
+        return [self.load(path, **kwargs) for path in paths]
+
+    def shutdown(self, wait: bool = True, cancel: bool = False):
+        self.__executor.shutdown(wait=wait, cancel_futures=cancel)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def __decode(self, future: Future, decoder, path: str, kwargs):
+        if future.cancelled():
+            return
+        try:
+            sdl_surface = decoder(path, self.__pixel_format, **kwargs)
+        except BaseException as exception:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exception)
+            return
+        if self.__renderer is None:
+            if future.set_running_or_notify_cancel():
+                future.set_result(create_surface(sdl_surface))
+            else:
+                SDL_FreeSurface(sdl_surface)
+            return
+        with self.__pending_lock:
+            self.__pending.append((future, sdl_surface))
+            if self.__upload_scheduled:
+                return
+            self.__upload_scheduled = True
+        post_in_event_thread(self.__upload_batch)
+
+    def __upload_batch(self):
+        with self.__pending_lock:
+            batch = self.__pending[:self.__batch_size]
+            del self.__pending[:self.__batch_size]
+            if len(self.__pending) > 0:
+                # Leave the event thread to process input between batches.
+                post_in_event_thread(self.__upload_batch)
+            else:
+                self.__upload_scheduled = False
+        for future, sdl_surface in batch:
+            surface = create_surface(sdl_surface)
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    texture = self.__renderer.create_texture(surface.width, surface.height, self.__pixel_format)
+                    texture.upload(surface.array())
+                except BaseException as exception:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(texture)
+            except:
+                print_exc()
+            finally:
+                surface.free()
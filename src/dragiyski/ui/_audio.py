@@ -0,0 +1,246 @@
+from sdl2 import (
+    AUDIO_F32SYS,
+    AUDIO_S16SYS,
+    AUDIO_S32SYS,
+    AUDIO_S8,
+    AUDIO_U8,
+    SDL_AUDIO_PLAYING,
+    SDL_AudioSpec,
+    SDL_ClearError,
+    SDL_ClearQueuedAudio,
+    SDL_CloseAudioDevice,
+    SDL_GetAudioDeviceName,
+    SDL_GetAudioDeviceStatus,
+    SDL_GetCurrentAudioDriver,
+    SDL_GetNumAudioDevices,
+    SDL_GetQueuedAudioSize,
+    SDL_INIT_AUDIO,
+    SDL_OpenAudioDevice,
+    SDL_PauseAudioDevice,
+    SDL_QueueAudio
+)
+from typing import Optional
+from ._error import UIError
+from ._application import ensure_subsystem
+from ._thread import in_event_thread
+import ctypes
+import threading
+
+# The sample formats accepted by `AudioOutput.open()`: the libSDL2 format (in native byte order) and the numpy dtype name.
+formats = {
+    'float32': (AUDIO_F32SYS, 'float32'),
+    'int32': (AUDIO_S32SYS, 'int32'),
+    'int16': (AUDIO_S16SYS, 'int16'),
+    'int8': (AUDIO_S8, 'int8'),
+    'uint8': (AUDIO_U8, 'uint8')
+}
+
+
+def convert_samples(samples, dtype):
+    """Convert samples to a numpy dtype, rescaling between full ranges: [-1.0, 1.0] for floating point samples and
+    the range of the type for integer samples (e.g. [-32768, 32767] for `int16`, [0, 255] centered at 128 for `uint8`).
+    """
+    import numpy
+    data = numpy.asarray(samples)
+    dtype = numpy.dtype(dtype)
+    if data.dtype == dtype:
+        return numpy.ascontiguousarray(data)
+    if data.dtype.kind == 'f':
+        normalized = data
+    elif data.dtype.kind in 'iu':
+        info = numpy.iinfo(data.dtype)
+        half = (int(info.max) - int(info.min) + 1) / 2
+        normalized = (data.astype(numpy.float64) - (int(info.min) + half)) / half
+    else:
+        raise TypeError(f'Unsupported sample type: {data.dtype}')
+    if dtype.kind == 'f':
+        return numpy.ascontiguousarray(normalized, dtype=dtype)
+    info = numpy.iinfo(dtype)
+    half = (int(info.max) - int(info.min) + 1) / 2
+    return numpy.ascontiguousarray(numpy.clip(numpy.rint(normalized * half + (int(info.min) + half)), info.min, info.max), dtype=dtype)
+
+
+@in_event_thread
+@ensure_subsystem(SDL_INIT_AUDIO)
+def devices() -> list:
+    """The names of the audio output devices. The list may be empty for drivers that do not enumerate devices."""
+    result = []
+    for index in range(max(0, SDL_GetNumAudioDevices(0))):
+        name = SDL_GetAudioDeviceName(index, 0)
+        result.append(name.decode('utf-8') if name is not None else None)
+    return result
+
+
+@in_event_thread
+@ensure_subsystem(SDL_INIT_AUDIO)
+def driver() -> Optional[str]:
+    """The libSDL2 audio driver in use (selected by the environment variable `SDL_AUDIODRIVER`, e.g. `dummy` or `disk`)."""
+    name = SDL_GetCurrentAudioDriver()
+    return name.decode('utf-8') if name is not None else None
+
+
+class AudioOutput:
+    """An audio output device, fed with numpy sample buffers through the libSDL2 audio queue.
+
+    The queue is consumed by the libSDL2 audio thread without calling into python, so playback does not depend on the
+    GIL. `write()` can be called from any thread; it copies the samples into the queue and returns immediately.
+
+    The device starts paused, so that the queue can be filled before the playback starts with `play()`.
+    """
+
+    @classmethod
+    @in_event_thread
+    @ensure_subsystem(SDL_INIT_AUDIO)
+    def open(cls, device: Optional[str] = None, *, frequency: int = 48000, channels: int = 2, format: str = 'float32', samples: int = 512):
+        """Open an audio output device.
+
+        Args:
+            device (str, optional): The name of the device, from `devices()`. The default device, if not specified.
+            frequency (int, optional): The number of frames per second.
+            channels (int, optional): The number of channels; the samples of a frame are interleaved.
+            format (str, optional): The sample format: a key of `formats`. libSDL2 converts it for the device, if needed.
+            samples (int, optional): The number of frames the device takes from the queue at once (a power of two).
+                Smaller buffers reduce the latency, but increase the risk of underruns.
+        """
+        import numpy
+        if format not in formats:
+            raise ValueError(f'param `format` must be one of: {", ".join(formats)}')
+        if frequency <= 0 or channels <= 0 or samples <= 0:
+            raise ValueError('params `frequency`, `channels` and `samples` must be positive')
+        sdl_format, dtype = formats[format]
+        desired = SDL_AudioSpec(frequency, sdl_format, channels, samples)
+        obtained = SDL_AudioSpec(0, 0, 0, 0)
+        SDL_ClearError()
+        # No changes are allowed: libSDL2 converts the samples to the format of the device.
+        device_id = SDL_OpenAudioDevice(device.encode('utf-8') if device is not None else None, 0, desired, obtained, 0)
+        if device_id == 0:
+            raise UIError
+        self = cls.__new__(cls)
+        self.__device = device_id
+        self.__name = device
+        self.__frequency = frequency
+        self.__channels = channels
+        self.__format = format
+        self.__dtype = numpy.dtype(dtype)
+        self.__frame_size = self.__dtype.itemsize * channels
+        self.__buffer_frames = obtained.samples
+        self.__written = 0
+        self.__underruns = 0
+        # Set by `clear()`: the queue is empty on purpose, the next `write()` is not an underrun.
+        self.__cleared = False
+        self.__playing = False
+        self.__lock = threading.Lock()
+        return self
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.__name
+
+    @property
+    def frequency(self) -> int:
+        return self.__frequency
+
+    @property
+    def channels(self) -> int:
+        return self.__channels
+
+    @property
+    def format(self) -> str:
+        return self.__format
+
+    @property
+    def buffer_frames(self) -> int:
+        """The number of frames the device takes from the queue at once."""
+        return self.__buffer_frames
+
+    @property
+    def closed(self) -> bool:
+        return self.__device is None
+
+    @property
+    def playing(self) -> bool:
+        return self.__device is not None and SDL_GetAudioDeviceStatus(self.__device) == SDL_AUDIO_PLAYING
+
+    @property
+    def written(self) -> int:
+        """The total number of frames queued by `write()`."""
+        return self.__written
+
+    @property
+    def underruns(self) -> int:
+        """The number of times `write()` found the queue of a playing device empty (not by `clear()`), i.e. the device ran
+        out of samples.
+        """
+        return self.__underruns
+
+    @property
+    def queued_frames(self) -> int:
+        """The number of frames waiting in the queue."""
+        if self.__device is None:
+            return 0
+        return SDL_GetQueuedAudioSize(self.__device) // self.__frame_size
+
+    @property
+    def latency(self) -> float:
+        """The time in seconds until a frame written now is played: the queued frames and one device buffer."""
+        return (self.queued_frames + self.__buffer_frames) / self.__frequency
+
+    def write(self, samples) -> int:
+        """Queue samples for playback. Can be called from any thread.
+
+        Args:
+            samples (numpy.ndarray): The samples, of shape `(frames, channels)` or flat (interleaved). They are converted
+                to the format of the output, if needed (see `convert_samples()`).
+
+        Returns:
+            int: The number of frames queued.
+        """
+        data = convert_samples(samples, self.__dtype)
+        if data.ndim == 2 and data.shape[1] != self.__channels:
+            raise ValueError(f'param `samples` must have {self.__channels} channels')
+        if data.ndim > 2 or data.size % self.__channels != 0:
+            raise ValueError('param `samples` must be of shape (frames, channels) or contain whole frames')
+        frames = data.size // self.__channels
+        if frames <= 0:
+            return 0
+        with self.__lock:
+            if self.__device is None:
+                raise UIError('The audio device has been closed')
+            if self.__playing and self.__written > 0 and not self.__cleared and SDL_GetQueuedAudioSize(self.__device) == 0:
+                self.__underruns += 1
+            self.__cleared = False
+            SDL_ClearError()
+            if SDL_QueueAudio(self.__device, data.ctypes.data_as(ctypes.c_void_p), data.nbytes) < 0:
+                raise UIError
+            self.__written += frames
+        return frames
+
+    def clear(self):
+        """Drop the samples that have not been played yet."""
+        with self.__lock:
+            if self.__device is not None:
+                SDL_ClearQueuedAudio(self.__device)
+                self.__cleared = True
+
+    @in_event_thread
+    def play(self):
+        if self.__device is None:
+            raise UIError('The audio device has been closed')
+        SDL_PauseAudioDevice(self.__device, 0)
+        self.__playing = True
+
+    @in_event_thread
+    def pause(self):
+        if self.__device is None:
+            raise UIError('The audio device has been closed')
+        self.__playing = False
+        SDL_PauseAudioDevice(self.__device, 1)
+
+    @in_event_thread
+    def close(self):
+        with self.__lock:
+            if self.__device is None:
+                return
+            SDL_CloseAudioDevice(self.__device)
+            self.__device = None
+            self.__playing = False
@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+from traceback import print_exc
+from ._display import bytes_per_pixel
+from ._surface import Surface
+from ._renderer import Texture
+from ._thread import post_in_event_thread
+import threading
+
+
+def resource_size(resource) -> int:
+    """The number of bytes occupied by the pixels of a surface or a texture: width x height x bytes per pixel."""
+    if isinstance(resource, Texture):
+        return resource.width * resource.height * resource.bytes_per_pixel
+    if isinstance(resource, Surface):
+        return resource.width * resource.height * bytes_per_pixel(resource.pixel_format)
+    raise TypeError(f'Cannot determine the size of {type(resource).__name__}, specify it explicitly')
+
+
+def _release_resources(resources):
+    for resource in resources:
+        try:
+            if isinstance(resource, Texture):
+                resource.destroy()
+            elif isinstance(resource, Surface):
+                resource.free()
+            elif hasattr(resource, 'destroy'):
+                resource.destroy()
+        except:
+            print_exc()
+
+
+class ResourceCache:
+    """A least-recently-used cache of surfaces and textures bounded by the total size of their pixels.
+
+    When the budget is exceeded, the least recently used resources are removed from the cache and released in the
+    UI event thread (with a single, non-blocking call per insertion). Released resources must not be used anymore, so
+    the users of the cache should not hold onto the resources returned by `get()` beyond the current frame.
+    """
+
+    def __init__(self, budget: int):
+        """
+        Args:
+            budget (int): The maximum number of bytes of all cached resources.
+        """
+        if budget <= 0:
+            raise ValueError('param `budget` must be positive')
+        self.__budget = budget
+        self.__size = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def budget(self) -> int:
+        return self.__budget
+
+    @budget.setter
+    def budget(self, value: int):
+        if value <= 0:
+            raise ValueError('`budget` must be positive')
+        with self.__lock:
+            self.__budget = value
+            evicted = self.__evict()
+        self.__release(evicted)
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of all cached resources."""
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                'count': len(self.__entries),
+                'size': self.__size,
+                'budget': self.__budget,
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions
+            }
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self.__entries
+
+    def get(self, key: Hashable, default=None):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, resource, size: Optional[int] = None):
+        """Add a resource to the cache. The cache takes the ownership of the resource.
+
+        A resource previously cached under the same key is released.
+
+        Args:
+            key (Hashable): The user key of the resource.
+            resource (Union[Surface, Texture]): The resource to cache.
+            size (int, optional): The size of the resource in bytes. Defaults to `resource_size(resource)`.
+
+        Raises:
+            ValueError: If the resource alone does not fit the budget.
+        """
+        if size is None:
+            size = resource_size(resource)
+        if size > self.__budget:
+            raise ValueError(f'The resource size ({size} bytes) exceeds the cache budget ({self.__budget} bytes)')
+        with self.__lock:
+            evicted = []
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= previous[1]
+                if previous[0] is not resource:
+                    evicted.append(previous[0])
+            self.__entries[key] = (resource, size)
+            self.__size += size
+            evicted.extend(self.__evict())
+        self.__release(evicted)
+        return resource
+
+    def get_or_create(self, key: Hashable, factory: Callable, size: Optional[int] = None):
+        """Get a cached resource, or create it with `factory()` and cache it on a miss.
+
+        The factory is called without holding the cache lock, so concurrent misses of the same key might create the
+        resource more than once; the last one is kept.
+        """
+        resource = self.get(key)
+        if resource is None:
+            resource = self.put(key, factory(), size)
+        return resource
+
+    def remove(self, key: Hashable):
+        """Remove a resource from the cache without releasing it. The ownership is transferred back to the caller."""
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is None:
+                return None
+            self.__size -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        """Release all cached resources. Does not count as evictions."""
+        with self.__lock:
+            resources = [entry[0] for entry in self.__entries.values()]
+            self.__entries.clear()
+            self.__size = 0
+        self.__release(resources)
+
+    def __evict(self):
+        evicted = []
+        while self.__size > self.__budget and len(self.__entries) > 0:
+            key, (resource, size) = self.__entries.popitem(last=False)
+            self.__size -= size
+            self.__evictions += 1
+            evicted.append(resource)
+        return evicted
+
+    def __release(self, resources):
+        if len(resources) > 0:
+            post_in_event_thread(_release_resources, resources)
@@ -0,0 +1,230 @@
+from sdl2 import (
+    SDL_ClearError,
+    SDL_Point,
+    SDL_Rect,
+    SDL_RenderClear,
+    SDL_RenderCopy,
+    SDL_RenderDrawLines,
+    SDL_RenderDrawPoints,
+    SDL_RenderDrawRects,
+    SDL_RenderFillRects,
+    SDL_SetRenderDrawColor
+)
+from typing import Optional
+from ._error import UIError
+from ._geometry import Rectangle
+import struct
+
+# Each command is a header (opcode, argument) followed by a payload of 32-bit integers. The rectangles and points in the
+# payload have the memory layout of `SDL_Rect` and `SDL_Point`, so they are passed to libSDL2 without conversion.
+OP_COLOR = 0         # argument: 0xRRGGBBAA, no payload
+OP_CLEAR = 1         # no payload (uses the current color)
+OP_FILL_RECTS = 2    # argument: count, payload: count x (x, y, w, h)
+OP_DRAW_RECTS = 3    # argument: count, payload: count x (x, y, w, h)
+OP_DRAW_LINES = 4    # argument: count, payload: count x (x, y), a connected polyline
+OP_DRAW_POINTS = 5   # argument: count, payload: count x (x, y)
+OP_COPY = 6          # argument: texture index, payload: source (x, y, w, h), destination (x, y, w, h), w = 0 for none
+
+_header = struct.Struct('=II')
+_rect = struct.Struct('=4i')
+_point = struct.Struct('=2i')
+_copy = struct.Struct('=8i')
+
+
+class CommandBuffer:
+    """Draw commands recorded without calling libSDL2, to be replayed by `Renderer.submit()` in a single call into the UI
+    event thread.
+
+    The commands are packed into a growable byte buffer. Consecutive rectangles (or points) of the same kind are merged
+    into a single `SDL_RenderFillRects()`/`SDL_RenderDrawRects()`/`SDL_RenderDrawPoints()` call on replay. The bulk
+    methods (`fill_rects()`, `draw_rects()`, `lines()`, `points()`) copy a whole numpy array at once.
+
+    A buffer is recorded by one thread at a time. `reset()` empties it for the next frame, keeping the allocated memory.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        """
+        Args:
+            capacity (int, optional): The initial size of the buffer in bytes. The buffer grows as needed.
+        """
+        self.__data = bytearray(max(capacity, 64))
+        self.__size = 0
+        self.__textures = []
+        self.__texture_index = dict()
+        self.__commands = 0
+        # The open batch of merged elements: the opcode, the offset of its header and the number of elements.
+        self.__batch_op = None
+        self.__batch_offset = 0
+        self.__batch_count = 0
+
+    @property
+    def size(self) -> int:
+        """The number of bytes recorded."""
+        return self.__size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__data)
+
+    @property
+    def commands(self) -> int:
+        """The number of libSDL2 calls the replay makes."""
+        return self.__commands
+
+    def reset(self):
+        """Remove all commands, keeping the allocated memory for the next frame."""
+        self.__size = 0
+        self.__textures.clear()
+        self.__texture_index.clear()
+        self.__commands = 0
+        self.__batch_op = None
+
+    def _reserve(self, size: int) -> int:
+        offset = self.__size
+        if offset + size > len(self.__data):
+            self.__data.extend(bytes(max(len(self.__data), offset + size - len(self.__data))))
+        self.__size = offset + size
+        return offset
+
+    def _close_batch(self):
+        if self.__batch_op is not None:
+            _header.pack_into(self.__data, self.__batch_offset, self.__batch_op, self.__batch_count)
+            self.__batch_op = None
+
+    def _command(self, op: int, argument: int, payload_size: int = 0) -> int:
+        """Append a command header and reserve its payload. Returns the offset of the payload."""
+        self._close_batch()
+        offset = self._reserve(_header.size + payload_size)
+        _header.pack_into(self.__data, offset, op, argument)
+        self.__commands += 1
+        return offset + _header.size
+
+    def _open_batch(self, op: int):
+        self._close_batch()
+        self.__batch_offset = self._reserve(_header.size)
+        self.__batch_op = op
+        self.__batch_count = 0
+        self.__commands += 1
+
+    def _elements(self, op: int, elements, width: int):
+        import numpy
+        array = numpy.ascontiguousarray(elements, dtype=numpy.int32).reshape(-1, width)
+        count = len(array)
+        if count <= 0:
+            return
+        offset = self._command(op, count, array.nbytes)
+        with memoryview(self.__data) as view:
+            view[offset:offset + array.nbytes] = array.reshape(-1).view(numpy.uint8)
+
+    def color(self, red: int, green: int, blue: int, alpha: int = 255):
+        """Set the color of the following commands."""
+        self._command(OP_COLOR, ((red & 0xFF) << 24) | ((green & 0xFF) << 16) | ((blue & 0xFF) << 8) | (alpha & 0xFF))
+
+    def clear(self, red: int = 0, green: int = 0, blue: int = 0, alpha: int = 255):
+        """Fill the whole target with a color, like `Renderer.clear()`. The color remains set for the following commands."""
+        self.color(red, green, blue, alpha)
+        self._command(OP_CLEAR, 0)
+
+    # The single element methods are the hot path of recording: they append to the open batch inline.
+    def fill_rect(self, x: int, y: int, width: int, height: int):
+        if self.__batch_op != OP_FILL_RECTS:
+            self._open_batch(OP_FILL_RECTS)
+        offset = self.__size
+        if offset + _rect.size > len(self.__data):
+            offset = self._reserve(_rect.size)
+        else:
+            self.__size = offset + _rect.size
+        _rect.pack_into(self.__data, offset, x, y, width, height)
+        self.__batch_count += 1
+
+    def draw_rect(self, x: int, y: int, width: int, height: int):
+        if self.__batch_op != OP_DRAW_RECTS:
+            self._open_batch(OP_DRAW_RECTS)
+        offset = self.__size
+        if offset + _rect.size > len(self.__data):
+            offset = self._reserve(_rect.size)
+        else:
+            self.__size = offset + _rect.size
+        _rect.pack_into(self.__data, offset, x, y, width, height)
+        self.__batch_count += 1
+
+    def point(self, x: int, y: int):
+        if self.__batch_op != OP_DRAW_POINTS:
+            self._open_batch(OP_DRAW_POINTS)
+        offset = self.__size
+        if offset + _point.size > len(self.__data):
+            offset = self._reserve(_point.size)
+        else:
+            self.__size = offset + _point.size
+        _point.pack_into(self.__data, offset, x, y)
+        self.__batch_count += 1
+
+    def line(self, x1: int, y1: int, x2: int, y2: int):
+        _rect.pack_into(self.__data, self._command(OP_DRAW_LINES, 2, _rect.size), x1, y1, x2, y2)
+
+    def fill_rects(self, rectangles):
+        """Fill rectangles given as an array-like of shape `(count, 4)`: x, y, width, height."""
+        self._elements(OP_FILL_RECTS, rectangles, 4)
+
+    def draw_rects(self, rectangles):
+        """Outline rectangles given as an array-like of shape `(count, 4)`: x, y, width, height."""
+        self._elements(OP_DRAW_RECTS, rectangles, 4)
+
+    def lines(self, points):
+        """Draw a connected polyline through points given as an array-like of shape `(count, 2)`."""
+        self._elements(OP_DRAW_LINES, points, 2)
+
+    def points(self, points):
+        """Draw points given as an array-like of shape `(count, 2)`."""
+        self._elements(OP_DRAW_POINTS, points, 2)
+
+    def copy(self, texture, source: Optional[Rectangle] = None, destination: Optional[Rectangle] = None):
+        """Copy a texture (or part of it) into the target, like `Renderer.copy()`. The texture must stay alive until the replay."""
+        index = self.__texture_index.get(id(texture))
+        if index is None:
+            index = self.__texture_index[id(texture)] = len(self.__textures)
+            self.__textures.append(texture)
+        source = (source.x, source.y, source.width, source.height) if source is not None else (0, 0, 0, 0)
+        destination = (destination.x, destination.y, destination.width, destination.height) if destination is not None else (0, 0, 0, 0)
+        _copy.pack_into(self.__data, self._command(OP_COPY, index, _copy.size), *source, *destination)
+
+    def _replay(self, renderer, sdl_renderer):
+        """Execute the commands. Called by `Renderer.submit()` in the UI event thread."""
+        self._close_batch()
+        data = self.__data
+        textures = self.__textures
+        offset = 0
+        end = self.__size
+        SDL_ClearError()
+        while offset < end:
+            op, argument = _header.unpack_from(data, offset)
+            offset += _header.size
+            if op == OP_FILL_RECTS or op == OP_DRAW_RECTS:
+                rectangles = (SDL_Rect * argument).from_buffer(data, offset)
+                result = (SDL_RenderFillRects if op == OP_FILL_RECTS else SDL_RenderDrawRects)(sdl_renderer, rectangles, argument)
+                del rectangles
+                offset += argument * _rect.size
+            elif op == OP_DRAW_LINES or op == OP_DRAW_POINTS:
+                points = (SDL_Point * argument).from_buffer(data, offset)
+                result = (SDL_RenderDrawLines if op == OP_DRAW_LINES else SDL_RenderDrawPoints)(sdl_renderer, points, argument)
+                del points
+                offset += argument * _point.size
+            elif op == OP_COLOR:
+                result = SDL_SetRenderDrawColor(sdl_renderer, argument >> 24, (argument >> 16) & 0xFF, (argument >> 8) & 0xFF, argument & 0xFF)
+            elif op == OP_CLEAR:
+                result = SDL_RenderClear(sdl_renderer)
+            elif op == OP_COPY:
+                texture = textures[argument]
+                if texture._Texture__renderer is not renderer:
+                    raise ValueError('The textures of a command buffer must be created by the renderer it is submitted to')
+                if texture._Texture__impl is None:
+                    raise UIError('The texture has been destroyed')
+                sx, sy, sw, sh, dx, dy, dw, dh = _copy.unpack_from(data, offset)
+                offset += _copy.size
+                source = SDL_Rect(sx, sy, sw, sh) if sw > 0 else None
+                destination = SDL_Rect(dx, dy, dw, dh) if dw > 0 else None
+                result = SDL_RenderCopy(sdl_renderer, texture._Texture__impl, source, destination)
+            else:
+                raise UIError(f'Invalid command buffer opcode: {op}')
+            if result < 0:
+                raise UIError
@@ -1,14 +1,32 @@
-from sdl2 import *
-import sdl2, ctypes
+from sdl2 import (
+    SDL_BYTESPERPIXEL,
+    SDL_ClearError,
+    SDL_DisplayMode,
+    SDL_GetClosestDisplayMode,
+    SDL_GetCurrentDisplayMode,
+    SDL_GetDesktopDisplayMode,
+    SDL_GetDisplayBounds,
+    SDL_GetDisplayDPI,
+    SDL_GetDisplayMode,
+    SDL_GetDisplayName,
+    SDL_GetDisplayUsableBounds,
+    SDL_GetNumDisplayModes,
+    SDL_GetNumVideoDisplays,
+    SDL_INIT_VIDEO,
+    SDL_ISPIXELFORMAT_FOURCC,
+    SDL_Rect
+)
+import ctypes
+import sys
 from enum import Enum
 from ._error import UIError
 from ._geometry import create_rectangle
 from ._thread import in_event_thread
+from ._application import ensure_subsystem
 
 @in_event_thread
+@ensure_subsystem(SDL_INIT_VIDEO)
 def count() -> int:
-    if not SDL_WasInit(SDL_INIT_VIDEO):
-        SDL_InitSubSystem(SDL_INIT_VIDEO)
     SDL_ClearError()
     count = SDL_GetNumVideoDisplays()
     if count < 0:
@@ -36,7 +54,72 @@ def name(display: int) -> str:
     return buffer.decode('utf-8')
 
 
-PixelFormat = Enum('PixelFormat', dict([(x.removeprefix('SDL_PIXELFORMAT_'), getattr(sdl2, x)) for x in dir(sdl2) if x.startswith('SDL_PIXELFORMAT_')]))
+# SDL_PIXELFORMAT_* values, precomputed from SDL_pixels.h (SDL_DEFINE_PIXELFORMAT and SDL_DEFINE_PIXELFOURCC).
+# The *32 formats are aliases of the *8888 formats matching the byte order in memory, so they depend on the endianness.
+_big_endian = sys.byteorder == 'big'
+PixelFormat = Enum('PixelFormat', [
+    ('ABGR1555', 0x15731002),
+    ('ABGR32', 0x16762004 if _big_endian else 0x16462004),
+    ('ABGR4444', 0x15721002),
+    ('ABGR8888', 0x16762004),
+    ('ARGB1555', 0x15331002),
+    ('ARGB2101010', 0x16372004),
+    ('ARGB32', 0x16362004 if _big_endian else 0x16862004),
+    ('ARGB4444', 0x15321002),
+    ('ARGB8888', 0x16362004),
+    ('BGR24', 0x17401803),
+    ('BGR444', 0x15520C02),
+    ('BGR555', 0x15530F02),
+    ('BGR565', 0x15551002),
+    ('BGR888', 0x16561804),
+    ('BGRA32', 0x16862004 if _big_endian else 0x16362004),
+    ('BGRA4444', 0x15821002),
+    ('BGRA5551', 0x15841002),
+    ('BGRA8888', 0x16862004),
+    ('BGRX8888', 0x16661804),
+    ('EXTERNAL_OES', 0x2053454F),
+    ('INDEX1LSB', 0x11100100),
+    ('INDEX1MSB', 0x11200100),
+    ('INDEX4LSB', 0x12100400),
+    ('INDEX4MSB', 0x12200400),
+    ('INDEX8', 0x13000801),
+    ('IYUV', 0x56555949),
+    ('NV12', 0x3231564E),
+    ('NV21', 0x3132564E),
+    ('RGB24', 0x17101803),
+    ('RGB332', 0x14110801),
+    ('RGB444', 0x15120C02),
+    ('RGB555', 0x15130F02),
+    ('RGB565', 0x15151002),
+    ('RGB888', 0x16161804),
+    ('RGBA32', 0x16462004 if _big_endian else 0x16762004),
+    ('RGBA4444', 0x15421002),
+    ('RGBA5551', 0x15441002),
+    ('RGBA8888', 0x16462004),
+    ('RGBX8888', 0x16261804),
+    ('UNKNOWN', 0x00000000),
+    ('UYVY', 0x59565955),
+    ('XBGR1555', 0x15530F02),
+    ('XBGR4444', 0x15520C02),
+    ('XBGR8888', 0x16561804),
+    ('XRGB1555', 0x15130F02),
+    ('XRGB4444', 0x15120C02),
+    ('XRGB8888', 0x16161804),
+    ('YUY2', 0x32595559),
+    ('YV12', 0x32315659),
+    ('YVYU', 0x55595659)
+])
+
+
+def bytes_per_pixel(pixel_format: PixelFormat) -> int:
+    """The number of bytes a single pixel occupies in a packed pixel format.
+
+    Raises:
+        ValueError: If the format is a planar (FOURCC) format, like YV12 or NV12.
+    """
+    if SDL_ISPIXELFORMAT_FOURCC(pixel_format.value):
+        raise ValueError(f'PixelFormat.{pixel_format.name} is not a packed pixel format')
+    return SDL_BYTESPERPIXEL(pixel_format.value)
 
 
 class DisplayMode:
@@ -1,6 +1,7 @@
-from sdl2 import SDL_GetError
-
-
 class UIError(RuntimeError):
     def __init__(self, message: str = None):
-        super().__init__(SDL_GetError().decode('utf-8') if message is None else message)
+        if message is None:
+            # Imported here, so that the exception class is available without loading libSDL2.
+            from sdl2 import SDL_GetError
+            message = SDL_GetError().decode('utf-8')
+        super().__init__(message)
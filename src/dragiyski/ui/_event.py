@@ -1,17 +1,29 @@
 from typing import Callable, Optional
 from abc import ABC, abstractmethod
-from ._thread import add_event_listener
+from ._thread import add_event_listener, remove_event_listener, map_sdl_window_events
+from ._event_emitter import weak_reference
 from ._window import Window
-from sdl2 import *
-import sdl2
-
+import threading
+from sdl2 import (
+    SDL_DISPLAYEVENT,
+    SDL_DISPLAYEVENT_CONNECTED,
+    SDL_DISPLAYEVENT_DISCONNECTED,
+    SDL_DISPLAYEVENT_ORIENTATION,
+    SDL_Event,
+    SDL_WINDOWEVENT,
+    SDL_WINDOWEVENT_MOVED,
+    SDL_WINDOWEVENT_RESIZED,
+    SDL_WINDOWEVENT_SIZE_CHANGED
+)
+
+# Maps an event type to a tuple of listeners, replaced as a whole under `event_listener_by_type_lock`.
 event_listener_by_type = dict()
-map_sdl_window_events = dict((getattr(sdl2, x), 'window_' + x.removeprefix('SDL_WINDOWEVENT_').lower()) for x in dir(sdl2) if x.startswith('SDL_WINDOWEVENT_'))
+event_listener_by_type_lock = threading.RLock()
 
 
 class Event:
     def __init__(self, type: str, timestamp, *args, **kwargs):
-        self.timestamp = stimestamp
+        self.timestamp = timestamp
         self.type = type
 
 
@@ -34,7 +46,7 @@ class WindowEvent(Event):
 
 
 class WindowPositionEvent(WindowEvent):
-    def __init__(self, x: int, y: int, *args):
+    def __init__(self, x: int, y: int, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.x = x
         self.y = y
@@ -51,17 +63,16 @@ def create_event(sdl_event: SDL_Event):
     type = None
     Class = None
     args = {
-        'timestamp': sdl_event.common.timestamp,
-        'type': type
+        'timestamp': sdl_event.common.timestamp
     }
     if sdl_event.type == SDL_DISPLAYEVENT:
         Class = DisplayEvent
         args['display'] = sdl_event.display.display
-        if event.display.event == SDL_DISPLAYEVENT_CONNECTED:
+        if sdl_event.display.event == SDL_DISPLAYEVENT_CONNECTED:
             type = 'display_connected'
-        elif event.display.event == SDL_DISPLAYEVENT_DISCONNECTED:
+        elif sdl_event.display.event == SDL_DISPLAYEVENT_DISCONNECTED:
             type = 'display_disconnected'
-        elif event.display.event == SDL_DISPLAYEVENT_ORIENTATION:
+        elif sdl_event.display.event == SDL_DISPLAYEVENT_ORIENTATION:
             Class = DisplayOrientationEvent
             type = 'display_orientation'
             args['orientation'] = sdl_event.display.data1
@@ -69,21 +80,23 @@ def create_event(sdl_event: SDL_Event):
             return None
     elif sdl_event.type == SDL_WINDOWEVENT:
         Class = WindowEvent
-        args['type'] = map_sdl_window_events[sdl_event.window.event]
+        type = map_sdl_window_events.get(sdl_event.window.event)
+        if type is None:
+            return None
         try:
             args['window'] = Window(sdl_event.window.windowID)
         except Window.NotFound:
             return None
         if sdl_event.window.event in [SDL_WINDOWEVENT_RESIZED, SDL_WINDOWEVENT_SIZE_CHANGED]:
             Class = WindowSizeEvent
-            args['width'] = event.window.data1
-            args['height'] = event.window.data2
+            args['width'] = sdl_event.window.data1
+            args['height'] = sdl_event.window.data2
         elif sdl_event.window.event == SDL_WINDOWEVENT_MOVED:
             Class = WindowPositionEvent
             args['x'] = sdl_event.window.data1
             args['y'] = sdl_event.window.data2
     if type is not None and Class is not None:
-        return Class(**args)
+        return Class(type=type, **args)
 
 
 def dispatch_event(name: str, event: Event):
@@ -97,14 +110,32 @@ class EventDispatcher(ABC):
 
 
 class EventListener:
-    def __init__(self, function: Callable, dispatcher: EventDispatcher, once: bool = False):
-        self.__function = function
+    def __init__(self, function: Callable, dispatcher: EventDispatcher, once: bool = False, *, type: Optional[str] = None, window: Optional[Window] = None, weak: bool = False):
+        # A weak listener removes itself once the function (or the object of a bound method) is collected.
+        self.__function = weak_reference(function, self.__on_collect) if weak else function
+        self.__weak = weak
         self.__dispatcher = dispatcher
         self.__once = once
-    
+        self.__type = type
+        self.__window = window
+
+    def __on_collect(self, reference):
+        self.remove()
+
     @property
-    def function(self) -> Callable:
+    def function(self) -> Optional[Callable]:
+        """The listener function, or `None` if it was registered as weak and has been collected."""
+        if self.__weak:
+            return self.__function()
         return self.__function
+
+    @property
+    def type(self) -> Optional[str]:
+        return self.__type
+
+    @property
+    def window(self) -> Optional[Window]:
+        return self.__window
     
     @property
     def once(self) -> bool:
@@ -114,6 +145,24 @@ class EventListener:
     def dispatcher(self) -> EventDispatcher:
         return self.__dispatcher
 
+    def remove(self):
+        """Unregister the listener. Called on `Window.destroy()` for the listeners of that window."""
+        global event_listener_by_type
+        with event_listener_by_type_lock:
+            listeners = event_listener_by_type.get(self.__type, ())
+            if any(listener is self for listener in listeners):
+                remaining = tuple(listener for listener in listeners if listener is not self)
+                snapshot = dict(event_listener_by_type)
+                if len(remaining) > 0:
+                    snapshot[self.__type] = remaining
+                else:
+                    del snapshot[self.__type]
+                event_listener_by_type = snapshot
+        remove_event_listener(self)
+        if self.__window is not None:
+            self.__window._remove_event_listener(self)
+            self.__window = None
+
 
 class SimpleLoopEventDispatcher(EventDispatcher):
     def dispatch(event: Event):
@@ -123,14 +172,24 @@ class SimpleLoopEventDispatcher(EventDispatcher):
 default_dispatcher = SimpleLoopEventDispatcher()
 
 
-def ui_event(type: str, *, once: bool = False, dispatcher: Optional[EventDispatcher] = None, window: Optional[Window] = None):
+def ui_event(type: str, *, once: bool = False, dispatcher: Optional[EventDispatcher] = None, window: Optional[Window] = None, weak: bool = False):
+    """Register the decorated function as a listener of UI events of the given type.
+
+    Args:
+        window (Window, optional): Listen to the events of this window only. The listener is removed when the window is destroyed.
+        weak (bool, optional): Do not keep the function (or the object of a bound method) alive. The listener is removed
+            once it is collected, so that listeners of short-lived objects do not accumulate.
+    """
     def ui_event_decorator(function: Callable):
+        global event_listener_by_type
         nonlocal type, dispatcher, once, window
         if dispatcher is None:
             dispatcher = default_dispatcher
-        listener = EventListener(function=function, dispatcher=dispatcher, once=once)
-        if type not in event_listener_by_type:
-            event_listener_by_type[type] = list()
-        event_listener_by_type[type].append(listener)
+        listener = EventListener(function=function, dispatcher=dispatcher, once=once, type=type, window=window, weak=weak)
+        with event_listener_by_type_lock:
+            event_listener_by_type = {**event_listener_by_type, type: event_listener_by_type.get(type, ()) + (listener,)}
+        if window is not None:
+            window._add_event_listener(listener)
         add_event_listener(listener)
+        return function
     return ui_event_decorator
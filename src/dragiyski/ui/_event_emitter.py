@@ -1,46 +1,162 @@
 from typing import Callable, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from . import _metrics
+from . import _trace
 import sys
+import threading
+import time
+import weakref
 
-_executor = ThreadPoolExecutor(thread_name_prefix='dragiyski.ui.event:')
+_executor = None
+_executor_lock = threading.Lock()
+_max_workers = None
+
+
+def get_executor():
+    """Get the thread pool of the event listeners, creating it on first use."""
+    global _executor
+    executor = _executor
+    if executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _create_executor()
+            executor = _executor
+    return executor
+
+
+def _create_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix='dragiyski.ui.event:')
+
+
+def set_max_workers(count: Optional[int] = None):
+    """Set the number of threads of the event listener pool (the `ThreadPoolExecutor` default, if `None`).
+
+    The listeners emitted from now on run in a new pool; the listeners already submitted finish in the previous one.
+    """
+    global _executor, _max_workers
+    if count is not None and count <= 0:
+        raise ValueError('param `count` must be positive')
+    with _executor_lock:
+        previous = _executor
+        _max_workers = count
+        if previous is not None:
+            _executor = _create_executor()
+    # Shut down only after the swap: an emit that still holds the previous pool resubmits to the new one (see `submit()`).
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def submit(function: Callable, /, *args):
+    """Submit work to the event listener pool, retrying in the new pool if `set_max_workers()` has replaced it meanwhile."""
+    while True:
+        executor = get_executor()
+        try:
+            return executor.submit(function, *args)
+        except RuntimeError:
+            # Raised by a pool that has been shut down. Unless it has been replaced, it is the interpreter shutdown.
+            if executor is _executor:
+                raise
+
+
+def weak_reference(target, callback: Optional[Callable] = None):
+    """A weak reference to `target`. Bound methods are referenced through their object (`weakref.WeakMethod`), so they
+    stay alive as long as the object does, instead of dying with the temporary method object.
+    """
+    if hasattr(target, '__self__') and hasattr(target, '__func__'):
+        return weakref.WeakMethod(target, callback)
+    return weakref.ref(target, callback)
+
+
+class WeakListener:
+    """A listener registered with `weak=True`: it does not keep the callback alive and is removed once it is collected."""
+    __slots__ = ('reference', '__weakref__')
+
+    def __init__(self, callback: Callable, on_collect: Callable):
+        self.reference = weak_reference(callback, lambda reference: on_collect(self))
+
+    def __eq__(self, other):
+        if isinstance(other, WeakListener):
+            return self is other
+        target = self.reference()
+        return target is not None and target == other
+
+    __hash__ = object.__hash__
 
 
 class EventEmitter:
     def __init__(self, parent: 'Optional[EventEmitter]' = None):
+        # Maps an event name to a tuple of listeners. Both are replaced (never modified) under the lock, so that
+        # `emit_event()` reads a consistent snapshot without locking, also on free-threaded Python builds.
         self.__listeners = {}
+        # Reentrant: the weak reference callbacks that remove collected listeners may run during any allocation.
+        self.__lock = threading.RLock()
         self.__parent = parent
 
-    def add_event_listener(self, name: str, callback: Callable):
-        if name not in self.__listeners:
-            self.__listeners[name] = []
-        if callback not in self.__listeners[name]:
-            self.__listeners[name].append(callback)
-            return True
-        return False
+    def add_event_listener(self, name: str, callback: Callable, *, weak: bool = False):
+        """Register a listener for the event `name`.
+
+        Args:
+            weak (bool, optional): Do not keep the callback alive. The listener is removed automatically once the callback
+                (or the object of a bound method) is collected.
+
+        Returns:
+            bool: False if the callback is already registered for the event.
+        """
+        with self.__lock:
+            listeners = self.__listeners.get(name, ())
+            if callback in listeners:
+                return False
+            if weak:
+                emitter = weakref.ref(self)
+
+                def on_collect(listener):
+                    self = emitter()
+                    if self is not None:
+                        self._remove_listener(name, listener)
+                callback = WeakListener(callback, on_collect)
+            self.__listeners = {**self.__listeners, name: listeners + (callback,)}
+        return True
 
     def remove_event_listener(self, name: str, callback: Callable):
-        if name in self.__listeners:
-            try:
-                self.__listeners[name].remove(callback)
-            except ValueError:
+        with self.__lock:
+            listener = next((item for item in self.__listeners.get(name, ()) if item == callback), None)
+            if listener is None:
                 return False
-            if len(self.__listeners[name]) <= 0:
-                del self.__listeners[name]
-            return True
-        return False
+            self.__without(name, listener)
+        return True
+
+    def _remove_listener(self, name: str, listener):
+        """Remove the exact listener object (e.g. a collected `WeakListener`) without comparing the callbacks."""
+        with self.__lock:
+            if any(item is listener for item in self.__listeners.get(name, ())):
+                self.__without(name, listener)
+
+    def __without(self, name: str, listener):
+        # Must be called with the lock held.
+        remaining = tuple(item for item in self.__listeners[name] if item is not listener)
+        snapshot = dict(self.__listeners)
+        if len(remaining) > 0:
+            snapshot[name] = remaining
+        else:
+            del snapshot[name]
+        self.__listeners = snapshot
 
     def _execute(self, listener: Callable, name: str, args, kwargs):
         exc_info = [None, None, None]
         result = None
         is_success = True
+        start = time.perf_counter_ns() if _trace.enabled else None
         try:
-            result, listener(*args, **kwargs)
+            result = listener(*args, **kwargs)
         except:
             exc_info = sys.exc_info()
             is_success = False
+        if start is not None:
+            _trace.record(_trace.function_name(listener), 'listener', start, time.perf_counter_ns(), {'event': name})
         return (is_success, name, listener, result, *exc_info, args, kwargs)
 
     def _exception_check(self, name: str, futures, args, kwargs):
+        from concurrent.futures import as_completed
         for future in as_completed(futures):
             try:
                 call_info = future.result()
@@ -52,11 +168,21 @@ class EventEmitter:
                 self.emit_event('exception', call_info[1], call_info[2], call_info[4], call_info[5], call_info[6], *call_info[7], **call_info[8])
 
     def emit_event(self, name: str, /, *args, **kwargs):
-        if name not in self.__listeners:
+        listeners = self.__listeners.get(name)
+        if listeners is None:
             return
-        futures = [_executor.submit(self._execute, listener, name, args, kwargs) for listener in self.__listeners]
+        futures = []
+        for listener in listeners:
+            if isinstance(listener, WeakListener):
+                # The strong reference is held by the submitted work item until the listener returns.
+                listener = listener.reference()
+                if listener is None:
+                    continue
+            futures.append(submit(self._execute, listener, name, args, kwargs))
+        if _metrics.enabled:
+            _metrics.listener_backlog.record(_metrics.executor_backlog(get_executor()))
         if name != 'exception':
-            _executor.submit(self._exception_check, name, futures, args, kwargs)
+            submit(self._exception_check, name, futures, args, kwargs)
         if self.__parent is not None:
             self.__parent.emit_event(name, *args, **kwargs)
 
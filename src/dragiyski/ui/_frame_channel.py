@@ -0,0 +1,308 @@
+from sdl2 import (
+    SDL_BITSPERPIXEL,
+    SDL_BLENDMODE_NONE,
+    SDL_BlitSurface,
+    SDL_ClearError,
+    SDL_CreateRGBSurfaceWithFormatFrom,
+    SDL_FreeSurface,
+    SDL_SetSurfaceBlendMode
+)
+from multiprocessing import shared_memory
+from typing import Iterable, Optional
+from ._error import UIError
+from ._display import PixelFormat, bytes_per_pixel
+from ._thread import run_in_event_thread, post_in_event_thread
+import contextlib
+import ctypes
+import threading
+import time
+
+# Shared memory layout:
+# - header: 8 x uint64 [magic, width, height, pitch, pixel_format, slot_count, reserved, reserved]
+# - slot table: slot_count x 2 x uint64 [sequence, timestamp]
+#   The sequence is a seqlock: it is odd while a producer writes the slot and even when the slot is stable.
+#   The timestamp is `time.monotonic_ns()` at the time the frame was published (0 for an empty slot).
+# - pixels: slot_count x (height x pitch) bytes, each slot aligned to _alignment bytes.
+_magic = 0x46495544  # 'DUIF'
+_header_size = 8
+_alignment = 64
+
+
+def _align(value: int) -> int:
+    return (value + _alignment - 1) // _alignment * _alignment
+
+
+class FrameChannel:
+    """A ring of frame slots in shared memory, written by producer processes and shown in a window by the UI process.
+
+    The UI process creates the channel with `FrameChannel.create()` and passes `name` to the producers, which use
+    `FrameChannel.attach()`. A producer writes directly into a free slot (see `frame()`) and publishes it. The UI
+    event thread copies only the newest published frame into the window (see `present()` and `bind()`), so older
+    frames are dropped when producers are faster than the display.
+
+    When several producers share a channel, each of them must be given a disjoint set of slots.
+    """
+
+    @classmethod
+    def create(cls, width: int, height: int, pixel_format: PixelFormat = PixelFormat.ARGB8888, slots: int = 3):
+        """Create a new channel. Called by the process that owns the windows.
+
+        Args:
+            width (int): The width of the frames in pixels.
+            height (int): The height of the frames in pixels.
+            pixel_format (PixelFormat, optional): A packed pixel format of the frames.
+            slots (int, optional): The number of frame slots. At least 2, 3 or more avoids producers waiting on the reader.
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError('params `width` and `height` must be positive')
+        if slots < 2:
+            raise ValueError('param `slots` must be at least 2')
+        pitch = (width * bytes_per_pixel(pixel_format) + 3) // 4 * 4
+        data_offset = _align((_header_size + slots * 2) * 8)
+        slot_size = _align(height * pitch)
+        memory = shared_memory.SharedMemory(create=True, size=data_offset + slots * slot_size)
+        self = cls._from_memory(memory, owner=True)
+        self._header[:] = [_magic, width, height, pitch, pixel_format.value, slots, 0, 0]
+        self._init_layout()
+        self._slot_table[:] = 0
+        return self
+
+    @classmethod
+    def attach(cls, name: str, slots: Optional[Iterable[int]] = None):
+        """Attach to an existing channel. Called by the producer processes.
+
+        Args:
+            name (str): The `name` of the channel returned by `create()`.
+            slots (Iterable[int], optional): The slots this producer can write into. Defaults to all slots.
+        """
+        memory = shared_memory.SharedMemory(name=name)
+        self = cls._from_memory(memory, owner=False)
+        if self._header[0] != _magic:
+            self.close()
+            raise ValueError(f'The shared memory [{name}] is not a frame channel')
+        self._init_layout()
+        if slots is not None:
+            slots = sorted(set(slots))
+            if len(slots) <= 0 or slots[0] < 0 or slots[-1] >= self.slot_count:
+                self.close()
+                raise IndexError(f'param `slots` out of range: [0, {self.slot_count - 1}]')
+            self._writable_slots = slots
+        return self
+
+    @classmethod
+    def _from_memory(cls, memory: shared_memory.SharedMemory, owner: bool):
+        import numpy
+        self = cls.__new__(cls)
+        self._memory = memory
+        self._owner = owner
+        self._header = numpy.ndarray((_header_size,), dtype=numpy.uint64, buffer=memory.buf)
+        self._slot_table = None
+        self._slots = None
+        self._writable_slots = None
+        self._sdl_surfaces = None
+        self._slot_offsets = None
+        self._last_timestamp = 0
+        self._presented = 0
+        self._dropped = 0
+        self._binding = None
+        # Set by the UI event thread when the channel is closed; a present posted before that is skipped.
+        self._closed = False
+        self._consumer = False
+        return self
+
+    def _init_layout(self):
+        import numpy
+        slots = self.slot_count
+        height, pitch = self.height, self.pitch
+        self._slot_table = numpy.ndarray((slots, 2), dtype=numpy.uint64, buffer=self._memory.buf, offset=_header_size * 8)
+        data_offset = _align((_header_size + slots * 2) * 8)
+        slot_size = _align(height * pitch)
+        size = bytes_per_pixel(self.pixel_format)
+        self._slot_offsets = [data_offset + index * slot_size for index in range(slots)]
+        self._slots = [
+            numpy.ndarray((height, self.width, size), dtype=numpy.uint8, buffer=self._memory.buf, offset=offset, strides=(pitch, size, 1))
+            for offset in self._slot_offsets
+        ]
+        self._writable_slots = list(range(slots))
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def width(self) -> int:
+        return int(self._header[1])
+
+    @property
+    def height(self) -> int:
+        return int(self._header[2])
+
+    @property
+    def pitch(self) -> int:
+        return int(self._header[3])
+
+    @property
+    def pixel_format(self) -> PixelFormat:
+        return PixelFormat(int(self._header[4]))
+
+    @property
+    def slot_count(self) -> int:
+        return int(self._header[5])
+
+    @property
+    def presented(self) -> int:
+        """The number of frames shown in the window by this process."""
+        return self._presented
+
+    @property
+    def dropped(self) -> int:
+        """The number of published frames that were never shown, because a newer frame was available."""
+        return self._dropped
+
+    # Producer side
+
+    @contextlib.contextmanager
+    def frame(self):
+        """Acquire the oldest writable slot, yield it as a numpy array of shape `(height, width, bytes_per_pixel)`
+        and publish it when the context exits without an exception.
+        """
+        table = self._slot_table
+        index = min(self._writable_slots, key=lambda slot: table[slot, 1])
+        table[index, 0] += 1
+        published = False
+        try:
+            yield self._slots[index]
+            table[index, 1] = time.monotonic_ns()
+            published = True
+        finally:
+            if not published:
+                # The slot content is undefined, make sure it is never presented.
+                table[index, 1] = 0
+            table[index, 0] += 1
+
+    def write(self, frame):
+        """Publish a frame from an array of shape `(height, width, bytes_per_pixel)`."""
+        with self.frame() as pixels:
+            pixels[...] = frame
+
+    # Consumer side
+
+    def _newest_slot(self):
+        table = self._slot_table
+        newest = None
+        pending = 0
+        for index in range(len(table)):
+            sequence, timestamp = int(table[index, 0]), int(table[index, 1])
+            if sequence & 1 or timestamp <= self._last_timestamp:
+                continue
+            pending += 1
+            if newest is None or timestamp > newest[2]:
+                newest = (index, sequence, timestamp)
+        return newest, pending
+
+    def has_new_frame(self) -> bool:
+        return self._newest_slot()[0] is not None
+
+    def present(self, window) -> bool:
+        """Copy the newest published frame into the window surface and update the window, in the UI event thread.
+
+        Returns:
+            bool: True if a new frame has been shown.
+        """
+        self._consumer = True
+        return run_in_event_thread(self._present, window)
+
+    def _present(self, window) -> bool:
+        if self._closed:
+            return False
+        newest, pending = self._newest_slot()
+        if newest is None or window.id is None:
+            return False
+        index, sequence, timestamp = newest
+        if self._sdl_surfaces is None:
+            self._sdl_surfaces = [None] * self.slot_count
+        sdl_surface = self._sdl_surfaces[index]
+        if sdl_surface is None:
+            pixels = ctypes.c_uint8.from_buffer(self._memory.buf, self._slot_offsets[index])
+            SDL_ClearError()
+            sdl_surface = SDL_CreateRGBSurfaceWithFormatFrom(
+                ctypes.addressof(pixels), self.width, self.height, SDL_BITSPERPIXEL(self.pixel_format.value), self.pitch, self.pixel_format.value
+            )
+            if not sdl_surface:
+                raise UIError
+            # Frames replace the window content, they are not blended into it.
+            SDL_SetSurfaceBlendMode(sdl_surface, SDL_BLENDMODE_NONE)
+            self._sdl_surfaces[index] = (sdl_surface, pixels)
+        else:
+            sdl_surface = sdl_surface[0]
+        surface = window.surface()
+        if SDL_BlitSurface(sdl_surface, None, surface._Surface__impl, None) < 0:
+            raise UIError
+        if int(self._slot_table[index, 0]) != sequence:
+            # A producer has overwritten the slot during the copy; drop the torn frame, a newer one is on the way.
+            self._dropped += 1
+            return False
+        self._last_timestamp = timestamp
+        self._presented += 1
+        self._dropped += pending - 1
+        surface.update()
+        return True
+
+    def bind(self, window, fps: float = 60):
+        """Start a daemon thread that checks the channel `fps` times per second and presents new frames into the window.
+
+        The check does not involve the UI event thread; only a new frame schedules a (non-blocking) present.
+        """
+        if fps <= 0:
+            raise ValueError('param `fps` must be positive')
+        self.unbind()
+        self._consumer = True
+        stopped = threading.Event()
+        thread = threading.Thread(target=self._pump, args=(window, 1.0 / fps, stopped), name=f'dragiyski.ui.frame:{self.name}', daemon=True)
+        self._binding = (stopped, thread)
+        thread.start()
+
+    def unbind(self):
+        """Stop the thread started by `bind()` and wait for it to exit. A present it has already posted may still run."""
+        if self._binding is not None:
+            stopped, thread = self._binding
+            self._binding = None
+            stopped.set()
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _pump(self, window, interval: float, stopped: threading.Event):
+        pending = None
+        while not stopped.wait(interval):
+            if window.id is None:
+                break
+            if pending is not None and not pending.done():
+                continue
+            if self.has_new_frame():
+                pending = post_in_event_thread(self._present, window)
+
+    def close(self):
+        """Detach from the shared memory. The process that created the channel also releases it."""
+        self.unbind()
+        if self._consumer:
+            # Queued after any present posted by the pump thread, which then sees the channel closed.
+            run_in_event_thread(self._release_surfaces)
+        # All views must be released before the shared memory can be closed.
+        self._header = self._slot_table = self._slots = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def _release_surfaces(self):
+        self._closed = True
+        if self._sdl_surfaces is not None:
+            for surface in self._sdl_surfaces:
+                if surface is not None:
+                    SDL_FreeSurface(surface[0])
+            self._sdl_surfaces = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
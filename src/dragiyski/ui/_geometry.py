@@ -1,4 +1,4 @@
-from sdl2 import *
+from sdl2 import SDL_Rect
 import typing
 import math
 
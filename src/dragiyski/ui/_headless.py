@@ -0,0 +1,57 @@
+import os
+
+# Video drivers that do not require a display. Both keep the window framebuffer in memory.
+headless_drivers = ('dummy', 'offscreen')
+_headless_driver = None
+_environment_applied = False
+
+
+def enable(driver: str = 'dummy'):
+    """Run all windows without a display.
+
+    Must be called before the video subsystem is initialized (i.e. before the first display query or window). Alternatively,
+    set the environment variable `DRAGIYSKI_UI_HEADLESS` to `1` (or to the name of the driver) before importing the module.
+
+    In headless mode every window is backed by an in-memory surface, renderers are always software renderers and
+    `Window.capture()` returns the current frame of the window.
+
+    Args:
+        driver (str, optional): The libSDL2 video driver to use: `'dummy'` or `'offscreen'`.
+    """
+    global _headless_driver
+    if driver not in headless_drivers:
+        raise ValueError(f'param `driver` must be one of: {", ".join(headless_drivers)}')
+    from sdl2 import SDL_WasInit, SDL_INIT_VIDEO, SDL_GetCurrentVideoDriver
+    if SDL_WasInit(SDL_INIT_VIDEO):
+        current = SDL_GetCurrentVideoDriver()
+        if current is not None and current.decode('utf-8') == driver:
+            _headless_driver = driver
+            return
+        raise RuntimeError('Cannot enable headless mode after the video subsystem has been initialized')
+    # libSDL2 reads the video driver from the environment when the video subsystem is initialized.
+    os.environ['SDL_VIDEODRIVER'] = driver
+    _headless_driver = driver
+
+
+def is_enabled() -> bool:
+    return _headless_driver is not None
+
+
+def driver():
+    """The headless video driver in use, or `None` if headless mode is not enabled."""
+    return _headless_driver
+
+
+def _enable_from_environment():
+    """Enable headless mode if the environment variable `DRAGIYSKI_UI_HEADLESS` is set. Only the first call has an effect."""
+    global _environment_applied
+    if _environment_applied:
+        return
+    _environment_applied = True
+    value = os.environ.get('DRAGIYSKI_UI_HEADLESS', '').strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return
+    enable('dummy' if value in ('1', 'true', 'yes') else value)
+
+
+_enable_from_environment()
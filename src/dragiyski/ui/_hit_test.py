@@ -0,0 +1,102 @@
+from sdl2 import (
+    SDL_HITTEST_DRAGGABLE,
+    SDL_HITTEST_NORMAL,
+    SDL_HITTEST_RESIZE_BOTTOM,
+    SDL_HITTEST_RESIZE_BOTTOMLEFT,
+    SDL_HITTEST_RESIZE_BOTTOMRIGHT,
+    SDL_HITTEST_RESIZE_LEFT,
+    SDL_HITTEST_RESIZE_RIGHT,
+    SDL_HITTEST_RESIZE_TOP,
+    SDL_HITTEST_RESIZE_TOPLEFT,
+    SDL_HITTEST_RESIZE_TOPRIGHT
+)
+from typing import Callable, Optional
+from ._geometry import Rectangle
+from bisect import bisect_right
+
+# The kinds of hit regions, by name.
+hit_kinds = {
+    'normal': SDL_HITTEST_NORMAL,
+    'draggable': SDL_HITTEST_DRAGGABLE,
+    'resize_top_left': SDL_HITTEST_RESIZE_TOPLEFT,
+    'resize_top': SDL_HITTEST_RESIZE_TOP,
+    'resize_top_right': SDL_HITTEST_RESIZE_TOPRIGHT,
+    'resize_right': SDL_HITTEST_RESIZE_RIGHT,
+    'resize_bottom_right': SDL_HITTEST_RESIZE_BOTTOMRIGHT,
+    'resize_bottom': SDL_HITTEST_RESIZE_BOTTOM,
+    'resize_bottom_left': SDL_HITTEST_RESIZE_BOTTOMLEFT,
+    'resize_left': SDL_HITTEST_RESIZE_LEFT
+}
+_hit_kind_names = {value: name for name, value in hit_kinds.items()}
+
+
+class HitTable:
+    """Hit regions compiled into a lookup table, for answering the libSDL2 hit test with minimal python work.
+
+    The edges of the regions split the window into a grid of cells with a single result each. A lookup is two binary
+    searches (in C) and an index into a byte array, regardless of the number of regions. The table is immutable.
+    """
+    __slots__ = ('__columns', '__rows', '__cells')
+
+    def __init__(self, regions):
+        """
+        Args:
+            regions (Iterable[tuple[str, Rectangle]]): The kind (a key of `hit_kinds`) and the area of each region, in
+                window coordinates. Where regions overlap, the first one wins. The rest of the window is `'normal'`.
+        """
+        compiled = []
+        for (kind, rectangle) in regions:
+            if kind not in hit_kinds:
+                raise ValueError(f'Unknown hit region kind: {kind}')
+            compiled.append((hit_kinds[kind], rectangle.left, rectangle.top, rectangle.right + 1, rectangle.bottom + 1))
+        self.__columns = columns = sorted({x for region in compiled for x in (region[1], region[3])})
+        self.__rows = rows = sorted({y for region in compiled for y in (region[2], region[4])})
+        # Cell (row, column) covers [rows[row - 1], rows[row]) x [columns[column - 1], columns[column]).
+        width = len(columns) + 1
+        cells = bytearray(width * (len(rows) + 1))
+        for (result, left, top, right, bottom) in reversed(compiled):
+            first_column, last_column = bisect_right(columns, left), bisect_right(columns, right - 1)
+            for row in range(bisect_right(rows, top), bisect_right(rows, bottom - 1) + 1):
+                cells[row * width + first_column:row * width + last_column + 1] = bytes([result]) * (last_column - first_column + 1)
+        self.__cells = bytes(cells)
+
+    def lookup(self, x: int, y: int) -> int:
+        """The `SDL_HITTEST_*` result at a point."""
+        return self.__cells[bisect_right(self.__rows, y) * (len(self.__columns) + 1) + bisect_right(self.__columns, x)]
+
+    def kind(self, x: int, y: int) -> str:
+        """The kind of the region at a point."""
+        return _hit_kind_names[self.lookup(x, y)]
+
+
+def border_regions(border: int = 6, caption: int = 0, *, corner: Optional[int] = None) -> Callable:
+    """The layout of a borderless window with resize edges and an optional caption (title bar) that moves the window.
+
+    Args:
+        border (int, optional): The width of the resize edges.
+        caption (int, optional): The height of the draggable area at the top, below the top edge.
+        corner (int, optional): The size of the diagonal resize areas in the corners. Defaults to `border`.
+
+    Returns:
+        Callable: A layout for `Window.set_hit_regions()`: `layout(width, height)` returns the regions for that size.
+            Layouts can be combined, e.g. `lambda width, height: [('normal', close_button), *layout(width, height)]`.
+    """
+    if border <= 0:
+        raise ValueError('param `border` must be positive')
+    corner = border if corner is None else corner
+
+    def layout(width: int, height: int) -> list:
+        regions = [
+            ('resize_top_left', Rectangle(0, 0, corner, corner)),
+            ('resize_top_right', Rectangle(width - corner, 0, corner, corner)),
+            ('resize_bottom_left', Rectangle(0, height - corner, corner, corner)),
+            ('resize_bottom_right', Rectangle(width - corner, height - corner, corner, corner)),
+            ('resize_top', Rectangle(0, 0, width, border)),
+            ('resize_bottom', Rectangle(0, height - border, width, border)),
+            ('resize_left', Rectangle(0, 0, border, height)),
+            ('resize_right', Rectangle(width - border, 0, border, height))
+        ]
+        if caption > 0:
+            regions.append(('draggable', Rectangle(0, 0, width, border + caption)))
+        return regions
+    return layout
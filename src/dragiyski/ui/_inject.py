@@ -0,0 +1,280 @@
+from sdl2 import (
+    SDL_ADDEVENT,
+    SDL_ClearError,
+    SDL_Event,
+    SDL_GetTicks,
+    SDL_INIT_EVENTS,
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP,
+    SDL_MOUSEMOTION,
+    SDL_MOUSEWHEEL,
+    SDL_PeepEvents,
+    SDL_QUIT,
+    SDL_USEREVENT,
+    SDL_WINDOWEVENT
+)
+from typing import Optional
+from ._error import UIError
+from ._application import init_subsystem
+from ._thread import map_sdl_window_events, run_in_event_thread
+import ctypes
+import functools
+import threading
+import time
+
+# The number of events added to the libSDL2 queue by a single SDL_PeepEvents() call.
+chunk_size = 4096
+
+# Event type names accepted in the event descriptions of `inject()`.
+event_types = {
+    'quit': SDL_QUIT,
+    'window': SDL_WINDOWEVENT,
+    'key_down': SDL_KEYDOWN,
+    'key_up': SDL_KEYUP,
+    'mouse_motion': SDL_MOUSEMOTION,
+    'mouse_button_down': SDL_MOUSEBUTTONDOWN,
+    'mouse_button_up': SDL_MOUSEBUTTONUP,
+    'mouse_wheel': SDL_MOUSEWHEEL,
+    'user': SDL_USEREVENT
+}
+
+# The member of the SDL_Event union that describes each event type.
+_event_members = {
+    SDL_WINDOWEVENT: 'window',
+    SDL_KEYDOWN: 'key',
+    SDL_KEYUP: 'key',
+    SDL_MOUSEMOTION: 'motion',
+    SDL_MOUSEBUTTONDOWN: 'button',
+    SDL_MOUSEBUTTONUP: 'button',
+    SDL_MOUSEWHEEL: 'wheel'
+}
+_window_event_codes = {name: code for code, name in map_sdl_window_events.items()}
+_events_ready = False
+
+
+@functools.lru_cache(maxsize=None)
+def event_dtype(kind: str = 'window'):
+    """A numpy structured dtype with the memory layout of `SDL_Event`, for building event arrays for `inject()`.
+
+    The fields are those of the `SDL_Event` member `kind` (`'common'`, `'window'`, `'key'`, `'motion'`, `'button'`,
+    `'wheel'` or `'user'`), with the libSDL2 names (e.g. `type`, `timestamp`, `windowID`, `event`, `data1`, `data2` for
+    window events). The fields of the key symbol are flattened (`scancode`, `sym`, `mod`).
+    """
+    import numpy
+    member = dict(SDL_Event._fields_).get(kind)
+    if member is None or kind in ('type', 'padding'):
+        raise ValueError(f'Unknown event kind: {kind}')
+    names, formats, offsets = [], [], []
+
+    def add_fields(structure, base: int):
+        for (name, field_type) in structure._fields_:
+            offset = base + getattr(structure, name).offset
+            if isinstance(field_type, type) and issubclass(field_type, ctypes.Structure):
+                add_fields(field_type, offset)
+            elif not name.startswith('padding') and name != 'unused':
+                names.append(name)
+                formats.append(numpy.dtype(field_type))
+                offsets.append(offset)
+
+    add_fields(member, 0)
+    return numpy.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': ctypes.sizeof(SDL_Event)})
+
+
+def _ensure_events():
+    global _events_ready
+    if not _events_ready:
+        run_in_event_thread(init_subsystem, SDL_INIT_EVENTS)
+        _events_ready = True
+
+
+def _window_id(window) -> int:
+    if isinstance(window, int):
+        return window
+    window_id = window.id
+    if window_id is None:
+        raise ValueError('The window has been destroyed')
+    return window_id
+
+
+def _from_description(target: SDL_Event, description: dict, window_id: Optional[int]):
+    description = dict(description)
+    event_type = description.pop('type')
+    if isinstance(event_type, str):
+        event_type = event_types[event_type]
+    target.type = event_type
+    if event_type >= SDL_USEREVENT:
+        member = target.user
+    elif event_type in _event_members:
+        member = getattr(target, _event_members[event_type])
+    else:
+        member = target.common
+    if 'window' in description:
+        window_id = _window_id(description.pop('window'))
+    if window_id is not None and hasattr(member, 'windowID'):
+        member.windowID = window_id
+    if event_type == SDL_WINDOWEVENT and isinstance(description.get('event'), str):
+        name = description['event']
+        description['event'] = _window_event_codes[name if name.startswith('window_') else 'window_' + name]
+    for (name, value) in description.items():
+        if name in ('scancode', 'sym', 'mod') and hasattr(member, 'keysym'):
+            setattr(member.keysym, name, value)
+        else:
+            setattr(member, name, value)
+
+
+def _to_array(events, window):
+    """Convert the events into a numpy array of SDL_Event layout, owned by the caller."""
+    import numpy
+    window_id = _window_id(window) if window is not None else None
+    if isinstance(events, numpy.ndarray):
+        if events.dtype.itemsize != ctypes.sizeof(SDL_Event) or events.dtype.names is None or 'type' not in events.dtype.names:
+            raise ValueError('param `events` must be an array of `event_dtype()`')
+        array = numpy.array(events, copy=True, order='C')
+        if window_id is not None and 'windowID' in array.dtype.names:
+            array['windowID'][array['windowID'] == 0] = window_id
+        return array
+    events = list(events)
+    buffer = (SDL_Event * len(events))()
+    for (index, description) in enumerate(events):
+        _from_description(buffer[index], description, window_id)
+    return numpy.frombuffer(buffer, dtype=event_dtype('common'))
+
+
+def _add_events(array, start: int, count: int) -> int:
+    base = array.ctypes.data + start * ctypes.sizeof(SDL_Event)
+    SDL_ClearError()
+    added = SDL_PeepEvents(ctypes.cast(base, ctypes.POINTER(SDL_Event)), count, SDL_ADDEVENT, 0, 0)
+    if added < 0:
+        raise UIError
+    return added
+
+
+def inject(events, *, window=None) -> int:
+    """Add events to the libSDL2 event queue, in chunks of `chunk_size` events per `SDL_PeepEvents()` call.
+
+    The events are processed by the UI event thread like real input, once it pumps the libSDL2 events (i.e. while there
+    are windows or event listeners): key and mouse events also update the state polled with `dragiyski.ui.input`. Can
+    be called from any thread.
+
+    Args:
+        events (Iterable[dict] | numpy.ndarray): Either dictionaries with `type` (an `SDL_*` event type or a name from
+            `event_types`) and the fields of the matching `SDL_Event` member (e.g. `{'type': 'window', 'event': 'exposed'}`,
+            `{'type': 'mouse_motion', 'x': 10, 'y': 20}`), or a numpy array of `event_dtype()`.
+        window (Window | int, optional): The window (or window id) of the events that do not specify one.
+
+    Returns:
+        int: The number of events added. Smaller than the number of events, if the queue is full.
+    """
+    _ensure_events()
+    array = _to_array(events, window)
+    timestamps = array['timestamp']
+    timestamps[timestamps == 0] = SDL_GetTicks()
+    added = 0
+    while added < len(array):
+        count = min(chunk_size, len(array) - added)
+        chunk_added = _add_events(array, added, count)
+        added += chunk_added
+        if chunk_added < count:
+            break
+    return added
+
+
+class EventGenerator:
+    """Inject events at a fixed rate from a background thread, to find the event rate at which the dispatch saturates.
+
+    The events are taken from `events` in a loop. Each injected event is stamped with the time of its injection. The
+    events that do not fit into the libSDL2 queue (because the UI event thread does not keep up) are counted in `dropped`.
+    """
+
+    def __init__(self, events, rate: float, *, window=None, duration: Optional[float] = None):
+        """
+        Args:
+            events (Iterable[dict] | numpy.ndarray): The events to repeat, as in `inject()`.
+            rate (float): The number of events per second.
+            window (Window | int, optional): The window of the events that do not specify one.
+            duration (float, optional): Stop after this many seconds. By default, run until `stop()`.
+        """
+        if rate <= 0:
+            raise ValueError('param `rate` must be positive')
+        _ensure_events()
+        self.__events = _to_array(events, window)
+        if len(self.__events) <= 0:
+            raise ValueError('param `events` must not be empty')
+        self.__rate = rate
+        self.__duration = duration
+        self.__injected = 0
+        self.__dropped = 0
+        self.__started = None
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    @property
+    def injected(self) -> int:
+        return self.__injected
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    @property
+    def elapsed(self) -> float:
+        if self.__started is None:
+            return 0.0
+        return time.perf_counter() - self.__started
+
+    def start(self):
+        if self.__thread is not None:
+            raise RuntimeError('The generator has already been started')
+        self.__thread = threading.Thread(target=self._run, name='dragiyski.ui.inject', daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__stopped.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A generator with a duration runs to the end, unless the block raised.
+        if self.__duration is None or exc_type is not None:
+            self.stop()
+        self.join()
+
+    def _run(self):
+        events = self.__events
+        size = len(events)
+        position = 0
+        self.__started = start = time.perf_counter()
+        # Inject about a thousand times per second; larger steps for high rates keep the chunks large.
+        interval = 0.001
+        while not self.__stopped.wait(interval):
+            elapsed = time.perf_counter() - start
+            if self.__duration is not None and elapsed >= self.__duration:
+                # Not `start + duration - start`: rounding could lose the last event.
+                elapsed = self.__duration
+                self.__stopped.set()
+            due = int(elapsed * self.__rate) - self.__injected - self.__dropped
+            ticks = SDL_GetTicks()
+            while due > 0:
+                count = min(due, size - position, chunk_size)
+                events['timestamp'][position:position + count] = ticks
+                added = _add_events(events, position, count)
+                self.__injected += added
+                if added < count:
+                    # The queue is full: skip the rest of this step.
+                    self.__dropped += due - added
+                    position = (position + added) % size
+                    break
+                due -= count
+                position = (position + count) % size
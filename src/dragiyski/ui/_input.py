@@ -0,0 +1,162 @@
+from sdl2 import (
+    SDL_BUTTON,
+    SDL_BUTTON_LMASK,
+    SDL_BUTTON_MMASK,
+    SDL_BUTTON_RMASK,
+    SDL_BUTTON_X1MASK,
+    SDL_BUTTON_X2MASK,
+    SDL_ClearError,
+    SDL_Event,
+    SDL_GetKeyboardState,
+    SDL_GetMouseState,
+    SDL_GetScancodeFromName,
+    SDL_INIT_VIDEO,
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP,
+    SDL_MOUSEMOTION,
+    SDL_SCANCODE_UNKNOWN
+)
+from typing import NamedTuple
+from ._error import UIError
+from ._application import ensure_subsystem
+from ._thread import in_event_thread
+from . import _thread
+import ctypes
+import threading
+
+# The input state is recorded by the UI event thread from the key and mouse events it processes (also the ones
+# pushed by the application), starting with the first call below. libSDL2 pumps the events while there are windows
+# or event listeners; without a window it does not receive keyboard or mouse input anyway. Reading the state does not
+# need the event thread: the keyboard state is a numpy array updated in place and the mouse state is a few integers.
+_keyboard_state = None
+_keys = None
+# x, y, relative x, relative y, buttons; modified under `_input_lock`.
+_mouse = [0, 0, 0, 0, 0]
+_input_lock = threading.Lock()
+
+_input_event_types = frozenset([
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_MOUSEMOTION,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP
+])
+
+
+class MouseState(NamedTuple):
+    x: int
+    y: int
+    relative_x: int
+    relative_y: int
+    buttons: int
+
+    @property
+    def left(self) -> bool:
+        return (self.buttons & SDL_BUTTON_LMASK) != 0
+
+    @property
+    def middle(self) -> bool:
+        return (self.buttons & SDL_BUTTON_MMASK) != 0
+
+    @property
+    def right(self) -> bool:
+        return (self.buttons & SDL_BUTTON_RMASK) != 0
+
+    @property
+    def x1(self) -> bool:
+        return (self.buttons & SDL_BUTTON_X1MASK) != 0
+
+    @property
+    def x2(self) -> bool:
+        return (self.buttons & SDL_BUTTON_X2MASK) != 0
+
+
+@in_event_thread
+@ensure_subsystem(SDL_INIT_VIDEO)
+def _create_keyboard_state():
+    global _keys
+    import numpy
+    count = ctypes.c_int()
+    SDL_ClearError()
+    pointer = SDL_GetKeyboardState(ctypes.byref(count))
+    if not pointer:
+        raise UIError
+    # Start from the state libSDL2 has seen so far; the events still queued are applied again when processed.
+    _keys = numpy.ctypeslib.as_array(pointer, shape=(count.value,)) != 0
+    x = ctypes.c_int()
+    y = ctypes.c_int()
+    buttons = SDL_GetMouseState(ctypes.byref(x), ctypes.byref(y))
+    # Not read before this returns: `keyboard_state()` holds `_input_lock` meanwhile and `mouse_state()` waits for it.
+    _mouse[:] = [x.value, y.value, 0, 0, buttons]
+    # From now on, in the same thread, every input event is recorded.
+    _thread.input_event_types = _input_event_types
+    state = _keys.view()
+    state.flags.writeable = False
+    return state
+
+
+def record_event(sdl_event: SDL_Event):
+    """Update the input state from a key or mouse event. Called in the UI event thread."""
+    event_type = sdl_event.type
+    if event_type == SDL_KEYDOWN or event_type == SDL_KEYUP:
+        scancode = sdl_event.key.keysym.scancode
+        if 0 <= scancode < len(_keys):
+            _keys[scancode] = event_type == SDL_KEYDOWN
+        return
+    with _input_lock:
+        if event_type == SDL_MOUSEMOTION:
+            motion = sdl_event.motion
+            _mouse[0] = motion.x
+            _mouse[1] = motion.y
+            _mouse[2] += motion.xrel
+            _mouse[3] += motion.yrel
+            _mouse[4] = motion.state
+        else:
+            button = sdl_event.button
+            _mouse[0] = button.x
+            _mouse[1] = button.y
+            if event_type == SDL_MOUSEBUTTONDOWN:
+                _mouse[4] |= SDL_BUTTON(button.button)
+            else:
+                _mouse[4] &= ~SDL_BUTTON(button.button)
+
+
+def keyboard_state():
+    """The pressed state of every key, indexed by scancode (`sdl2.SDL_SCANCODE_*` or `scancode()`).
+
+    The result is a read-only numpy array of dtype `bool`: it is always the same array and reflects the key events
+    processed so far by the UI event thread, without copying. Use `.copy()` to keep the state of a frame.
+    """
+    global _keyboard_state
+    if _keyboard_state is None:
+        with _input_lock:
+            if _keyboard_state is None:
+                _keyboard_state = _create_keyboard_state()
+    return _keyboard_state
+
+
+def scancode(name: str) -> int:
+    """The scancode of a key by its libSDL2 name (e.g. `'A'`, `'Space'`, `'Left Shift'`)."""
+    value = SDL_GetScancodeFromName(name.encode('utf-8'))
+    if value == SDL_SCANCODE_UNKNOWN:
+        raise ValueError(f'Unknown key: {name}')
+    return value
+
+
+def mouse_state() -> MouseState:
+    """The mouse position (relative to the window of the last mouse event) and buttons, with the motion since the
+    previous call.
+
+    The relative motion is accumulated from the processed events and reset by each call, so it should be read from a
+    single polling loop.
+    """
+    if _keyboard_state is None:
+        # Starts recording the input events in the UI event thread.
+        keyboard_state()
+    with _input_lock:
+        state = MouseState(*_mouse)
+        _mouse[2] = 0
+        _mouse[3] = 0
+    return state
@@ -0,0 +1,347 @@
+from sdl2 import (
+    SDL_CONTROLLERAXISMOTION,
+    SDL_CONTROLLERBUTTONUP,
+    SDL_ClearError,
+    SDL_Event,
+    SDL_GETEVENT,
+    SDL_GameControllerClose,
+    SDL_GameControllerGetJoystick,
+    SDL_GameControllerOpen,
+    SDL_HINT_JOYSTICK_ALLOW_BACKGROUND_EVENTS,
+    SDL_INIT_GAMECONTROLLER,
+    SDL_INIT_JOYSTICK,
+    SDL_IsGameController,
+    SDL_JOYAXISMOTION,
+    SDL_JOYBALLMOTION,
+    SDL_JOYBUTTONUP,
+    SDL_JOYHATMOTION,
+    SDL_JOYSTICK_TYPE_GAMECONTROLLER,
+    SDL_JOYSTICK_TYPE_UNKNOWN,
+    SDL_JoystickAttachVirtual,
+    SDL_JoystickClose,
+    SDL_JoystickDetachVirtual,
+    SDL_JoystickInstanceID,
+    SDL_JoystickName,
+    SDL_JoystickNameForIndex,
+    SDL_JoystickNumAxes,
+    SDL_JoystickNumButtons,
+    SDL_JoystickNumHats,
+    SDL_JoystickOpen,
+    SDL_JoystickSetVirtualAxis,
+    SDL_JoystickSetVirtualButton,
+    SDL_JoystickSetVirtualHat,
+    SDL_NumJoysticks,
+    SDL_PeepEvents,
+    SDL_SetHint
+)
+from ._error import UIError
+from ._application import init_subsystem
+from ._thread import add_event_listener, remove_event_listener, in_event_thread
+from . import _metrics
+import ctypes
+import functools
+import threading
+
+# The kind of a sample
+AXIS = 0
+BUTTON = 1
+HAT = 2
+
+# The number of events taken from the libSDL2 queue at once.
+_batch_size = 256
+_batch = None
+_batch_events = None
+# Opened devices by (is_controller, instance id)
+_devices = dict()
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_dtype():
+    import numpy
+    return numpy.dtype([('timestamp', numpy.uint32), ('kind', numpy.uint8), ('index', numpy.uint8), ('value', numpy.int16)])
+
+
+@functools.lru_cache(maxsize=None)
+def _event_dtype():
+    # The joystick and game controller axis, hat and button events share the layout:
+    # type, timestamp, which, axis/hat/button, [hat value/button state], value (axis only).
+    import numpy
+    return numpy.dtype({
+        'names': ['type', 'timestamp', 'which', 'index', 'state', 'value'],
+        'formats': [numpy.uint32, numpy.uint32, numpy.int32, numpy.uint8, numpy.uint8, numpy.int16],
+        'offsets': [0, 4, 8, 12, 13, 16],
+        'itemsize': ctypes.sizeof(SDL_Event)
+    })
+
+
+def _init_joystick(system: int):
+    # Samples are recorded regardless of the keyboard focus (without this hint libSDL2 drops them while no window is focused).
+    SDL_SetHint(SDL_HINT_JOYSTICK_ALLOW_BACKGROUND_EVENTS, b'1')
+    init_subsystem(system)
+
+
+@in_event_thread
+def count() -> int:
+    """The number of joysticks (including game controllers and virtual joysticks) connected."""
+    _init_joystick(SDL_INIT_JOYSTICK)
+    SDL_ClearError()
+    result = SDL_NumJoysticks()
+    if result < 0:
+        raise UIError
+    return result
+
+
+@in_event_thread
+def attach_virtual(axes: int = 2, buttons: int = 4, hats: int = 0, *, controller: bool = False) -> int:
+    """Connect a virtual joystick, driven by `Joystick.set_virtual_*()`. Useful for headless testing.
+
+    Args:
+        axes (int, optional): The number of axes.
+        buttons (int, optional): The number of buttons.
+        hats (int, optional): The number of hats.
+        controller (bool, optional): If True, the joystick can be opened as a game controller.
+
+    Returns:
+        int: The device index of the new joystick.
+    """
+    _init_joystick(SDL_INIT_JOYSTICK)
+    SDL_ClearError()
+    device_index = SDL_JoystickAttachVirtual(SDL_JOYSTICK_TYPE_GAMECONTROLLER if controller else SDL_JOYSTICK_TYPE_UNKNOWN, axes, buttons, hats)
+    if device_index < 0:
+        raise UIError
+    return device_index
+
+
+@in_event_thread
+def detach_virtual(device_index: int):
+    SDL_ClearError()
+    if SDL_JoystickDetachVirtual(device_index) < 0:
+        raise UIError
+
+
+class Joystick:
+    """An opened joystick or game controller, whose axis, button and hat changes are recorded into a ring buffer.
+
+    The samples are taken from the libSDL2 event queue in bulk by the UI event thread, without creating python events,
+    and stored into a preallocated numpy array of `capacity` samples with fields `timestamp` (the libSDL2 event timestamp
+    in milliseconds), `kind` (`AXIS`, `BUTTON` or `HAT`), `index` (the axis/button/hat number) and `value`. Once the
+    buffer is full, the oldest samples are overwritten.
+
+    Consumers in any thread read the samples with `read()`, which returns every sample recorded after a given position.
+    """
+
+    @classmethod
+    @in_event_thread
+    def open(cls, device_index: int, *, capacity: int = 65536, controller: bool = False):
+        """Open a device and start recording its samples.
+
+        Args:
+            device_index (int): The index of the device, from 0 to `count() - 1`.
+            capacity (int, optional): The number of samples kept in the ring buffer.
+            controller (bool, optional): Open the device as a game controller. The samples are then the (remapped) game
+                controller axes (`SDL_CONTROLLER_AXIS_*`) and buttons (`SDL_CONTROLLER_BUTTON_*`) and there are no hats.
+        """
+        import numpy
+        if capacity <= 0:
+            raise ValueError('param `capacity` must be positive')
+        _init_joystick(SDL_INIT_GAMECONTROLLER if controller else SDL_INIT_JOYSTICK)
+        SDL_ClearError()
+        if controller:
+            if not SDL_IsGameController(device_index):
+                raise ValueError(f'The device [{device_index}] is not a game controller')
+            sdl_controller = SDL_GameControllerOpen(device_index)
+            if not sdl_controller:
+                raise UIError
+            sdl_joystick = SDL_GameControllerGetJoystick(sdl_controller)
+        else:
+            sdl_controller = None
+            sdl_joystick = SDL_JoystickOpen(device_index)
+            if not sdl_joystick:
+                raise UIError
+        self = cls.__new__(cls)
+        self.__controller = sdl_controller
+        self.__is_controller = controller
+        self.__joystick = sdl_joystick
+        self.__instance_id = SDL_JoystickInstanceID(sdl_joystick)
+        name = SDL_JoystickName(sdl_joystick)
+        self.__name = name.decode('utf-8') if name is not None else None
+        self.__axes = SDL_JoystickNumAxes(sdl_joystick)
+        self.__buttons = SDL_JoystickNumButtons(sdl_joystick)
+        self.__hats = SDL_JoystickNumHats(sdl_joystick)
+        self.__samples = numpy.zeros(capacity, dtype=_sample_dtype())
+        self.__position = 0
+        self.__lock = threading.Lock()
+        _devices[(controller, self.__instance_id)] = self
+        # Keeps the UI event thread processing events while the device is open.
+        add_event_listener(self)
+        return self
+
+    @property
+    def instance_id(self) -> int:
+        return self.__instance_id
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def is_controller(self) -> bool:
+        return self.__is_controller
+
+    @property
+    def axes(self) -> int:
+        return self.__axes
+
+    @property
+    def buttons(self) -> int:
+        return self.__buttons
+
+    @property
+    def hats(self) -> int:
+        return self.__hats
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__samples)
+
+    @property
+    def position(self) -> int:
+        """The total number of samples recorded so far."""
+        return self.__position
+
+    @property
+    def closed(self) -> bool:
+        return self.__joystick is None
+
+    def read(self, since: int = 0):
+        """Copy the samples recorded after a position.
+
+        Args:
+            since (int, optional): A `position` returned by a previous call (or 0 for all samples still in the buffer).
+
+        Returns:
+            tuple: A numpy array of samples (oldest first) and the position to pass to the next call. If more than
+            `capacity` samples were recorded since the previous call, the oldest of them are lost.
+        """
+        import numpy
+        with self.__lock:
+            end = self.__position
+            begin = max(since, end - len(self.__samples))
+            if begin >= end:
+                return self.__samples[:0].copy(), end
+            return numpy.take(self.__samples, numpy.arange(begin, end), mode='wrap'), end
+
+    def latest(self, count: int):
+        """Copy the most recent samples (at most `count`), oldest first."""
+        return self.read(max(0, self.__position - count))[0]
+
+    def _record(self, samples):
+        count = len(samples)
+        if count <= 0:
+            return
+        capacity = len(self.__samples)
+        with self.__lock:
+            if count > capacity:
+                self.__position += count - capacity
+                samples = samples[-capacity:]
+                count = capacity
+            start = self.__position % capacity
+            head = min(count, capacity - start)
+            self.__samples[start:start + head] = samples[:head]
+            self.__samples[:count - head] = samples[head:]
+            self.__position += count
+
+    @in_event_thread
+    def set_virtual_axis(self, axis: int, value: int):
+        SDL_ClearError()
+        if SDL_JoystickSetVirtualAxis(self.__joystick, axis, value) < 0:
+            raise UIError
+
+    @in_event_thread
+    def set_virtual_button(self, button: int, pressed: bool):
+        SDL_ClearError()
+        if SDL_JoystickSetVirtualButton(self.__joystick, button, 1 if pressed else 0) < 0:
+            raise UIError
+
+    @in_event_thread
+    def set_virtual_hat(self, hat: int, value: int):
+        SDL_ClearError()
+        if SDL_JoystickSetVirtualHat(self.__joystick, hat, value) < 0:
+            raise UIError
+
+    @in_event_thread
+    def close(self):
+        """Stop recording and close the device. The recorded samples can still be read."""
+        if self.__joystick is None:
+            return
+        _devices.pop((self.__is_controller, self.__instance_id), None)
+        remove_event_listener(self)
+        if self.__controller is not None:
+            SDL_GameControllerClose(self.__controller)
+        else:
+            SDL_JoystickClose(self.__joystick)
+        self.__controller = None
+        self.__joystick = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f'Joystick(instance_id={self.__instance_id}, name={self.__name!r}, controller={self.is_controller})'
+
+
+def name(device_index: int):
+    """The name of a device by index, without opening it."""
+    value = SDL_JoystickNameForIndex(device_index)
+    return value.decode('utf-8') if value is not None else None
+
+
+def record_events(sdl_event: SDL_Event):
+    """Record an axis/button/hat event and every such event pending in the libSDL2 queue. Called in the UI event thread."""
+    global _batch, _batch_events
+    import numpy
+    if _batch is None:
+        _batch = (SDL_Event * _batch_size)()
+        _batch_events = numpy.frombuffer(_batch, dtype=_event_dtype())
+    batch = _batch
+    ctypes.memmove(batch, ctypes.byref(sdl_event), ctypes.sizeof(SDL_Event))
+    count = 1
+    for (first, last) in ((SDL_JOYAXISMOTION, SDL_JOYBUTTONUP), (SDL_CONTROLLERAXISMOTION, SDL_CONTROLLERBUTTONUP)):
+        while True:
+            count += max(0, SDL_PeepEvents(ctypes.byref(batch[count]), _batch_size - count, SDL_GETEVENT, first, last))
+            full = count >= _batch_size
+            _record_batch(numpy, _batch_events[:count])
+            count = 0
+            if not full:
+                break
+
+
+def _record_batch(numpy, events):
+    if len(events) <= 0:
+        return
+    types = events['type']
+    if _metrics.enabled:
+        for (event_type, count) in zip(*numpy.unique(types, return_counts=True)):
+            _metrics.count_event(_metrics.events_received, int(event_type), int(count))
+    if len(_devices) <= 0:
+        return
+    axis = (types == SDL_JOYAXISMOTION) | (types == SDL_CONTROLLERAXISMOTION)
+    hat = types == SDL_JOYHATMOTION
+    samples = numpy.empty(len(events), dtype=_sample_dtype())
+    samples['timestamp'] = events['timestamp']
+    samples['kind'] = numpy.where(axis, AXIS, numpy.where(hat, HAT, BUTTON))
+    samples['index'] = events['index']
+    samples['value'] = numpy.where(axis, events['value'], events['state'])
+    # Trackball motion is not sampled.
+    valid = types != SDL_JOYBALLMOTION
+    controller = types >= SDL_CONTROLLERAXISMOTION
+    which = events['which']
+    for ((is_controller, instance_id), device) in list(_devices.items()):
+        selected = valid & (controller == is_controller) & (which == instance_id)
+        device._record(samples[selected])
+        if _metrics.enabled:
+            for (event_type, count) in zip(*numpy.unique(types[selected], return_counts=True)):
+                _metrics.count_event(_metrics.events_dispatched, int(event_type), int(count))
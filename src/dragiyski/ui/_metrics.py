@@ -0,0 +1,210 @@
+import os
+import threading
+
+# Checked by every instrumented code path before recording anything, so disabled metrics cost a single attribute lookup.
+enabled = False
+
+# The names of the libSDL2 event types reported by `snapshot()`, resolved on first use.
+_event_type_constants = (
+    'SDL_QUIT',
+    'SDL_DISPLAYEVENT',
+    'SDL_WINDOWEVENT',
+    'SDL_SYSWMEVENT',
+    'SDL_KEYDOWN',
+    'SDL_KEYUP',
+    'SDL_TEXTEDITING',
+    'SDL_TEXTINPUT',
+    'SDL_KEYMAPCHANGED',
+    'SDL_MOUSEMOTION',
+    'SDL_MOUSEBUTTONDOWN',
+    'SDL_MOUSEBUTTONUP',
+    'SDL_MOUSEWHEEL',
+    'SDL_JOYAXISMOTION',
+    'SDL_JOYBALLMOTION',
+    'SDL_JOYHATMOTION',
+    'SDL_JOYBUTTONDOWN',
+    'SDL_JOYBUTTONUP',
+    'SDL_JOYDEVICEADDED',
+    'SDL_JOYDEVICEREMOVED',
+    'SDL_CONTROLLERAXISMOTION',
+    'SDL_CONTROLLERBUTTONDOWN',
+    'SDL_CONTROLLERBUTTONUP',
+    'SDL_CONTROLLERDEVICEADDED',
+    'SDL_CONTROLLERDEVICEREMOVED',
+    'SDL_CONTROLLERDEVICEREMAPPED',
+    'SDL_FINGERDOWN',
+    'SDL_FINGERUP',
+    'SDL_FINGERMOTION',
+    'SDL_DROPFILE',
+    'SDL_DROPTEXT',
+    'SDL_DROPBEGIN',
+    'SDL_DROPCOMPLETE',
+    'SDL_AUDIODEVICEADDED',
+    'SDL_AUDIODEVICEREMOVED',
+    'SDL_RENDER_TARGETS_RESET',
+    'SDL_RENDER_DEVICE_RESET',
+    'SDL_USEREVENT'
+)
+_event_type_names = None
+
+
+def event_type_name(event_type: int) -> str:
+    global _event_type_names
+    if _event_type_names is None:
+        import sdl2
+        _event_type_names = {getattr(sdl2, name): name[4:].lower() for name in _event_type_constants if hasattr(sdl2, name)}
+    if event_type in _event_type_names:
+        return _event_type_names[event_type]
+    return f'user_{event_type}' if event_type > 0x8000 else f'0x{event_type:x}'
+
+
+class Histogram:
+    """A histogram of non-negative integer values (nanoseconds, queue lengths) with power-of-two buckets."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.__lock:
+            self.__buckets = [0] * 64
+            self.__count = 0
+            self.__sum = 0
+            self.__min = None
+            self.__max = None
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        with self.__lock:
+            self.__buckets[min(value.bit_length(), 63)] += 1
+            self.__count += 1
+            self.__sum += value
+            if self.__min is None or value < self.__min:
+                self.__min = value
+            if self.__max is None or value > self.__max:
+                self.__max = value
+
+    def snapshot(self) -> dict:
+        """The statistics of the recorded values. `p50`, `p90` and `p99` are the upper bounds of the matching buckets."""
+        with self.__lock:
+            buckets = list(self.__buckets)
+            count, total, minimum, maximum = self.__count, self.__sum, self.__min, self.__max
+        result = {
+            'count': count,
+            'sum': total,
+            'min': minimum,
+            'max': maximum,
+            'mean': total / count if count > 0 else None,
+            # Bucket `n` counts the values in [2 ** (n - 1), 2 ** n), keyed by its upper bound.
+            'buckets': {(1 << index): value for index, value in enumerate(buckets) if value > 0}
+        }
+        for (name, quantile) in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            result[name] = None
+            if count <= 0:
+                continue
+            remaining = quantile * count
+            for index, value in enumerate(buckets):
+                remaining -= value
+                if remaining <= 0:
+                    result[name] = min(1 << index, maximum)
+                    break
+        return result
+
+
+# Written by the UI event thread only. An event is dispatched when it reaches a consumer: the worker of its window or
+# the ring buffer of an open joystick.
+events_received = dict()
+events_dispatched = dict()
+# The number of tasks skipped by the UI event thread, because they were past their deadline.
+tasks_expired = 0
+
+# Nanoseconds between the libSDL2 event timestamp and the start of the `on_event` listener of a window worker
+# (millisecond resolution).
+listener_latency = Histogram()
+# The number of tasks in the UI event thread queue, when a task is queued.
+task_queue_depth = Histogram()
+# Nanoseconds spent executing a task in the UI event thread.
+task_time = Histogram()
+# Nanoseconds from queueing a task from another thread until the result is available to the caller.
+call_round_trip = Histogram()
+# The number of work items waiting for a listener pool thread, when a listener is submitted.
+listener_backlog = Histogram()
+
+_histograms = {
+    'listener_latency': listener_latency,
+    'task_queue_depth': task_queue_depth,
+    'task_time': task_time,
+    'call_round_trip': call_round_trip,
+    'listener_backlog': listener_backlog
+}
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def is_enabled() -> bool:
+    return enabled
+
+
+def reset():
+    global tasks_expired
+    tasks_expired = 0
+    events_received.clear()
+    events_dispatched.clear()
+    for histogram in _histograms.values():
+        histogram.reset()
+
+
+def count_event(counter: dict, event_type: int, count: int = 1):
+    counter[event_type] = counter.get(event_type, 0) + count
+
+
+def record_event_latency(timestamp: int):
+    """Record the latency of an event with the given libSDL2 timestamp (in milliseconds) reaching its listener."""
+    from sdl2 import SDL_GetTicks
+    # The timestamps are 32-bit and wrap around every ~49 days.
+    listener_latency.record(((SDL_GetTicks() - timestamp) & 0xFFFFFFFF) * 1000000)
+
+
+def executor_backlog(executor) -> int:
+    # ThreadPoolExecutor does not expose its queue; the length is only an estimate anyway.
+    queue = getattr(executor, '_work_queue', None)
+    return queue.qsize() if queue is not None else 0
+
+
+def snapshot() -> dict:
+    """Copy the current metrics into a dictionary.
+
+    Returns:
+        dict: `events_received` and `events_dispatched` (counts by event type), `tasks_expired`, the current `task_queue` length and
+        `listener_backlog` length, and a dictionary of statistics (see `Histogram.snapshot()`) for each histogram
+        under `histograms`. Durations are in nanoseconds.
+    """
+    from . import _thread, _event_emitter
+    thread = _thread._event_thread
+    executor = _event_emitter._executor
+    return {
+        'enabled': enabled,
+        'events_received': {event_type_name(key): value for key, value in list(events_received.items())},
+        'events_dispatched': {event_type_name(key): value for key, value in list(events_dispatched.items())},
+        'task_queue': thread.queue_depth() if thread is not None else 0,
+        'tasks_expired': tasks_expired,
+        'listener_backlog': executor_backlog(executor) if executor is not None else 0,
+        'histograms': {name: histogram.snapshot() for name, histogram in _histograms.items()}
+    }
+
+
+def _enable_from_environment():
+    if os.environ.get('DRAGIYSKI_UI_METRICS', '').strip().lower() not in ('', '0', 'false', 'no'):
+        enable()
+
+
+_enable_from_environment()
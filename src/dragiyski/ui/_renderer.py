@@ -0,0 +1,368 @@
+from sdl2 import (
+    SDL_ClearError,
+    SDL_CreateRenderer,
+    SDL_CreateTexture,
+    SDL_DestroyRenderer,
+    SDL_DestroyTexture,
+    SDL_FPoint,
+    SDL_FRect,
+    SDL_GetRendererOutputSize,
+    SDL_LockTexture,
+    SDL_RENDERER_ACCELERATED,
+    SDL_RENDERER_PRESENTVSYNC,
+    SDL_RENDERER_SOFTWARE,
+    SDL_Point,
+    SDL_Rect,
+    SDL_RenderClear,
+    SDL_RenderCopy,
+    SDL_RenderDrawLines,
+    SDL_RenderDrawLinesF,
+    SDL_RenderDrawPoints,
+    SDL_RenderDrawPointsF,
+    SDL_RenderDrawRects,
+    SDL_RenderDrawRectsF,
+    SDL_RenderFillRects,
+    SDL_RenderFillRectsF,
+    SDL_RenderPresent,
+    SDL_RenderReadPixels,
+    SDL_SetRenderDrawColor,
+    SDL_TEXTUREACCESS_STREAMING,
+    SDL_UnlockTexture
+)
+import ctypes
+from typing import Optional, Sequence
+from ._error import UIError
+from ._geometry import Rectangle
+from ._display import PixelFormat, bytes_per_pixel
+from ._thread import in_event_thread
+
+
+def _to_sdl_rect(rect: Optional[Rectangle]):
+    if rect is None:
+        return None
+    return SDL_Rect(rect.x, rect.y, rect.width, rect.height)
+
+
+def _primitive_array(elements, width: int):
+    """The elements as a C-contiguous array of `int32` or `float32` with `width` values per element. Arrays that already
+    are are returned as they are, others are converted (floating point arrays to `float32`, the rest to `int32`).
+    """
+    import numpy
+    array = numpy.asarray(elements)
+    if array.dtype != numpy.int32 and array.dtype != numpy.float32:
+        array = array.astype(numpy.float32 if array.dtype.kind == 'f' else numpy.int32)
+    array = numpy.ascontiguousarray(array)
+    if (array.ndim > 1 and array.shape[-1] != width) or array.size % width != 0:
+        raise ValueError(f'The primitives must be an array of shape (count, {width})')
+    return array
+
+
+class Texture:
+    """A streaming texture owned by a `Renderer`.
+
+    The texture memory is written either by `upload()` (a single copy of a whole frame), or by locking the texture and
+    writing into `pixels`/`array()` directly. The texture memory is write-only: the content of a locked texture is
+    undefined and must be fully overwritten.
+    """
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def pixel_format(self) -> PixelFormat:
+        return self.__pixel_format
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return self.__bytes_per_pixel
+
+    @property
+    def pitch(self) -> Optional[int]:
+        """The number of bytes between two consecutive rows of the locked texture memory, or `None` if not locked."""
+        return self.__pitch
+
+    @property
+    def locked(self) -> bool:
+        return self.__pitch is not None
+
+    @in_event_thread
+    def lock(self):
+        if self.__impl is None:
+            raise UIError('The texture has been destroyed')
+        if self.__pitch is not None:
+            return self
+        pixels = ctypes.c_void_p()
+        pitch = ctypes.c_int()
+        SDL_ClearError()
+        if SDL_LockTexture(self.__impl, None, ctypes.byref(pixels), ctypes.byref(pitch)) < 0:
+            raise UIError
+        buffer = (ctypes.c_uint8 * (pitch.value * self.__height)).from_address(pixels.value)
+        self.__pixels = memoryview(buffer).cast('B', (self.__height, pitch.value))
+        self.__pitch = pitch.value
+        return self
+
+    @in_event_thread
+    def unlock(self):
+        if self.__pitch is None:
+            return
+        self.__pixels = None
+        self.__pitch = None
+        SDL_UnlockTexture(self.__impl)
+
+    def __enter__(self):
+        return self.lock()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unlock()
+
+    @property
+    def pixels(self) -> memoryview:
+        """A writable memoryview of shape `(height, pitch)` over the locked texture memory."""
+        if self.__pixels is None:
+            raise RuntimeError('The texture must be locked before accessing its pixels')
+        return self.__pixels
+
+    def array(self):
+        """A numpy array of shape `(height, width, bytes_per_pixel)` and dtype `uint8` sharing the locked texture memory."""
+        import numpy
+        return numpy.ndarray(
+            shape=(self.__height, self.__width, self.__bytes_per_pixel),
+            dtype=numpy.uint8,
+            buffer=self.pixels,
+            strides=(self.__pitch, self.__bytes_per_pixel, 1)
+        )
+
+    @in_event_thread
+    def upload(self, frame):
+        """Replace the texture content with a frame.
+
+        The frame can be any object supporting the buffer protocol (a numpy array of shape `(height, width, bytes_per_pixel)`
+        or `(height, width)` with a matching itemsize, `bytes`, etc.) containing exactly `height * width * bytes_per_pixel`
+        bytes in the texture pixel format. If the frame is C-contiguous and the texture rows are not padded, the upload
+        is a single memcpy.
+        """
+        import numpy
+        if self.__impl is None:
+            raise UIError('The texture has been destroyed')
+        if self.__pitch is not None:
+            raise RuntimeError('Cannot upload into a locked texture')
+        frame = numpy.ascontiguousarray(frame)
+        row_size = self.__width * self.__bytes_per_pixel
+        if frame.nbytes != row_size * self.__height:
+            raise ValueError(f'param `frame` must contain exactly {row_size * self.__height} bytes, got {frame.nbytes}')
+        pixels = ctypes.c_void_p()
+        pitch = ctypes.c_int()
+        SDL_ClearError()
+        if SDL_LockTexture(self.__impl, None, ctypes.byref(pixels), ctypes.byref(pitch)) < 0:
+            raise UIError
+        try:
+            if pitch.value == row_size:
+                ctypes.memmove(pixels.value, frame.ctypes.data, frame.nbytes)
+            else:
+                buffer = (ctypes.c_uint8 * (pitch.value * self.__height)).from_address(pixels.value)
+                target = numpy.ndarray(shape=(self.__height, row_size), dtype=numpy.uint8, buffer=buffer, strides=(pitch.value, 1))
+                target[...] = frame.reshape(-1).view(numpy.uint8).reshape(self.__height, row_size)
+        finally:
+            SDL_UnlockTexture(self.__impl)
+
+    @in_event_thread
+    def destroy(self):
+        if self.__impl is None:
+            return
+        SDL_DestroyTexture(self.__impl)
+        self._release()
+
+    def _release(self):
+        self.__impl = None
+        self.__pixels = None
+        self.__pitch = None
+        self.__renderer._textures.discard(self)
+
+    def __repr__(self):
+        return f'Texture(width={self.__width}, height={self.__height}, pixel_format=PixelFormat.{self.__pixel_format.name})'
+
+
+class Renderer:
+    """A 2D rendering context of a window, backed by `SDL_Renderer`.
+
+    Obtained by `Window.renderer()`. All rendering operations are executed in the UI event thread.
+    """
+
+    @property
+    def output_size(self):
+        return self._output_size()
+
+    @in_event_thread
+    def _output_size(self):
+        width = ctypes.c_int()
+        height = ctypes.c_int()
+        SDL_ClearError()
+        if SDL_GetRendererOutputSize(self.__impl, ctypes.byref(width), ctypes.byref(height)) < 0:
+            raise UIError
+        return (width.value, height.value)
+
+    @in_event_thread
+    def create_texture(self, width: int, height: int, pixel_format: PixelFormat = PixelFormat.ARGB8888) -> Texture:
+        """Create a streaming texture.
+
+        Args:
+            width (int): The width of the texture in pixels.
+            height (int): The height of the texture in pixels.
+            pixel_format (PixelFormat, optional): A packed pixel format of the texture memory.
+        """
+        if self.__impl is None:
+            raise UIError('The renderer has been destroyed')
+        if width <= 0:
+            raise ValueError('param `width` must be positive')
+        if height <= 0:
+            raise ValueError('param `height` must be positive')
+        size = bytes_per_pixel(pixel_format)
+        SDL_ClearError()
+        sdl_texture = SDL_CreateTexture(self.__impl, pixel_format.value, SDL_TEXTUREACCESS_STREAMING, width, height)
+        if not sdl_texture:
+            raise UIError
+        texture = Texture.__new__(Texture)
+        texture._Texture__impl = sdl_texture
+        texture._Texture__renderer = self
+        texture._Texture__width = width
+        texture._Texture__height = height
+        texture._Texture__pixel_format = pixel_format
+        texture._Texture__bytes_per_pixel = size
+        texture._Texture__pixels = None
+        texture._Texture__pitch = None
+        self._textures.add(texture)
+        return texture
+
+    @in_event_thread
+    def clear(self, red: int = 0, green: int = 0, blue: int = 0, alpha: int = 255):
+        SDL_ClearError()
+        if SDL_SetRenderDrawColor(self.__impl, red, green, blue, alpha) < 0:
+            raise UIError
+        if SDL_RenderClear(self.__impl) < 0:
+            raise UIError
+
+    @in_event_thread
+    def copy(self, texture: Texture, source: Optional[Rectangle] = None, destination: Optional[Rectangle] = None):
+        """Copy a texture (or part of it) into the rendering target.
+
+        Args:
+            texture (Texture): A texture created by this renderer.
+            source (Rectangle, optional): The region of the texture to copy. Defaults to the whole texture.
+            destination (Rectangle, optional): The region of the target to copy into. Defaults to the whole target.
+        """
+        if texture._Texture__renderer is not self:
+            raise ValueError('param `texture` must be created by the same renderer')
+        SDL_ClearError()
+        if SDL_RenderCopy(self.__impl, texture._Texture__impl, _to_sdl_rect(source), _to_sdl_rect(destination)) < 0:
+            raise UIError
+
+    @in_event_thread
+    def present(self):
+        SDL_RenderPresent(self.__impl)
+
+    def _draw_primitives(self, elements, width: int, color, function, float_function, element_type, float_element_type):
+        if self.__impl is None:
+            raise UIError('The renderer has been destroyed')
+        array = _primitive_array(elements, width)
+        count = array.size // width
+        SDL_ClearError()
+        if color is not None and SDL_SetRenderDrawColor(self.__impl, *color[:3], color[3] if len(color) > 3 else 255) < 0:
+            raise UIError
+        if count <= 0:
+            return
+        # The array memory is passed to libSDL2 as it is: int32 pairs/quads are SDL_Point/SDL_Rect, float32 are SDL_FPoint/SDL_FRect.
+        if array.dtype.kind == 'f':
+            result = float_function(self.__impl, array.ctypes.data_as(ctypes.POINTER(float_element_type)), count)
+        else:
+            result = function(self.__impl, array.ctypes.data_as(ctypes.POINTER(element_type)), count)
+        if result < 0:
+            raise UIError
+
+    @in_event_thread
+    def draw_points(self, points, color: Optional[Sequence[int]] = None):
+        """Draw points in a single libSDL2 call.
+
+        Args:
+            points (numpy.ndarray): An array of shape `(count, 2)`. C-contiguous `int32` or `float32` (sub-pixel) arrays
+                are passed to libSDL2 without copying; other arrays are converted first.
+            color (Sequence[int], optional): The color (red, green, blue[, alpha]) of the batch. The current draw color, if not specified.
+        """
+        self._draw_primitives(points, 2, color, SDL_RenderDrawPoints, SDL_RenderDrawPointsF, SDL_Point, SDL_FPoint)
+
+    @in_event_thread
+    def draw_lines(self, points, color: Optional[Sequence[int]] = None):
+        """Draw a connected polyline through points (an array of shape `(count, 2)`, as in `draw_points()`)."""
+        self._draw_primitives(points, 2, color, SDL_RenderDrawLines, SDL_RenderDrawLinesF, SDL_Point, SDL_FPoint)
+
+    @in_event_thread
+    def draw_rects(self, rectangles, color: Optional[Sequence[int]] = None):
+        """Outline rectangles given as an array of shape `(count, 4)`: x, y, width, height (as in `draw_points()`)."""
+        self._draw_primitives(rectangles, 4, color, SDL_RenderDrawRects, SDL_RenderDrawRectsF, SDL_Rect, SDL_FRect)
+
+    @in_event_thread
+    def fill_rects(self, rectangles, color: Optional[Sequence[int]] = None):
+        """Fill rectangles given as an array of shape `(count, 4)`: x, y, width, height (as in `draw_points()`)."""
+        self._draw_primitives(rectangles, 4, color, SDL_RenderFillRects, SDL_RenderFillRectsF, SDL_Rect, SDL_FRect)
+
+    @in_event_thread
+    def submit(self, commands, *, present: bool = False):
+        """Replay a `CommandBuffer` recorded in any thread, in a single call into the UI event thread.
+
+        Args:
+            commands (CommandBuffer): The recorded commands. The buffer can be reset and reused once this returns.
+            present (bool, optional): Present the frame after the commands.
+        """
+        if self.__impl is None:
+            raise UIError('The renderer has been destroyed')
+        commands._replay(self, self.__impl)
+        if present:
+            SDL_RenderPresent(self.__impl)
+
+    @property
+    def software(self) -> bool:
+        return self.__software
+
+    @in_event_thread
+    def read_pixels(self, pixel_format: PixelFormat = PixelFormat.ARGB8888):
+        """Read the current rendering target into a new numpy array of shape `(height, width, bytes_per_pixel)`.
+
+        This is a slow operation, that copies the pixels from the GPU (if any).
+        """
+        import numpy
+        width, height = self._output_size()
+        size = bytes_per_pixel(pixel_format)
+        result = numpy.empty((height, width, size), dtype=numpy.uint8)
+        SDL_ClearError()
+        if SDL_RenderReadPixels(self.__impl, None, pixel_format.value, result.ctypes.data, width * size) < 0:
+            raise UIError
+        return result
+
+    @in_event_thread
+    def destroy(self):
+        if self.__impl is None:
+            return
+        # SDL_DestroyRenderer destroys all textures associated with the renderer.
+        for texture in list(self._textures):
+            texture._release()
+        SDL_DestroyRenderer(self.__impl)
+        self.__impl = None
+
+
+def create_renderer(sdl_window, *, software: bool = False, vsync: bool = False) -> Renderer:
+    flags = SDL_RENDERER_SOFTWARE if software else SDL_RENDERER_ACCELERATED
+    if vsync:
+        flags |= SDL_RENDERER_PRESENTVSYNC
+    SDL_ClearError()
+    sdl_renderer = SDL_CreateRenderer(sdl_window, -1, flags)
+    if not sdl_renderer:
+        raise UIError
+    renderer = Renderer.__new__(Renderer)
+    renderer._Renderer__impl = sdl_renderer
+    renderer._Renderer__software = software
+    renderer._textures = set()
+    return renderer
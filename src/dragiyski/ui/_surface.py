@@ -0,0 +1,164 @@
+from sdl2 import (
+    SDL_ClearError,
+    SDL_FreeSurface,
+    SDL_LockSurface,
+    SDL_MUSTLOCK,
+    SDL_Rect,
+    SDL_UnlockSurface,
+    SDL_UpdateWindowSurface,
+    SDL_UpdateWindowSurfaceRects
+)
+import ctypes
+from typing import Iterable, Optional
+from ._error import UIError
+from ._geometry import Rectangle
+from ._display import PixelFormat
+from ._thread import in_event_thread
+
+
+class Surface:
+    """The pixel memory of a window (or an offscreen buffer), as allocated by libSDL2.
+
+    The memory is exposed without copying: `pixels` is a writable memoryview of shape `(height, pitch)` and `array()`
+    is a numpy array of shape `(height, width, bytes_per_pixel)`. Writing into either of them writes directly into the
+    window framebuffer. The changes become visible after `update()`.
+
+    The surface is owned by the window. It is invalidated when the window is resized or destroyed, after which
+    `Window.surface()` must be called again. A window that has a renderer cannot have a surface and vice versa.
+
+    Offscreen surfaces (like the buffers of a window worker) are not associated with a window and cannot be updated.
+    """
+
+    @property
+    def width(self) -> int:
+        return self.__impl.contents.w
+
+    @property
+    def height(self) -> int:
+        return self.__impl.contents.h
+
+    @property
+    def pitch(self) -> int:
+        """The number of bytes between the start of two consecutive rows. Might be larger than `width * bytes_per_pixel`."""
+        return self.__impl.contents.pitch
+
+    @property
+    def pixel_format(self) -> PixelFormat:
+        return PixelFormat(self.__impl.contents.format.contents.format)
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return self.__impl.contents.format.contents.BytesPerPixel
+
+    @property
+    def must_lock(self) -> bool:
+        return SDL_MUSTLOCK(self.__impl.contents)
+
+    @property
+    def locked(self) -> bool:
+        return self.__locked
+
+    @in_event_thread
+    def lock(self):
+        if self.__locked:
+            return self
+        SDL_ClearError()
+        if SDL_LockSurface(self.__impl) < 0:
+            raise UIError
+        self.__locked = True
+        return self
+
+    @in_event_thread
+    def unlock(self):
+        if not self.__locked:
+            return
+        SDL_UnlockSurface(self.__impl)
+        self.__locked = False
+        self.__pixels = None
+
+    def __enter__(self):
+        return self.lock()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unlock()
+
+    @property
+    def pixels(self) -> memoryview:
+        """A writable memoryview of shape `(height, pitch)` over the pixel memory of the surface.
+
+        Raises:
+            RuntimeError: If the surface must be locked before access and it is not locked.
+        """
+        if not self.__locked and self.must_lock:
+            raise RuntimeError('The surface must be locked before accessing its pixels')
+        if self.__pixels is None:
+            surface = self.__impl.contents
+            if not surface.pixels:
+                raise UIError('The surface has no pixel memory')
+            buffer = (ctypes.c_uint8 * (surface.pitch * surface.h)).from_address(surface.pixels)
+            self.__pixels = memoryview(buffer).cast('B', (surface.h, surface.pitch))
+        return self.__pixels
+
+    def array(self):
+        """A numpy array of shape `(height, width, bytes_per_pixel)` and dtype `uint8` sharing the pixel memory of the surface.
+
+        The padding at the end of each row (if any) is excluded using the array strides, no data is copied.
+        """
+        import numpy
+        bytes_per_pixel = self.bytes_per_pixel
+        return numpy.ndarray(
+            shape=(self.height, self.width, bytes_per_pixel),
+            dtype=numpy.uint8,
+            buffer=self.pixels,
+            strides=(self.pitch, bytes_per_pixel, 1)
+        )
+
+    @in_event_thread
+    def update(self, rects: Optional[Iterable[Rectangle]] = None):
+        """Copy the surface to the screen.
+
+        Args:
+            rects (Iterable[Rectangle], optional): The regions of the window to update. If not specified, the whole window is updated.
+        """
+        if self.__window is None:
+            raise RuntimeError('Cannot update an offscreen surface')
+        SDL_ClearError()
+        if rects is None:
+            if SDL_UpdateWindowSurface(self.__window) < 0:
+                raise UIError
+            return
+        rects = [SDL_Rect(rect.x, rect.y, rect.width, rect.height) for rect in rects]
+        if len(rects) <= 0:
+            return
+        if SDL_UpdateWindowSurfaceRects(self.__window, (SDL_Rect * len(rects))(*rects), len(rects)) < 0:
+            raise UIError
+
+    @in_event_thread
+    def free(self):
+        """Release the memory of an offscreen surface. Window surfaces are released with their window."""
+        if self.__window is not None:
+            raise RuntimeError('Cannot free the surface of a window')
+        if self.__impl is None:
+            return
+        if self.__locked:
+            SDL_UnlockSurface(self.__impl)
+            self.__locked = False
+        self.__pixels = None
+        SDL_FreeSurface(self.__impl)
+        self.__impl = None
+
+    def __repr__(self):
+        return f'Surface(width={self.width}, height={self.height}, pitch={self.pitch}, pixel_format=PixelFormat.{self.pixel_format.name})'
+
+
+def create_window_surface(sdl_window, sdl_surface) -> Surface:
+    storage = Surface.__new__(Surface)
+    storage._Surface__window = sdl_window
+    storage._Surface__impl = sdl_surface
+    storage._Surface__locked = False
+    storage._Surface__pixels = None
+    return storage
+
+
+def create_surface(sdl_surface) -> Surface:
+    return create_window_surface(None, sdl_surface)
@@ -1,24 +1,61 @@
-from sdl2 import *
-import sdl2
+from sdl2 import (
+    SDL_CONTROLLERAXISMOTION,
+    SDL_CONTROLLERBUTTONDOWN,
+    SDL_CONTROLLERBUTTONUP,
+    SDL_DROPFILE,
+    SDL_DROPTEXT,
+    SDL_Event,
+    SDL_INIT_EVENTS,
+    SDL_JOYAXISMOTION,
+    SDL_JOYBALLMOTION,
+    SDL_JOYBUTTONDOWN,
+    SDL_JOYBUTTONUP,
+    SDL_JOYHATMOTION,
+    SDL_PushEvent,
+    SDL_QUIT,
+    SDL_Quit,
+    SDL_RegisterEvents,
+    SDL_WINDOWEVENT,
+    SDL_WaitEvent,
+    SDL_WaitEventTimeout,
+    SDL_free
+)
 from queue import Queue, Empty
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Optional
 from ._error import UIError
+from ._application import init_subsystem
+from ._event_emitter import weak_reference
+from . import _headless
+from . import _metrics
+from . import _trace
+from . import _watchdog
 import sys
 import threading
-import re
+import time
+import traceback
+import weakref
 
-event_listeners = set()
+if TYPE_CHECKING:
+    # Imported on first use: asyncio is expensive to import and most applications do not use it.
+    import asyncio
+
+# An immutable snapshot, replaced as a whole under `event_listener_lock`, so it can be read from any thread without a lock
+# (also on free-threaded Python builds). Read it as `_thread.event_listeners`; a name imported from here is not updated.
+event_listeners = frozenset()
 event_listener_lock = threading.RLock()
+# Modified only under `window_map_lock`; a single lookup is atomic (lock-free for readers on free-threaded builds).
 window_map = dict()
 window_map_lock = threading.RLock()
 window_count_event = threading.Event()
 ui_threads = set()
 
-re_word_to_under = re.compile('(.)([A-Z][a-z]+)')
-re_upper_follow = re.compile('([a-z0-9])([A-Z])')
+# The patterns are compiled (and cached by the re module) on first use, not on import.
+re_word_to_under = '(.)([A-Z][a-z]+)'
+re_upper_follow = '([a-z0-9])([A-Z])'
 re_replacement = r'\1_\2'
 
 def convert_event_name(name: str):
+    import re
     name = re.sub(re_word_to_under, re_replacement, name)
     name = re.sub(re_upper_follow, re_replacement, name)
     return name.lower()
@@ -30,12 +67,28 @@ class EventTask:
         self.__args = args
         self.__kwargs = kwargs
         self.__event = threading.Event()
+        # Guards the state transitions of this task only, so that tasks do not contend with each other.
+        self.__lock = threading.Lock()
         self.__return = None
         self.__exception = None
         self.__done = False
+        self.__cancelled = False
+        self.__deadline = None
+        # For `_metrics.call_round_trip`: recorded when the result is available, whoever waits for it.
+        self.__queued = time.perf_counter_ns() if _metrics.enabled else None
+        self.__callbacks = None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """A `time.monotonic()` value after which the task is skipped, if it has not started yet."""
+        return self.__deadline
+
+    @deadline.setter
+    def deadline(self, value: Optional[float]):
+        self.__deadline = value
 
     def has_exception(self):
-        return self.__done and self.__exception is not None
+        return self.__event.is_set() and self.__exception is not None
 
     def exception(self):
         return self.__exception
@@ -44,40 +97,152 @@ class EventTask:
         return self.__return
 
     def done(self):
-        return self.__done
+        """True once the task has finished or has been cancelled."""
+        return self.__event.is_set()
 
-    def wait(self):
-        if self.__done:
-            return
-        self.__event.clear()
-        self.__event.wait()
+    def cancelled(self):
+        return self.__cancelled
+
+    def cancel(self) -> bool:
+        """Withdraw the task, unless it has already started.
+
+        Returns:
+            bool: True if the task will not run.
+        """
+        with self.__lock:
+            if self.__done:
+                return self.__cancelled
+            self.__done = True
+            self.__cancelled = True
+        self.__finish()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the task has finished or has been cancelled.
+
+        Returns:
+            bool: False if the timeout has expired first.
+        """
+        return self.__event.wait(timeout)
+
+    def add_done_callback(self, callback: Callable):
+        """Call `callback(task)` once the task has finished or has been cancelled, in the thread that completes it (the UI
+        event thread, or the thread calling `cancel()`). If the task is already done, the callback is called immediately.
+        """
+        with self.__lock:
+            if not self.__event.is_set():
+                if self.__callbacks is None:
+                    self.__callbacks = []
+                self.__callbacks.append(callback)
+                return
+        callback(self)
+
+    def __finish(self):
+        with self.__lock:
+            self.__event.set()
+            callbacks = self.__callbacks
+            self.__callbacks = None
+        if callbacks is not None:
+            for callback in callbacks:
+                try:
+                    callback(self)
+                except:
+                    traceback.print_exc()
 
     def dispatch(self):
-        if self.__done:
+        with self.__lock:
+            if self.__done:
+                return
+            self.__done = True
+            if self.__deadline is not None and time.monotonic() >= self.__deadline:
+                self.__cancelled = True
+        if self.__cancelled:
+            # Nobody waits for the result anymore, do not spend event thread time on it.
+            if _metrics.enabled:
+                _metrics.tasks_expired += 1
+            self.__finish()
             return
-        self.__done = True
+        start = time.perf_counter_ns() if _metrics.enabled or _trace.enabled else None
+        watched = _watchdog.enabled
+        if watched:
+            previous = _watchdog.activity
+            _watchdog.activity = (time.monotonic(), self.__function)
         try:
             self.__return = self.__function(*self.__args, **self.__kwargs)
         except:
             self.__exception = sys.exc_info()
         finally:
-            self.__event.set()
+            if watched:
+                # The enclosing activity (e.g. the command event draining the queue) resumes now; with its original
+                # start time, it would be reported as stalled right after any long task.
+                _watchdog.activity = None if previous is None else (time.monotonic(), *previous[1:])
+            if start is not None:
+                end = time.perf_counter_ns()
+                if _metrics.enabled:
+                    _metrics.task_time.record(end - start)
+                if _trace.enabled:
+                    _trace.record(_trace.function_name(self.__function), 'task', start, end)
+            if self.__queued is not None and _metrics.enabled:
+                _metrics.call_round_trip.record(time.perf_counter_ns() - self.__queued)
+            self.__finish()
+
+
+# SDL_WINDOWEVENT_* values, as defined in SDL_video.h.
+map_sdl_window_events = {
+    0: 'window_none',
+    1: 'window_shown',
+    2: 'window_hidden',
+    3: 'window_exposed',
+    4: 'window_moved',
+    5: 'window_resized',
+    6: 'window_size_changed',
+    7: 'window_minimized',
+    8: 'window_maximized',
+    9: 'window_restored',
+    10: 'window_enter',
+    11: 'window_leave',
+    12: 'window_focus_gained',
+    13: 'window_focus_lost',
+    14: 'window_close',
+    15: 'window_take_focus',
+    16: 'window_hit_test',
+    17: 'window_iccprof_changed',
+    18: 'window_display_changed'
+}
 
-map_sdl_window_events = dict((getattr(sdl2, x), 'window_' + x.removeprefix('SDL_WINDOWEVENT_').lower()) for x in dir(sdl2) if x.startswith('SDL_WINDOWEVENT_'))
+# The events recorded by the input module for polling. Empty until the input state is first polled.
+input_event_types = frozenset()
+
+# The events recorded in bulk by the joystick ring buffers, instead of being dispatched one by one.
+joystick_sample_event_types = frozenset([
+    SDL_JOYAXISMOTION,
+    SDL_JOYBALLMOTION,
+    SDL_JOYHATMOTION,
+    SDL_JOYBUTTONDOWN,
+    SDL_JOYBUTTONUP,
+    SDL_CONTROLLERAXISMOTION,
+    SDL_CONTROLLERBUTTONDOWN,
+    SDL_CONTROLLERBUTTONUP
+])
 
 class EventThread(threading.Thread):
     def __init__(self, *args, **kwargs):
         super(EventThread, self).__init__(*args, **kwargs)
         self.__task_queue = Queue(maxsize=0)
         self.__stage = 0
+        self.__command_event = None
         self.__in_queue = threading.Event()
+        self.__event_loop = None
 
     def run(self):
+        alive_thread_stage1 = threading.Thread(target=wait_for_atexit, args=(self,), name='dragiyski.ui.alive', daemon=False)
+        ui_threads.add(alive_thread_stage1)
         alive_thread_stage1.start()
         self.__stage = 1
         self.__in_queue.set()
         while self.__stage == 1:
-            if len(event_listeners) > 0:
+            # A window needs its events pumped even without a listener: its cached state and hit regions follow them.
+            if len(event_listeners) + len(window_map) > 0:
                 break
             task = self.__task_queue.get()
             task.dispatch()
@@ -85,34 +250,79 @@ class EventThread(threading.Thread):
         self.__in_queue.clear()
         if len(event_listeners) + len(window_map) <= 0:
             return
-        self.__stage = 2
-        if not SDL_WasInit(SDL_INIT_EVENTS):
-            if SDL_InitSubSystem(SDL_INIT_EVENTS) < 0:
-                raise UIError
+        init_subsystem(SDL_INIT_EVENTS)
         self.__command_event = command_event = SDL_RegisterEvents(1)
         if command_event == 0xFFFFFFFF:
             raise UIError
+        # Other threads push the command event once they observe stage 2, so it must be registered first.
+        self.__stage = 2
+        # Tasks queued during the transition did not push a command event.
+        self.drain_queue()
         while self.__stage == 2:
             sdl_event = SDL_Event()
-            if SDL_WaitEvent(sdl_event) <= 0:
-                raise UIError
+            start = time.perf_counter_ns() if _trace.enabled else None
+            if _watchdog.enabled:
+                _watchdog.activity = None
+            event_loop = self.__event_loop
+            if event_loop is None:
+                if SDL_WaitEvent(sdl_event) <= 0:
+                    raise UIError
+            elif SDL_WaitEventTimeout(sdl_event, event_loop.wait_timeout()) <= 0:
+                # No event before the next asyncio timer (libSDL2 does not distinguish the timeout from an error).
+                if start is not None:
+                    _trace_since(start, 'SDL_WaitEvent', 'wait')
+                self._step_event_loop(event_loop)
+                continue
+            if _watchdog.enabled:
+                _watchdog.activity = (time.monotonic(), sdl_event.type)
+            if start is not None:
+                start = _trace_since(start, 'SDL_WaitEvent', 'wait')
             if sdl_event.type == command_event:
                 self.drain_queue()
             elif sdl_event.type == SDL_QUIT:
                 break
+            elif sdl_event.type in joystick_sample_event_types:
+                # Counted in the metrics by the joystick module, with the rest of the batch.
+                from ._joystick import record_events
+                record_events(sdl_event)
             else:
-                from ._event import create_event
-                event = create_event(sdl_event)
-                if event is not None:
-                    from ._event import dispatch_event
-                    dispatch_event(event.type, event)
+                if _metrics.enabled:
+                    _metrics.count_event(_metrics.events_received, sdl_event.type)
+                if sdl_event.type in input_event_types:
+                    from ._input import record_event
+                    record_event(sdl_event)
+                if sdl_event.type == SDL_WINDOWEVENT:
+                    from ._window import on_window_event
+                    on_window_event(sdl_event.window)
+                from ._window_worker import route_event
+                if route_event(sdl_event):
+                    if _metrics.enabled:
+                        _metrics.count_event(_metrics.events_dispatched, sdl_event.type)
+                else:
+                    from ._event import create_event
+                    decode_start = time.perf_counter_ns() if start is not None else None
+                    event = create_event(sdl_event)
+                    if decode_start is not None:
+                        decode_start = _trace_since(decode_start, 'create_event', 'decode')
+                    if event is not None:
+                        # Not counted as dispatched: no listener runs for it yet.
+                        from ._event import dispatch_event
+                        dispatch_event(event.type, event)
+                        if decode_start is not None:
+                            _trace_since(decode_start, 'dispatch_event', 'dispatch', type=event.type)
             # According to documentation, libSDL uses strdup, which allocate necessary memory to store a string. It is responsibility
             # of the caller for the SDL_*Event functions to release that memory.
             # Since create_event() must decode such strings, which generate a python copy of it, the original is safe to discard.
             if sdl_event.type in [SDL_DROPFILE, SDL_DROPTEXT]:
                 SDL_free(next(x for x in sdl_event.drop._fields_ if x[0] == 'file')[1].from_buffer(sdl_event.drop, sdl_event.drop.__class__.file.offset))
+            if start is not None and sdl_event.type != command_event:
+                _trace_since(start, _metrics.event_type_name(sdl_event.type), 'event')
+            # Stepped after every event that finds it due, so that neither input nor asyncio timers starve the other.
+            event_loop = self.__event_loop
+            if event_loop is not None and event_loop.wait_timeout() == 0:
+                self._step_event_loop(event_loop)
         with window_map_lock:
-            for window in window_map.values():
+            for window in list(window_map.values()):
                 window.destroy()
         SDL_Quit()
 
@@ -123,46 +333,199 @@ class EventThread(threading.Thread):
             return None
 
     def drain_queue(self):
+        start = time.perf_counter_ns() if _trace.enabled else None
         try:
-            self.__in_queue.set()
             while True:
-                task = self.get_task()
-                if task is None:
+                self.__in_queue.set()
+                while True:
+                    task = self.get_task()
+                    if task is None:
+                        break
+                    task.dispatch()
+                self.__in_queue.clear()
+                # A task queued after the last get_task(), but before the clear(), did not push a command event.
+                if self.__task_queue.empty():
                     break
-                task.dispatch()
         finally:
             self.__in_queue.clear()
+            if start is not None:
+                _trace_since(start, 'drain_queue', 'task')
+
+    def set_event_loop(self, event_loop):
+        """Run the asyncio `event_loop` (an `EventThreadLoop`) between the libSDL2 events, or stop running it if `None`.
+        Must be called in the UI event thread.
+        """
+        self.__event_loop = event_loop
+
+    def _step_event_loop(self, event_loop):
+        if _watchdog.enabled:
+            _watchdog.activity = (time.monotonic(), 'asyncio')
+        start = time.perf_counter_ns() if _trace.enabled else None
+        event_loop.step()
+        if start is not None:
+            _trace_since(start, 'asyncio', 'task')
+
+    def wake(self):
+        """Interrupt the wait for libSDL2 events by pushing the command event. Does nothing before stage 2."""
+        command_event = self.__command_event
+        if self.__stage == 2 and command_event is not None:
+            event = SDL_Event()
+            event.type = command_event
+            SDL_PushEvent(event)
+
+    def queue_depth(self) -> int:
+        """The number of tasks waiting for the UI event thread."""
+        return self.__task_queue.qsize()
 
     def execute(self, function: Callable, /, *args, **kwargs):
-        if threading.current_thread() is event_thread:
+        return self.execute_until(None, function, *args, **kwargs)
+
+    def execute_until(self, deadline: Optional[float], function: Callable, /, *args, **kwargs):
+        """Execute a function in the UI event thread and wait for the result until `deadline`.
+
+        Args:
+            deadline (float, optional): A `time.monotonic()` value. If the function has not started by then, it is skipped.
+
+        Raises:
+            TimeoutError: If the deadline has passed before the function has finished. A function that has already
+                started is not interrupted, but its result is discarded.
+        """
+        if threading.current_thread() is self:
             return function(*args, **kwargs)
-        if not event_thread.is_alive():
-            event_thread.start()
         task = EventTask(function, *args, **kwargs)
-        self.__task_queue.put(task)
-        if self.__stage == 2 and not self.__in_queue.is_set():
-            assert self.__command_event is not None
-            event = SDL_Event()
-            event.type = self.__command_event
-            SDL_PushEvent(event)
-        task.wait()
+        task.deadline = deadline
+        self._enqueue(task)
+        if not task.wait(None if deadline is None else max(0.0, deadline - time.monotonic())) or task.cancelled():
+            task.cancel()
+            raise TimeoutError(f'{_trace.function_name(function)} has not finished in the UI event thread before the deadline')
         if task.has_exception():
             raise task.exception()[1]
         return task.result()
 
+    def execute_async(self, function: Callable, /, *args, **kwargs) -> 'asyncio.Future':
+        return self.execute_async_until(None, function, *args, **kwargs)
+
+    def execute_async_until(self, deadline: Optional[float], function: Callable, /, *args, **kwargs) -> 'asyncio.Future':
+        """Like `execute_until()`, but return a future of the running asyncio loop instead of blocking the caller.
+
+        Cancelling the future withdraws the task (in the next iteration of the loop), unless it has already started. The
+        future raises `TimeoutError` if the deadline passes first, like `execute_until()`.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if threading.current_thread() is self:
+            # A coroutine on the loop of the UI event thread (see `dragiyski.ui.aio`) must not wait for the queue it blocks.
+            try:
+                future.set_result(function(*args, **kwargs))
+            except BaseException as exception:
+                future.set_exception(exception)
+            return future
+        task = EventTask(function, *args, **kwargs)
+        task.deadline = deadline
+        timer = None
+        if deadline is not None:
+            timer = loop.call_later(max(0.0, deadline - time.monotonic()), _expire_future, future, task, function)
+
+        def on_task_done(task: EventTask):
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, task, function, timer)
+            except RuntimeError:
+                # The loop has been closed, nobody waits for the result.
+                pass
+
+        def on_future_done(future):
+            if future.cancelled():
+                task.cancel()
+
+        future.add_done_callback(on_future_done)
+        task.add_done_callback(on_task_done)
+        self._enqueue(task)
+        return future
+
+    def post(self, function: Callable, /, *args, **kwargs) -> EventTask:
+        """Schedule a function for execution in the UI event thread without waiting for it.
+
+        The returned task can be waited upon (or cancelled, or given a `deadline`, before it starts), but unlike
+        `execute()`, exceptions are not re-raised in the caller.
+        """
+        return self.post_until(None, function, *args, **kwargs)
+
+    def post_until(self, deadline: Optional[float], function: Callable, /, *args, **kwargs) -> EventTask:
+        """Like `post()`, but the function is skipped if it has not started by `deadline` (a `time.monotonic()` value)."""
+        task = EventTask(function, *args, **kwargs)
+        task.deadline = deadline
+        self._enqueue(task)
+        return task
+
+    def _enqueue(self, task: EventTask):
+        self.__task_queue.put(task)
+        if _metrics.enabled:
+            _metrics.task_queue_depth.record(self.__task_queue.qsize())
+        if not self.__in_queue.is_set():
+            self.wake()
+
     def terminate_stage1(self):
         if self.__stage == 1:
             self.__stage = 0
-        elif self.__state == 2:
+        elif self.__stage == 2:
             if len(event_listeners) + len(window_map) <= 0:
                 self.__stage = 0
 
 
-event_thread = EventThread(name='dragiyski.ui.event', daemon=False)
-ui_threads.add(event_thread)
+def _expire_future(future, task: EventTask, function: Callable):
+    if future.done():
+        return
+    task.cancel()
+    future.set_exception(TimeoutError(f'{_trace.function_name(function)} has not finished in the UI event thread before the deadline'))
+
+
+def _resolve_future(future, task: EventTask, function: Callable, timer):
+    if timer is not None:
+        timer.cancel()
+    if future.done():
+        return
+    if task.cancelled():
+        # Skipped by the UI event thread, because the deadline had passed before it started.
+        _expire_future(future, task, function)
+    elif task.has_exception():
+        future.set_exception(task.exception()[1])
+    else:
+        future.set_result(task.result())
+
+
+def _trace_since(start: int, name: str, category: str, **args) -> int:
+    end = time.perf_counter_ns()
+    _trace.record(name, category, start, end, args if len(args) > 0 else None)
+    return end
+
+
+_event_thread = None
+_event_thread_lock = threading.Lock()
+
 
+def get_event_thread() -> EventThread:
+    """Get the UI event thread, creating and starting it on first use."""
+    global _event_thread
+    thread = _event_thread
+    if thread is None:
+        with _event_thread_lock:
+            if _event_thread is None:
+                # DRAGIYSKI_UI_HEADLESS must select the video driver before the event thread can initialize any subsystem.
+                _headless._enable_from_environment()
+                thread = EventThread(name='dragiyski.ui.event', daemon=False)
+                ui_threads.add(thread)
+                _event_thread = thread
+                thread.start()
+            thread = _event_thread
+    return thread
 
-def wait_for_atexit():
+
+def is_event_thread() -> bool:
+    return _event_thread is not None and threading.current_thread() is _event_thread
+
+
+def wait_for_atexit(event_thread: EventThread):
     """Stage 1 of the `dragiyski.ui.alive` thread is idle thread intended to signal to the `dragiyski.ui.event` when
     there is no other non-daemon (strongly-referencing) threads except the UI threads.
 
@@ -187,10 +550,29 @@ def wait_for_atexit():
     # TODO: this thread wait for the main thread to exit. In such case, starting another waiting thread is not necessary.
 
 
-alive_thread_stage1 = threading.Thread(target=wait_for_atexit, name='dragiyski.ui.alive', daemon=False)
-ui_threads.add(alive_thread_stage1)
+def run_in_event_thread(function: Callable, /, *args, **kwargs):
+    return get_event_thread().execute(function, *args, **kwargs)
+
 
-run_in_event_thread = event_thread.execute
+def run_in_event_thread_with_timeout(timeout: float, function: Callable, /, *args, **kwargs):
+    """Like `run_in_event_thread()`, but raises `TimeoutError` if the function has not finished within `timeout` seconds."""
+    return get_event_thread().execute_until(time.monotonic() + timeout, function, *args, **kwargs)
+
+
+def run_in_event_thread_async(function: Callable, /, *args, **kwargs) -> 'asyncio.Future':
+    """Execute a function in the UI event thread; the result is awaitable from the running asyncio loop."""
+    return get_event_thread().execute_async(function, *args, **kwargs)
+
+
+def run_in_event_thread_async_with_timeout(timeout: float, function: Callable, /, *args, **kwargs) -> 'asyncio.Future':
+    """Like `run_in_event_thread_async()`, but the future raises `TimeoutError` if the function has not finished within
+    `timeout` seconds.
+    """
+    return get_event_thread().execute_async_until(time.monotonic() + timeout, function, *args, **kwargs)
+
+
+def post_in_event_thread(function: Callable, /, *args, **kwargs) -> EventTask:
+    return get_event_thread().post(function, *args, **kwargs)
 
 
 def in_event_thread(function):
@@ -200,9 +582,48 @@ def in_event_thread(function):
         caller.__qualname__ = function.__qualname__
     return caller
 
-def add_event_listener(listener):
-    event_listeners.add(listener)
-    if event_thread.is_alive():
-        run_in_event_thread(event_thread.terminate_stage1)
+def add_event_listener(listener, *, weak: bool = False):
+    """Keep the UI event thread pumping libSDL2 events while `listener` is registered.
+
+    Args:
+        weak (bool, optional): Do not keep the listener alive. It is removed automatically once it is collected.
+    """
+    global event_listeners
+    with event_listener_lock:
+        if _find_event_listener(listener) is None:
+            event_listeners = event_listeners | {weak_reference(listener, _remove_collected_listener) if weak else listener}
+    thread = _event_thread
+    if thread is not None and thread.is_alive():
+        # Any task wakes up the task loop of stage 1, which then moves to stage 2. Unlike `terminate_stage1()`, it does
+        # not end the thread, if the listener is removed before the loop checks for it.
+        run_in_event_thread(_wake_up)
     else:
-        event_thread.start()
+        get_event_thread()
+
+
+def _wake_up():
+    pass
+
+
+def remove_event_listener(listener):
+    global event_listeners
+    with event_listener_lock:
+        entry = _find_event_listener(listener)
+        if entry is None:
+            return False
+        event_listeners = event_listeners - {entry}
+    return True
+
+
+def _find_event_listener(listener):
+    """The entry of `event_listeners` for the listener: the listener itself, or a weak reference to it."""
+    if listener in event_listeners:
+        return listener
+    return next((entry for entry in event_listeners if isinstance(entry, weakref.ref) and entry() == listener), None)
+
+
+def _remove_collected_listener(reference):
+    global event_listeners
+    with event_listener_lock:
+        # A dead reference keeps its hash, but is equal only to itself.
+        event_listeners = event_listeners - {reference}
@@ -0,0 +1,119 @@
+import contextlib
+import os
+import threading
+import time
+
+# Checked by every instrumented code path before recording anything, so a disabled tracer costs a single attribute lookup.
+enabled = False
+
+# The spans are kept in a preallocated ring: each slot is a tuple (name, category, thread id, start, end, args) with
+# times from `time.perf_counter_ns()`. The next slot is claimed under `_lock`, which is held only for the index increment
+# and the store, so spans are recorded from any thread (also on free-threaded Python builds).
+_spans = []
+_next = 0
+_lock = threading.Lock()
+_thread_names = dict()
+
+
+def enable(capacity: int = 65536):
+    """Start recording spans, keeping the last `capacity` of them. Previously recorded spans are discarded."""
+    global enabled, _spans, _next
+    if capacity <= 0:
+        raise ValueError('param `capacity` must be positive')
+    enabled = False
+    with _lock:
+        _spans = [None] * capacity
+        _next = 0
+    enabled = True
+
+
+def disable():
+    """Stop recording spans. The recorded spans are kept until `enable()` or `clear()`."""
+    global enabled
+    enabled = False
+
+
+def is_enabled() -> bool:
+    return enabled
+
+
+def clear():
+    global _next
+    with _lock:
+        for index in range(len(_spans)):
+            _spans[index] = None
+        _next = 0
+
+
+def record(name: str, category: str, start: int, end: int, args=None):
+    """Record a finished span. `start` and `end` are `time.perf_counter_ns()` values."""
+    global _next
+    thread_id = threading.get_ident()
+    if thread_id not in _thread_names:
+        _thread_names[thread_id] = threading.current_thread().name
+    item = (name, category, thread_id, start, end, args)
+    with _lock:
+        spans = _spans
+        if len(spans) <= 0:
+            return
+        spans[_next % len(spans)] = item
+        _next += 1
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = 'user', **args):
+    """Record the duration of a `with` block, if tracing is enabled."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record(name, category, start, time.perf_counter_ns(), args if len(args) > 0 else None)
+
+
+def function_name(function) -> str:
+    name = getattr(function, '__qualname__', None)
+    if not isinstance(name, str):
+        return repr(function)
+    module = getattr(function, '__module__', None)
+    return f'{module}.{name}' if isinstance(module, str) else name
+
+
+def events() -> list:
+    """The recorded spans, oldest first, as Chrome trace events (complete events with microsecond timestamps)."""
+    process_id = os.getpid()
+    spans = sorted((item for item in list(_spans) if item is not None), key=lambda item: item[3])
+    result = []
+    for thread_id in sorted({item[2] for item in spans}):
+        result.append({'name': 'thread_name', 'ph': 'M', 'pid': process_id, 'tid': thread_id, 'args': {'name': _thread_names.get(thread_id, str(thread_id))}})
+    for (name, category, thread_id, start, end, args) in spans:
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': process_id, 'tid': thread_id, 'ts': start / 1000, 'dur': (end - start) / 1000}
+        if args is not None:
+            event['args'] = {key: str(value) for key, value in args.items()}
+        result.append(event)
+    return result
+
+
+def dump(file):
+    """Write the recorded spans in the Chrome trace JSON format, viewable in `chrome://tracing` or Perfetto.
+
+    Args:
+        file (PathLike | TextIO): A path or a writable text file.
+    """
+    import json
+    data = {'traceEvents': events(), 'displayTimeUnit': 'ms'}
+    if hasattr(file, 'write'):
+        json.dump(data, file)
+        return
+    with open(file, 'w', encoding='utf-8') as output:
+        json.dump(data, output)
+
+
+def _enable_from_environment():
+    if os.environ.get('DRAGIYSKI_UI_TRACE', '').strip().lower() not in ('', '0', 'false', 'no'):
+        enable()
+
+
+_enable_from_environment()
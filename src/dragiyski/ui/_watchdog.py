@@ -0,0 +1,105 @@
+from typing import Callable, NamedTuple, Optional
+import sys
+import threading
+import time
+import traceback
+
+# Checked by the UI event thread before updating `activity`, so a stopped watchdog costs a single attribute lookup.
+enabled = False
+# What the UI event thread is busy with: (time.monotonic() at the start, the task function, event type or name), or
+# `None` while it is waiting for events or tasks. Written by the event thread only.
+activity = None
+
+_watchdog_thread = None
+_watchdog_lock = threading.Lock()
+
+
+class StallReport(NamedTuple):
+    task: str
+    duration: float
+    stack: list
+
+    def format(self) -> str:
+        return f'dragiyski.ui: the event thread is blocked in {self.task} for {self.duration:.3f}s\n' + ''.join(self.stack)
+
+
+def describe(subject) -> str:
+    if isinstance(subject, int):
+        from ._metrics import event_type_name
+        return f'event {event_type_name(subject)}'
+    if isinstance(subject, str):
+        return subject
+    from ._trace import function_name
+    return function_name(subject)
+
+
+def print_report(report: StallReport):
+    print(report.format(), file=sys.stderr, flush=True)
+
+
+class _WatchdogThread(threading.Thread):
+    def __init__(self, threshold: float, callback: Callable, interval: float):
+        super().__init__(name='dragiyski.ui.watchdog', daemon=True)
+        self.threshold = threshold
+        self.callback = callback
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        from . import _thread
+        reported = None
+        while not self.stopped.wait(self.interval):
+            current = activity
+            if current is None or current is reported:
+                continue
+            duration = time.monotonic() - current[0]
+            if duration < self.threshold:
+                continue
+            event_thread = _thread._event_thread
+            frame = sys._current_frames().get(event_thread.ident) if event_thread is not None else None
+            if activity is not current:
+                # The event thread has moved on while the stack was captured.
+                continue
+            reported = current
+            stack = traceback.format_stack(frame) if frame is not None else []
+            del frame
+            try:
+                self.callback(StallReport(describe(current[1]), duration, stack))
+            except:
+                traceback.print_exc()
+
+
+def start(threshold: float = 0.25, callback: Optional[Callable] = None, *, interval: Optional[float] = None):
+    """Report when the UI event thread is blocked for longer than `threshold` seconds.
+
+    The event thread marks the start of every task and event it processes; a separate thread checks the mark every
+    `interval` seconds. Each stall is reported once, with the stack of the event thread at the time of detection.
+
+    Args:
+        threshold (float, optional): The stall threshold in seconds.
+        callback (Callable, optional): Called with a `StallReport` from the watchdog thread. Prints to stderr by default.
+        interval (float, optional): How often to check. Defaults to a quarter of the threshold.
+    """
+    global enabled, _watchdog_thread
+    if threshold <= 0:
+        raise ValueError('param `threshold` must be positive')
+    with _watchdog_lock:
+        if _watchdog_thread is not None:
+            _watchdog_thread.stopped.set()
+        _watchdog_thread = _WatchdogThread(threshold, callback or print_report, interval or threshold / 4)
+        enabled = True
+        _watchdog_thread.start()
+
+
+def stop():
+    global enabled, activity, _watchdog_thread
+    with _watchdog_lock:
+        enabled = False
+        activity = None
+        if _watchdog_thread is not None:
+            _watchdog_thread.stopped.set()
+            _watchdog_thread = None
+
+
+def is_running() -> bool:
+    return _watchdog_thread is not None
@@ -1,10 +1,72 @@
-from sdl2 import *
+from sdl2 import (
+    SDL_ClearError,
+    SDL_CreateWindow,
+    SDL_DestroyWindow,
+    SDL_FALSE,
+    SDL_GetError,
+    SDL_GetWindowDisplayIndex,
+    SDL_GetWindowFlags,
+    SDL_GetWindowID,
+    SDL_GetWindowPosition,
+    SDL_GetWindowSize,
+    SDL_GetWindowSurface,
+    SDL_GetWindowTitle,
+    SDL_HitTest,
+    SDL_HideWindow,
+    SDL_INIT_VIDEO,
+    SDL_MaximizeWindow,
+    SDL_MinimizeWindow,
+    SDL_RestoreWindow,
+    SDL_SetWindowBordered,
+    SDL_SetWindowHitTest,
+    SDL_SetWindowMaximumSize,
+    SDL_SetWindowMinimumSize,
+    SDL_SetWindowPosition,
+    SDL_SetWindowResizable,
+    SDL_SetWindowSize,
+    SDL_SetWindowTitle,
+    SDL_ShowWindow,
+    SDL_TRUE,
+    SDL_WINDOWEVENT_DISPLAY_CHANGED,
+    SDL_WINDOWEVENT_ENTER,
+    SDL_WINDOWEVENT_FOCUS_GAINED,
+    SDL_WINDOWEVENT_FOCUS_LOST,
+    SDL_WINDOWEVENT_HIDDEN,
+    SDL_WINDOWEVENT_LEAVE,
+    SDL_WINDOWEVENT_MAXIMIZED,
+    SDL_WINDOWEVENT_MINIMIZED,
+    SDL_WINDOWEVENT_MOVED,
+    SDL_WINDOWEVENT_RESIZED,
+    SDL_WINDOWEVENT_RESTORED,
+    SDL_WINDOWEVENT_SHOWN,
+    SDL_WINDOWEVENT_SIZE_CHANGED,
+    SDL_WINDOWPOS_CENTERED,
+    SDL_WINDOWPOS_CENTERED_DISPLAY,
+    SDL_WINDOWPOS_UNDEFINED,
+    SDL_WINDOWPOS_UNDEFINED_DISPLAY,
+    SDL_WINDOW_FULLSCREEN,
+    SDL_WINDOW_FULLSCREEN_DESKTOP,
+    SDL_WINDOW_HIDDEN,
+    SDL_WINDOW_INPUT_FOCUS,
+    SDL_WINDOW_MAXIMIZED,
+    SDL_WINDOW_MINIMIZED,
+    SDL_WINDOW_RESIZABLE,
+    SDL_WINDOW_SHOWN,
+    SDL_WindowEvent
+)
 from enum import Enum
 from ._geometry import Rectangle
+from ._hit_test import HitTable
+from ._surface import Surface, create_window_surface
+from ._renderer import Renderer, create_renderer
+from ._window_worker import WindowWorker
+from ._headless import is_enabled as is_headless
 from ._error import UIError
-from ._thread import window_map, window_map_lock, event_thread, in_event_thread
+from ._application import ensure_subsystem
+from ._thread import window_map, window_map_lock, is_event_thread, in_event_thread, add_event_listener, remove_event_listener
 from . import display
-from typing import Optional, Union
+from typing import Callable, NamedTuple, Optional, Union
+import ctypes
 import threading
 
 
@@ -14,12 +76,13 @@ class WindowDatabase(type):
     """
 
     def __call__(self, id: int):
-        if not event_thread.is_alive() or threading.current_thread() is not event_thread:
+        if not is_event_thread():
             raise RuntimeError('Window() cannot only be called from the UIEvent thread. Use Window.create() instead.')
-        with window_map_lock:
-            if id in window_map:
-                return window_map[id]
-            raise Window.NotFound('The window with ID [{id}] does not exists or not created with dragiyski.ui module.')
+        # Lookup does not lock: window_map is only modified under window_map_lock and a single dict.get() is atomic.
+        window = window_map.get(id)
+        if window is not None:
+            return window
+        raise Window.NotFound(f'The window with ID [{id}] does not exists or not created with dragiyski.ui module.')
 
 
 class Window(metaclass=WindowDatabase):
@@ -51,6 +114,16 @@ class Window(metaclass=WindowDatabase):
     class NotFound(UIError):
         pass
 
+    class State(NamedTuple):
+        """An immutable snapshot of the window properties, as last known by the UI event thread."""
+        x: int
+        y: int
+        width: int
+        height: int
+        flags: int
+        display: int
+        title: str
+
     class Mode(Enum):
         WINDOW = 0
         DESKTOP = 1
@@ -66,8 +139,7 @@ class Window(metaclass=WindowDatabase):
         resizable: bool = True,
         minimized: bool = False,
         maximized: bool = False,
-        window_mode: Mode = Mode.WINDOW,
-        **kwargs
+        window_mode: Mode = Mode.WINDOW
     ):
         """Creates a window.
 
@@ -97,10 +169,11 @@ class Window(metaclass=WindowDatabase):
             sdl_args[5] |= SDL_WINDOW_FULLSCREEN_DESKTOP
         elif window_mode == Window.Mode.FULLSCREEN:
             sdl_args[5] |= SDL_WINDOW_FULLSCREEN
-        cls._create(sdl_args)
+        return cls._create(sdl_args)
 
     @classmethod
     @in_event_thread
+    @ensure_subsystem(SDL_INIT_VIDEO)
     def _create(cls, sdl_args):
         SDL_ClearError()
         sdl_window = SDL_CreateWindow(*sdl_args)
@@ -112,7 +185,7 @@ class Window(metaclass=WindowDatabase):
             raise UIError
         SDL_ClearError()
         window_id = SDL_GetWindowID(sdl_window)
-        if id == 0:
+        if window_id == 0:
             message = SDL_GetError().decode('utf-8')
             SDL_DestroyWindow(sdl_window)
             raise UIError(message)
@@ -125,20 +198,371 @@ class Window(metaclass=WindowDatabase):
             self.__id = window_id
             self.__event_listener_lock = threading.RLock()
             self.__event_listener_by_type = dict()
+            self.__renderer = None
+            self.__worker = None
+            self.__state = None
+            self.__hit_layout = None
+            self.__hit_table = None
+            self.__hit_size = None
+            self.__hit_callback = None
+            self._refresh_state()
             window_map[window_id] = self
         return self
 
+    def _refresh_state(self):
+        """Query all cached properties from libSDL2. Must be called in the UI event thread."""
+        x, y, width, height = ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        SDL_GetWindowPosition(self.__window, ctypes.byref(x), ctypes.byref(y))
+        SDL_GetWindowSize(self.__window, ctypes.byref(width), ctypes.byref(height))
+        title = SDL_GetWindowTitle(self.__window)
+        self.__state = Window.State(
+            x=x.value,
+            y=y.value,
+            width=width.value,
+            height=height.value,
+            flags=SDL_GetWindowFlags(self.__window),
+            display=SDL_GetWindowDisplayIndex(self.__window),
+            title=title.decode('utf-8') if title is not None else ''
+        )
+        self._layout_hit_regions(width.value, height.value)
+
+    def _layout_hit_regions(self, width: int, height: int):
+        """Recompile the hit regions of a layout for a new window size. Must be called in the UI event thread."""
+        layout = self.__hit_layout
+        if callable(layout) and self.__hit_size != (width, height):
+            # Compiled before the swap, so the hit test callback always sees a complete table.
+            self.__hit_table = HitTable(layout(width, height))
+            self.__hit_size = (width, height)
+
+    def _on_window_event(self, event: SDL_WindowEvent):
+        """Update the cached state from a window event. Must be called in the UI event thread."""
+        state = self.__state
+        if event.event == SDL_WINDOWEVENT_MOVED:
+            state = state._replace(x=event.data1, y=event.data2, display=SDL_GetWindowDisplayIndex(self.__window))
+        elif event.event in (SDL_WINDOWEVENT_RESIZED, SDL_WINDOWEVENT_SIZE_CHANGED):
+            state = state._replace(width=event.data1, height=event.data2)
+            self._layout_hit_regions(state.width, state.height)
+        elif event.event == SDL_WINDOWEVENT_DISPLAY_CHANGED:
+            state = state._replace(display=event.data1)
+        elif event.event in _window_flag_events:
+            state = state._replace(flags=SDL_GetWindowFlags(self.__window))
+        else:
+            return
+        # The state is replaced as a whole, so readers in other threads always see a consistent snapshot.
+        self.__state = state
+
+    @property
+    def id(self) -> Optional[int]:
+        """The libSDL2 window ID, or `None` if the window has been destroyed."""
+        return self.__id
+
+    @property
+    def state(self) -> 'Window.State':
+        return self.__state
+
+    @property
+    def position(self):
+        state = self.__state
+        return (state.x, state.y)
+
+    @position.setter
+    def position(self, value):
+        self.update(position=value)
+
+    @property
+    def size(self):
+        state = self.__state
+        return (state.width, state.height)
+
+    @size.setter
+    def size(self, value):
+        self.update(size=value)
+
+    @property
+    def title(self) -> str:
+        return self.__state.title
+
+    @title.setter
+    def title(self, value: Union[str, bytes]):
+        self.update(title=value)
+
+    @property
+    def flags(self) -> int:
+        """The `SDL_WINDOW_*` flags of the window."""
+        return self.__state.flags
+
+    @property
+    def display_index(self) -> int:
+        return self.__state.display
+
+    @property
+    def visible(self) -> bool:
+        return (self.__state.flags & SDL_WINDOW_SHOWN) != 0
+
+    @visible.setter
+    def visible(self, value: bool):
+        self.update(visible=value)
+
+    @property
+    def minimized(self) -> bool:
+        return (self.__state.flags & SDL_WINDOW_MINIMIZED) != 0
+
+    @property
+    def maximized(self) -> bool:
+        return (self.__state.flags & SDL_WINDOW_MAXIMIZED) != 0
+
+    @property
+    def focused(self) -> bool:
+        return (self.__state.flags & SDL_WINDOW_INPUT_FOCUS) != 0
+
+    @in_event_thread
+    def update(self, **props):
+        """Change multiple window properties at once, with a single call into the UI event thread.
+
+        Args:
+            title (Union[str, bytes], optional): The window title.
+            position (tuple[int, int], optional): The position of the top-left corner of the window.
+            size (tuple[int, int], optional): The size of the client area of the window.
+            minimum_size (tuple[int, int], optional): The minimum size of the client area of the window.
+            maximum_size (tuple[int, int], optional): The maximum size of the client area of the window.
+            visible (bool, optional): Show or hide the window.
+            resizable (bool, optional): Whether the user can resize the window.
+            bordered (bool, optional): Whether the window has decorations.
+            state (str, optional): One of `'minimized'`, `'maximized'` or `'restored'`.
+        """
+        unknown = [name for name in props if name not in _window_update_properties]
+        if len(unknown) > 0:
+            raise TypeError(f'Window.update() got unexpected properties: {", ".join(unknown)}')
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        for name in _window_update_properties:
+            if name in props:
+                getattr(self, '_set_' + name)(props[name])
+        self._refresh_state()
+
+    def _set_title(self, title):
+        if isinstance(title, str):
+            title = title.encode('utf-8')
+        SDL_SetWindowTitle(self.__window, title)
+
+    def _set_minimum_size(self, size):
+        SDL_SetWindowMinimumSize(self.__window, *size)
+
+    def _set_maximum_size(self, size):
+        SDL_SetWindowMaximumSize(self.__window, *size)
+
+    def _set_size(self, size):
+        SDL_SetWindowSize(self.__window, *size)
+
+    def _set_position(self, position):
+        SDL_SetWindowPosition(self.__window, *position)
+
+    def _set_resizable(self, resizable):
+        SDL_SetWindowResizable(self.__window, SDL_TRUE if resizable else SDL_FALSE)
+
+    def _set_bordered(self, bordered):
+        SDL_SetWindowBordered(self.__window, SDL_TRUE if bordered else SDL_FALSE)
+
+    def _set_visible(self, visible):
+        if visible:
+            SDL_ShowWindow(self.__window)
+        else:
+            SDL_HideWindow(self.__window)
+
+    def _set_state(self, state):
+        if state == 'minimized':
+            SDL_MinimizeWindow(self.__window)
+        elif state == 'maximized':
+            SDL_MaximizeWindow(self.__window)
+        elif state == 'restored':
+            SDL_RestoreWindow(self.__window)
+        else:
+            raise ValueError('param `state` must be one of \'minimized\', \'maximized\' or \'restored\'')
+
     @in_event_thread
     def destroy(self):
         if self.__id is None:
             return
+        if self.__worker is not None:
+            self.__worker.stop()
+            remove_event_listener(self.__worker)
+            self.__worker = None
+        if self.__renderer is not None:
+            self.__renderer.destroy()
+            self.__renderer = None
         SDL_DestroyWindow(self.__window)
+        with window_map_lock:
+            window_map.pop(self.__id, None)
         self.__id = None
+        self.__window = None
+        self.__hit_layout = None
+        self.__hit_table = None
+        self.__hit_callback = None
+        # Swapped out first: listener.remove() calls back into _remove_event_listener().
+        with self.__event_listener_lock:
+            listener_by_type, self.__event_listener_by_type = self.__event_listener_by_type, dict()
+        for type_map in listener_by_type.values():
+            for listener in list(type_map.values()):
+                listener.remove()
+
+    def _add_event_listener(self, listener):
+        """Track a listener of this window, to be removed by `destroy()`."""
+        with self.__event_listener_lock:
+            self.__event_listener_by_type.setdefault(listener.type, dict())[id(listener)] = listener
+
+    def _remove_event_listener(self, listener):
         with self.__event_listener_lock:
-            for type_map in self.__event_listener_by_type.values():
-                for listener in type_map.values():
-                    listener.remove()
+            type_map = self.__event_listener_by_type.get(listener.type)
+            if type_map is not None and type_map.pop(id(listener), None) is not None and len(type_map) <= 0:
+                del self.__event_listener_by_type[listener.type]
+
+    @in_event_thread
+    def surface(self) -> Surface:
+        """Get the pixel memory of the window for direct (software) drawing.
+
+        The returned surface is valid until the window is resized or destroyed.
+        """
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        SDL_ClearError()
+        sdl_surface = SDL_GetWindowSurface(self.__window)
+        if not sdl_surface:
+            raise UIError
+        return create_window_surface(self.__window, sdl_surface)
+
+    @in_event_thread
+    def renderer(self, *, software: bool = False, vsync: bool = False) -> Renderer:
+        """Get the renderer of the window, creating it on the first call.
+
+        Args:
+            software (bool, optional): Use the software renderer. It does not require a GPU and works with the dummy video driver.
+                Always enabled in headless mode.
+            vsync (bool, optional): Synchronize `Renderer.present()` with the display refresh rate.
+        """
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        if self.__renderer is None:
+            self.__renderer = create_renderer(self.__window, software=software or is_headless(), vsync=vsync)
+        return self.__renderer
+
+    @in_event_thread
+    def capture(self):
+        """Get the current frame of the window as a numpy array of shape `(height, width, bytes_per_pixel)`.
+
+        For windows drawn through a surface, a worker or a software renderer, the array is a view of the window
+        framebuffer, so no pixels are copied. It reflects the last `update()`/`present()` and is invalidated when the
+        window is resized. For windows with a hardware renderer, the pixels are read back into a new array.
+        """
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        if self.__renderer is not None and not self.__renderer.software:
+            return self.__renderer.read_pixels()
+        return self.surface().array()
+
+    @in_event_thread
+    def set_hit_regions(self, regions):
+        """Define the areas of a (borderless) window that move or resize it, like the decorations of a bordered window.
+
+        The regions are compiled into a `HitTable`, so the libSDL2 hit test (called in the UI event thread on every
+        mouse move) does not run user code. A layout callable is re-evaluated when the window is resized, and the new
+        table replaces the old one as a whole.
+
+        Args:
+            regions (Iterable[tuple[str, Rectangle]] | Callable | None): The kind (`'draggable'`, `'resize_top_left'`,
+                `'resize_top'`, ... `'resize_left'` or `'normal'`) and area of each region, in window coordinates, the
+                first matching region wins; or a layout `layout(width, height)` returning such regions (see
+                `dragiyski.ui.hit_test.border_regions()`); or `None` to remove the hit test.
+
+        Raises:
+            UIError: If the video driver does not support hit testing. In headless mode, the regions are still available
+                through `hit_test()`.
+        """
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        if regions is None:
+            SDL_SetWindowHitTest(self.__window, SDL_HitTest(), None)
+            self.__hit_layout = None
+            self.__hit_table = None
+            self.__hit_size = None
+            self.__hit_callback = None
+            return
+        layout = regions if callable(regions) else tuple(regions)
+        size = (self.__state.width, self.__state.height)
+        table = HitTable(layout(*size) if callable(layout) else layout)
+        if self.__hit_callback is None:
+            callback = SDL_HitTest(self._on_hit_test)
+            SDL_ClearError()
+            if SDL_SetWindowHitTest(self.__window, callback, None) < 0 and not is_headless():
+                raise UIError
+            self.__hit_callback = callback
+        self.__hit_layout = layout
+        self.__hit_table = table
+        self.__hit_size = size
+
+    def _on_hit_test(self, sdl_window, area, data):
+        table = self.__hit_table
+        if table is None:
+            return 0
+        point = area.contents
+        return table.lookup(point.x, point.y)
+
+    def hit_test(self, x: int, y: int) -> str:
+        """The kind of the hit region at a point in window coordinates, as answered to libSDL2."""
+        table = self.__hit_table
+        return 'normal' if table is None else table.kind(x, y)
+
+    @property
+    def worker(self) -> Optional[WindowWorker]:
+        return self.__worker
+
+    @in_event_thread
+    def start_worker(self, *, render: Optional[Callable] = None, on_event: Optional[Callable] = None, fps: Optional[float] = None) -> WindowWorker:
+        """Start a dedicated worker thread for this window.
+
+        Once started, the events of this window are delivered to `on_event` in the worker thread instead of the global
+        event listeners. The worker renders into its own double-buffered surface and the UI event thread presents it.
+
+        Args:
+            render (Callable, optional): Called with the back buffer `Surface` to draw a frame.
+            on_event (Callable, optional): Called with each `SDL_Event` of this window.
+            fps (float, optional): Render at a fixed rate. If not specified, a frame is rendered only after events or `WindowWorker.invalidate()`.
+        """
+        if self.__id is None:
+            raise Window.NotFound('The window has been destroyed')
+        if self.__worker is not None:
+            raise RuntimeError('The window already has a worker')
+        if self.__renderer is not None:
+            raise RuntimeError('A window with a renderer cannot have a worker')
+        SDL_ClearError()
+        window_surface = SDL_GetWindowSurface(self.__window)
+        if not window_surface:
+            raise UIError
+        worker = WindowWorker(self, self.__window, window_surface.contents.format.contents.format, render=render, on_event=on_event, fps=fps)
+        self.__worker = worker
+        worker.start()
+        # Keeps the UI event thread routing events to the worker, like any other listener, until the window is destroyed.
+        add_event_listener(worker)
+        return worker
+
+# The order in which Window.update() applies the properties: size limits before the size, the size before the position.
+_window_update_properties = ('title', 'minimum_size', 'maximum_size', 'size', 'position', 'resizable', 'bordered', 'visible', 'state')
+_window_flag_events = frozenset([
+    SDL_WINDOWEVENT_SHOWN,
+    SDL_WINDOWEVENT_HIDDEN,
+    SDL_WINDOWEVENT_MINIMIZED,
+    SDL_WINDOWEVENT_MAXIMIZED,
+    SDL_WINDOWEVENT_RESTORED,
+    SDL_WINDOWEVENT_ENTER,
+    SDL_WINDOWEVENT_LEAVE,
+    SDL_WINDOWEVENT_FOCUS_GAINED,
+    SDL_WINDOWEVENT_FOCUS_LOST
+])
+
 
+def on_window_event(event: SDL_WindowEvent):
+    window = window_map.get(event.windowID)
+    if window is not None:
+        window._on_window_event(event)
 
 
 def get_arguments_from_position(position: Window.Position):
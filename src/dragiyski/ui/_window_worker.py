@@ -0,0 +1,208 @@
+from sdl2 import (
+    SDL_BITSPERPIXEL,
+    SDL_BLENDMODE_NONE,
+    SDL_BlitSurface,
+    SDL_ClearError,
+    SDL_CreateRGBSurfaceWithFormat,
+    SDL_Event,
+    SDL_FreeSurface,
+    SDL_GetWindowSurface,
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP,
+    SDL_MOUSEMOTION,
+    SDL_MOUSEWHEEL,
+    SDL_SetSurfaceBlendMode,
+    SDL_TEXTEDITING,
+    SDL_TEXTINPUT,
+    SDL_UpdateWindowSurface,
+    SDL_WINDOWEVENT
+)
+from queue import SimpleQueue, Empty
+from typing import Callable, Optional
+from traceback import print_exc
+from ._error import UIError
+from ._surface import create_surface
+from ._thread import window_map, post_in_event_thread
+from . import _metrics
+from . import _trace
+import threading
+import time
+
+# The event types whose structure has `windowID` right after `type` and `timestamp`, so it can be read through any of them.
+# Drop events are not routed: their `file` string is released by the event thread right after the dispatch.
+window_routed_event_types = frozenset([
+    SDL_WINDOWEVENT,
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_TEXTEDITING,
+    SDL_TEXTINPUT,
+    SDL_MOUSEMOTION,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP,
+    SDL_MOUSEWHEEL
+])
+
+_redraw = object()
+_stop = object()
+
+
+class WindowWorker(threading.Thread):
+    """A dedicated thread for a single window.
+
+    The worker receives only the events of its window (routed by `windowID` in the UI event thread) and renders into
+    its own pair of offscreen surfaces. After each frame the buffers are swapped and the UI event thread copies the
+    front buffer into the window. Rendering and event handling of different windows run in parallel to the extent
+    the rendering code releases the GIL (numpy, SDL blits, etc.).
+
+    Both `on_event` and `render` are called in the worker thread. `on_event` receives the raw `SDL_Event`; `render`
+    receives the back buffer as a `Surface`.
+    """
+
+    def __init__(self, window, sdl_window, pixel_format: int, *, render: Optional[Callable] = None, on_event: Optional[Callable] = None, fps: Optional[float] = None):
+        super().__init__(name=f'dragiyski.ui.window:{window.id}', daemon=True)
+        if fps is not None and fps <= 0:
+            raise ValueError('param `fps` must be positive')
+        self.__window = window
+        self.__sdl_window = sdl_window
+        self.__pixel_format = pixel_format
+        self.__render = render
+        self.__on_event = on_event
+        self.__interval = None if fps is None else 1.0 / fps
+        self.__events = SimpleQueue()
+        self.__buffers = [None, None]
+        self.__buffer_lock = threading.Lock()
+        self.__present_pending = False
+        self.__running = True
+
+    @property
+    def window(self):
+        return self.__window
+
+    def push_event(self, sdl_event: SDL_Event):
+        self.__events.put(sdl_event)
+
+    def invalidate(self):
+        """Request a new frame to be rendered, even if there were no events."""
+        self.__events.put(_redraw)
+
+    def stop(self):
+        """Stop the worker after the current frame. Does not wait for the thread to exit."""
+        self.__running = False
+        self.__events.put(_stop)
+
+    def run(self):
+        try:
+            invalid = True
+            next_frame = time.monotonic()
+            while self.__running:
+                timeout = None
+                if self.__interval is not None:
+                    timeout = max(0.0, next_frame - time.monotonic())
+                elif invalid and self.__render is not None:
+                    timeout = 0.0
+                items = []
+                try:
+                    items.append(self.__events.get(timeout=timeout))
+                    while True:
+                        items.append(self.__events.get_nowait())
+                except Empty:
+                    pass
+                for item in items:
+                    if item is _stop:
+                        return
+                    invalid = True
+                    if item is not _redraw and self.__on_event is not None:
+                        if _metrics.enabled:
+                            _metrics.record_event_latency(item.common.timestamp)
+                        start = time.perf_counter_ns() if _trace.enabled else None
+                        try:
+                            self.__on_event(item)
+                        except:
+                            print_exc()
+                        if start is not None:
+                            _trace.record(_trace.function_name(self.__on_event), 'listener', start, time.perf_counter_ns())
+                if self.__render is None:
+                    continue
+                if self.__interval is not None:
+                    now = time.monotonic()
+                    if now < next_frame:
+                        continue
+                    next_frame = max(next_frame + self.__interval, now)
+                elif not invalid:
+                    continue
+                invalid = False
+                start = time.perf_counter_ns() if _trace.enabled else None
+                try:
+                    self._render_frame()
+                except:
+                    print_exc()
+                if start is not None:
+                    _trace.record(_trace.function_name(self.__render), 'render', start, time.perf_counter_ns())
+        finally:
+            self.__running = False
+            # The callbacks often reference large object graphs (views, models); do not keep them past the thread.
+            self.__render = None
+            self.__on_event = None
+            with self.__buffer_lock:
+                for buffer in self.__buffers:
+                    if buffer is not None:
+                        SDL_FreeSurface(buffer._Surface__impl)
+                self.__buffers = [None, None]
+
+    def _render_frame(self):
+        width, height = self.__window.size
+        back = self.__buffers[1]
+        if back is None or back.width != width or back.height != height:
+            # Only the front buffer is shared with the UI event thread, the back buffer can be replaced freely.
+            if back is not None:
+                SDL_FreeSurface(back._Surface__impl)
+                self.__buffers[1] = None
+            SDL_ClearError()
+            sdl_surface = SDL_CreateRGBSurfaceWithFormat(0, width, height, SDL_BITSPERPIXEL(self.__pixel_format), self.__pixel_format)
+            if not sdl_surface:
+                raise UIError
+            SDL_SetSurfaceBlendMode(sdl_surface, SDL_BLENDMODE_NONE)
+            back = self.__buffers[1] = create_surface(sdl_surface)
+        self.__render(back)
+        with self.__buffer_lock:
+            self.__buffers.reverse()
+        if not self.__present_pending:
+            self.__present_pending = True
+            post_in_event_thread(self._present)
+
+    def _present(self):
+        self.__present_pending = False
+        if self.__window.id is None:
+            return
+        with self.__buffer_lock:
+            front = self.__buffers[0]
+            if front is None:
+                return
+            SDL_ClearError()
+            window_surface = SDL_GetWindowSurface(self.__sdl_window)
+            if not window_surface:
+                raise UIError
+            if SDL_BlitSurface(front._Surface__impl, None, window_surface, None) < 0:
+                raise UIError
+        if SDL_UpdateWindowSurface(self.__sdl_window) < 0:
+            raise UIError
+
+
+def route_event(sdl_event: SDL_Event) -> bool:
+    """Pass the event to the worker of its window, if any. Called in the UI event thread.
+
+    Returns:
+        bool: True if the event has been consumed by a window worker.
+    """
+    if sdl_event.type not in window_routed_event_types:
+        return False
+    window = window_map.get(sdl_event.window.windowID)
+    if window is None:
+        return False
+    worker = window.worker
+    if worker is None:
+        return False
+    worker.push_event(sdl_event)
+    return True
@@ -0,0 +1 @@
+from ._aio import get_event_loop, run_coroutine, run, close, EventThreadLoop
@@ -0,0 +1 @@
+from ._audio import devices, driver, formats, convert_samples, AudioOutput
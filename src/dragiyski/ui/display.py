@@ -11,5 +11,6 @@ from ._display import (
     bounds,
     usable_bounds,
     PixelFormat,
+    bytes_per_pixel,
     DisplayMode
 )
\ No newline at end of file
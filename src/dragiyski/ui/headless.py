@@ -0,0 +1 @@
+from ._headless import enable, is_enabled, driver
@@ -0,0 +1 @@
+from ._hit_test import HitTable, border_regions, hit_kinds
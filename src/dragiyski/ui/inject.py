@@ -0,0 +1 @@
+from ._inject import inject, event_dtype, event_types, EventGenerator
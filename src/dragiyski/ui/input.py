@@ -0,0 +1 @@
+from ._input import keyboard_state, mouse_state, scancode, MouseState
@@ -0,0 +1 @@
+from ._joystick import count, name, attach_virtual, detach_virtual, Joystick, AXIS, BUTTON, HAT
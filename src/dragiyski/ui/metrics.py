@@ -0,0 +1 @@
+from ._metrics import enable, disable, is_enabled, reset, snapshot, Histogram
@@ -0,0 +1 @@
+from ._trace import enable, disable, is_enabled, clear, span, events, dump
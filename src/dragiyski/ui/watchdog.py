@@ -0,0 +1 @@
+from ._watchdog import start, stop, is_running, StallReport
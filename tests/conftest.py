@@ -0,0 +1,18 @@
+import os
+
+# Must be set before dragiyski.ui initializes the video subsystem: every window is backed by an in-memory surface.
+os.environ.setdefault('DRAGIYSKI_UI_HEADLESS', '1')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pytest
+
+
+@pytest.fixture
+def window():
+    import dragiyski.ui as ui
+    window = ui.Window.create(title='test', position=ui.Window.Position(0, 0, 64, 48), visible=False)
+    try:
+        yield window
+    finally:
+        # An open window keeps the UI event thread (and the test process) alive.
+        window.destroy()
@@ -0,0 +1,49 @@
+from dragiyski.ui import aio
+from dragiyski.ui import _thread
+from dragiyski.ui._thread import is_event_thread
+import asyncio
+import threading
+import time
+import pytest
+
+
+def test_run_and_close():
+    async def sleep():
+        assert is_event_thread()
+        start = time.monotonic()
+        await asyncio.sleep(0.05)
+        return time.monotonic() - start
+
+    cancelled = threading.Event()
+
+    async def forever():
+        try:
+            await asyncio.sleep(100)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    try:
+        assert 0.05 <= aio.run(sleep(), timeout=5) < 1
+        event_loop = aio.get_event_loop()
+        assert event_loop in _thread.event_listeners
+        future = aio.run_coroutine(forever())
+        # Let the coroutine start.
+        assert aio.run(asyncio.sleep(0.01), timeout=5) is None
+    finally:
+        aio.close()
+    assert cancelled.is_set() and future.cancelled()
+    assert event_loop.is_closed() and event_loop not in _thread.event_listeners
+
+
+def test_run_in_event_thread_fails():
+    async def nested():
+        coroutine = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            aio.run(coroutine)
+        coroutine.close()
+
+    try:
+        aio.run(nested(), timeout=5)
+    finally:
+        aio.close()
@@ -0,0 +1,48 @@
+from dragiyski.ui import AssetLoader, Surface, Texture
+from dragiyski.ui.display import PixelFormat
+from sdl2 import SDL_CreateRGBSurfaceWithFormatFrom, SDL_FreeSurface, SDL_PIXELFORMAT_ARGB8888, SDL_SaveBMP
+import numpy
+import pytest
+
+# ARGB8888 is stored as B, G, R, A on little endian machines.
+pixel = [30, 20, 10, 255]
+
+
+def test_decode_numpy_into_surface(tmp_path):
+    image = numpy.zeros((3, 5, 4), dtype=numpy.uint8)
+    image[...] = [10, 20, 30, 255]
+    numpy.save(tmp_path / 'image.npy', image)
+    with AssetLoader() as loader:
+        surface = loader.load(tmp_path / 'image.npy').result(5)
+    try:
+        assert isinstance(surface, Surface)
+        assert (surface.width, surface.height, surface.pixel_format) == (5, 3, PixelFormat.ARGB8888)
+        with surface:
+            assert (surface.array() == pixel).all()
+    finally:
+        surface.free()
+
+
+def test_decode_bmp_into_texture(tmp_path, window):
+    image = numpy.zeros((48, 64, 4), dtype=numpy.uint8)
+    image[...] = pixel
+    sdl_surface = SDL_CreateRGBSurfaceWithFormatFrom(image.ctypes.data, 64, 48, 32, 64 * 4, SDL_PIXELFORMAT_ARGB8888)
+    assert SDL_SaveBMP(sdl_surface, str(tmp_path / 'image.bmp').encode('utf-8')) == 0
+    SDL_FreeSurface(sdl_surface)
+    renderer = window.renderer(software=True)
+    with AssetLoader(renderer=renderer) as loader:
+        texture = loader.load(tmp_path / 'image.bmp').result(5)
+    assert isinstance(texture, Texture) and (texture.width, texture.height) == (64, 48)
+    renderer.clear()
+    renderer.copy(texture)
+    renderer.present()
+    assert numpy.array_equal(renderer.read_pixels(), image)
+    texture.destroy()
+
+
+def test_errors(tmp_path):
+    with AssetLoader() as loader:
+        with pytest.raises(ValueError):
+            loader.load(tmp_path / 'image.png')
+        with pytest.raises(FileNotFoundError):
+            loader.load(tmp_path / 'missing.bmp').result(5)
@@ -0,0 +1,69 @@
+from dragiyski.ui import audio
+from dragiyski.ui import UIError
+import numpy
+import time
+import pytest
+
+
+@pytest.fixture
+def output():
+    output = audio.AudioOutput.open(frequency=48000, channels=2, format='float32', samples=512)
+    try:
+        yield output
+    finally:
+        output.close()
+
+
+def test_dummy_driver():
+    assert audio.driver() == 'dummy'
+
+
+def test_write(output):
+    assert (output.frequency, output.channels, output.format) == (48000, 2, 'float32')
+    assert output.write(numpy.zeros((4800, 2), dtype=numpy.float32)) == 4800
+    # Flat samples are interleaved.
+    assert output.write(numpy.zeros(960, dtype=numpy.float32)) == 480
+    assert output.queued_frames == 5280 and output.written == 5280
+    assert output.latency == pytest.approx((5280 + output.buffer_frames) / 48000)
+    with pytest.raises(ValueError):
+        output.write(numpy.zeros((10, 3), dtype=numpy.float32))
+    with pytest.raises(ValueError):
+        output.write(numpy.zeros(3, dtype=numpy.float32))
+    assert output.queued_frames == 5280
+
+
+def test_convert_samples():
+    assert list(audio.convert_samples(numpy.array([-1.0, 0.0, 0.5, 2.0]), 'int16')) == [-32768, 0, 16384, 32767]
+    assert list(audio.convert_samples(numpy.array([-32768, 16384], dtype=numpy.int16), 'float32')) == [-1.0, 0.5]
+    assert list(audio.convert_samples(numpy.array([-128, 0, 127], dtype=numpy.int8), 'uint8')) == [0, 128, 255]
+    assert list(audio.convert_samples(numpy.array([0, 128], dtype=numpy.uint8), 'int16')) == [-32768, 0]
+    samples = numpy.zeros(4, dtype=numpy.float32)
+    assert audio.convert_samples(samples, 'float32') is samples
+
+
+def test_clear_is_not_an_underrun(output):
+    output.write(numpy.zeros((48000, 2), dtype=numpy.float32))
+    output.play()
+    assert output.playing
+    output.clear()
+    assert output.queued_frames == 0
+    output.write(numpy.zeros((4800, 2), dtype=numpy.float32))
+    assert output.underruns == 0
+    # The dummy driver consumes the queue in real time: 4800 frames last 0.1s.
+    deadline = time.monotonic() + 5
+    while output.queued_frames > 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    output.write(numpy.zeros((480, 2), dtype=numpy.int16))
+    assert output.underruns == 1
+
+
+def test_close(output):
+    output.write(numpy.zeros((480, 2), dtype=numpy.float32))
+    output.close()
+    assert output.closed and output.queued_frames == 0 and not output.playing
+    with pytest.raises(UIError):
+        output.write(numpy.zeros((480, 2), dtype=numpy.float32))
+    with pytest.raises(UIError):
+        output.play()
+    # Closing twice does nothing.
+    output.close()
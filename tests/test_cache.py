@@ -0,0 +1,54 @@
+from dragiyski.ui import ResourceCache
+from dragiyski.ui._thread import run_in_event_thread
+import pytest
+
+
+class Resource:
+    def __init__(self):
+        self.destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def test_evicts_least_recently_used():
+    cache = ResourceCache(100)
+    resources = [Resource() for _ in range(3)]
+    cache.put('a', resources[0], 40)
+    cache.put('b', resources[1], 40)
+    assert cache.get('a') is resources[0]
+    cache.put('c', resources[2], 40)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert (cache.size, cache.evictions, cache.hits) == (80, 1, 1)
+    # Evicted resources are released in the UI event thread.
+    run_in_event_thread(lambda: None)
+    assert resources[1].destroyed and not resources[0].destroyed
+
+
+def test_budget_change_evicts():
+    cache = ResourceCache(100)
+    resources = [Resource() for _ in range(4)]
+    for (index, resource) in enumerate(resources):
+        cache.put(index, resource, 25)
+    cache.budget = 50
+    assert list(key for key in range(4) if key in cache) == [2, 3]
+    assert cache.stats() == {'count': 2, 'size': 50, 'budget': 50, 'hits': 0, 'misses': 0, 'evictions': 2}
+    with pytest.raises(ValueError):
+        cache.put('large', Resource(), 51)
+    removed = cache.remove(3)
+    cache.clear()
+    run_in_event_thread(lambda: None)
+    assert [resource.destroyed for resource in resources] == [True, True, True, False]
+    assert removed is resources[3] and len(cache) == 0
+
+
+def test_get_or_create():
+    cache = ResourceCache(100)
+    created = []
+
+    def factory():
+        created.append(Resource())
+        return created[-1]
+
+    assert cache.get_or_create('a', factory, 10) is cache.get_or_create('a', factory, 10)
+    assert len(created) == 1 and (cache.hits, cache.misses) == (1, 1)
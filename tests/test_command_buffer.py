@@ -0,0 +1,62 @@
+from dragiyski.ui import CommandBuffer
+from dragiyski.ui.geometry import Rectangle
+import numpy
+import threading
+import pytest
+
+
+def rgb(pixels, x: int, y: int):
+    # ARGB8888 is stored as B, G, R, A on little endian machines.
+    blue, green, red, alpha = pixels[y, x]
+    return (red, green, blue)
+
+
+def test_replay(window):
+    renderer = window.renderer(software=True)
+    texture = renderer.create_texture(4, 4)
+    texture.upload(numpy.full((4, 4, 4), 0x80, dtype=numpy.uint8))
+    commands = CommandBuffer(64)
+
+    def record():
+        commands.clear(0, 0, 0)
+        commands.color(255, 0, 0)
+        for index in range(10):
+            commands.fill_rect(index * 2, 0, 1, 1)
+        commands.color(0, 255, 0)
+        commands.line(0, 10, 9, 10)
+        commands.point(20, 20)
+        commands.draw_rect(30, 30, 5, 5)
+        commands.color(0, 0, 255)
+        commands.fill_rects(numpy.array([[40, 0, 2, 2], [44, 0, 2, 2]]))
+        commands.copy(texture, destination=Rectangle(50, 40, 4, 4))
+
+    # Recorded without the UI event thread.
+    thread = threading.Thread(target=record)
+    thread.start()
+    thread.join()
+    # The ten rectangles are merged into a single command.
+    assert commands.commands == 11 and commands.capacity >= commands.size > 64
+    renderer.submit(commands, present=True)
+    pixels = renderer.read_pixels()
+    assert rgb(pixels, 0, 0) == rgb(pixels, 18, 0) == (255, 0, 0) and rgb(pixels, 1, 0) == (0, 0, 0)
+    assert rgb(pixels, 5, 10) == rgb(pixels, 20, 20) == rgb(pixels, 30, 32) == (0, 255, 0)
+    assert rgb(pixels, 32, 32) == (0, 0, 0)
+    assert rgb(pixels, 41, 1) == rgb(pixels, 45, 1) == (0, 0, 255) and rgb(pixels, 43, 1) == (0, 0, 0)
+    assert rgb(pixels, 51, 41) == (0x80, 0x80, 0x80)
+    capacity = commands.capacity
+    commands.reset()
+    assert (commands.size, commands.commands, commands.capacity) == (0, 0, capacity)
+    texture.destroy()
+
+
+def test_texture_of_another_renderer(window):
+    import dragiyski.ui as ui
+    other_window = ui.Window.create(title='other', position=ui.Window.Position(0, 0, 8, 8), visible=False)
+    try:
+        texture = other_window.renderer(software=True).create_texture(4, 4)
+        commands = CommandBuffer()
+        commands.copy(texture)
+        with pytest.raises(ValueError):
+            window.renderer(software=True).submit(commands)
+    finally:
+        other_window.destroy()
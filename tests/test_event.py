@@ -0,0 +1,56 @@
+from dragiyski.ui import DisplayEvent, DisplayOrientationEvent, WindowEvent, WindowPositionEvent, WindowSizeEvent
+from dragiyski.ui._event import create_event
+from dragiyski.ui._thread import run_in_event_thread
+from sdl2 import (
+    SDL_DISPLAYEVENT,
+    SDL_DISPLAYEVENT_CONNECTED,
+    SDL_DISPLAYEVENT_ORIENTATION,
+    SDL_Event,
+    SDL_WINDOWEVENT,
+    SDL_WINDOWEVENT_EXPOSED,
+    SDL_WINDOWEVENT_MOVED,
+    SDL_WINDOWEVENT_RESIZED
+)
+
+
+def display_event(event: int, data1: int = 0) -> SDL_Event:
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_DISPLAYEVENT
+    sdl_event.display.timestamp = 1234
+    sdl_event.display.display = 1
+    sdl_event.display.event = event
+    sdl_event.display.data1 = data1
+    return sdl_event
+
+
+def window_event(window, event: int, data1: int = 0, data2: int = 0) -> SDL_Event:
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_WINDOWEVENT
+    sdl_event.window.timestamp = 1234
+    sdl_event.window.windowID = window.id
+    sdl_event.window.event = event
+    sdl_event.window.data1 = data1
+    sdl_event.window.data2 = data2
+    return sdl_event
+
+
+def test_display_events():
+    event = create_event(display_event(SDL_DISPLAYEVENT_CONNECTED))
+    assert type(event) is DisplayEvent
+    assert (event.type, event.timestamp, event.display) == ('display_connected', 1234, 1)
+    event = create_event(display_event(SDL_DISPLAYEVENT_ORIENTATION, 2))
+    assert isinstance(event, DisplayOrientationEvent)
+    assert (event.type, event.display, event.orientation) == ('display_orientation', 1, 2)
+
+
+def test_window_events(window):
+    # Window(id) resolves the window in the UI event thread only.
+    event = run_in_event_thread(create_event, window_event(window, SDL_WINDOWEVENT_EXPOSED))
+    assert type(event) is WindowEvent
+    assert (event.type, event.timestamp, event.window) == ('window_exposed', 1234, window)
+    event = run_in_event_thread(create_event, window_event(window, SDL_WINDOWEVENT_RESIZED, 80, 60))
+    assert isinstance(event, WindowSizeEvent)
+    assert (event.type, event.width, event.height) == ('window_resized', 80, 60)
+    event = run_in_event_thread(create_event, window_event(window, SDL_WINDOWEVENT_MOVED, 5, 7))
+    assert isinstance(event, WindowPositionEvent)
+    assert (event.type, event.x, event.y, event.window) == ('window_moved', 5, 7, window)
@@ -0,0 +1,38 @@
+from dragiyski.ui import FrameChannel
+import numpy
+
+
+def test_present_newest_frame(window):
+    with FrameChannel.create(64, 48, slots=3) as channel, FrameChannel.attach(channel.name) as producer:
+        assert (producer.width, producer.height, producer.slot_count) == (64, 48, 3)
+        assert not channel.present(window)
+        producer.write(numpy.full((48, 64, 4), 1, dtype=numpy.uint8))
+        producer.write(numpy.full((48, 64, 4), 2, dtype=numpy.uint8))
+        assert channel.has_new_frame()
+        assert channel.present(window)
+        assert (window.capture()[..., :3] == 2).all()
+        assert (channel.presented, channel.dropped) == (1, 1)
+        # Nothing new is published.
+        assert not channel.present(window)
+
+
+def test_frame_being_written_is_not_presented(window):
+    with FrameChannel.create(64, 48, slots=2) as channel, FrameChannel.attach(channel.name, slots=[0]) as producer:
+        with producer.frame() as pixels:
+            pixels[...] = 3
+            # The sequence of the slot is odd until the frame is published.
+            assert not channel.has_new_frame()
+            assert not channel.present(window)
+        assert channel.present(window)
+        assert (window.capture()[..., :3] == 3).all()
+
+
+def test_failed_frame_is_not_published(window):
+    with FrameChannel.create(64, 48) as channel:
+        try:
+            with channel.frame() as pixels:
+                pixels[...] = 4
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert not channel.has_new_frame()
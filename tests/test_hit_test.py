@@ -0,0 +1,63 @@
+from dragiyski.ui.geometry import Rectangle
+from dragiyski.ui.hit_test import HitTable, border_regions, hit_kinds
+from dragiyski.ui._thread import run_in_event_thread
+import random
+import pytest
+
+
+def linear_scan(regions, x: int, y: int) -> str:
+    for (kind, rectangle) in regions:
+        if rectangle.left <= x <= rectangle.right and rectangle.top <= y <= rectangle.bottom:
+            return kind
+    return 'normal'
+
+
+def test_table_matches_linear_scan():
+    generator = random.Random(0)
+    kinds = list(hit_kinds)
+    for _ in range(20):
+        regions = [
+            (generator.choice(kinds), Rectangle(generator.randrange(-10, 90), generator.randrange(-10, 90), generator.randrange(1, 40), generator.randrange(1, 40)))
+            for _ in range(generator.randrange(0, 12))
+        ]
+        table = HitTable(regions)
+        for y in range(-12, 112, 3):
+            for x in range(-12, 112, 3):
+                assert table.kind(x, y) == linear_scan(regions, x, y)
+                assert table.lookup(x, y) == hit_kinds[table.kind(x, y)]
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        HitTable([('close', Rectangle(0, 0, 10, 10))])
+
+
+def test_border_regions():
+    layout = border_regions(6, 24, corner=10)
+    regions = layout(200, 100)
+    table = HitTable(regions)
+    for y in range(100):
+        for x in range(200):
+            assert table.kind(x, y) == linear_scan(regions, x, y)
+    assert table.kind(0, 0) == 'resize_top_left' and table.kind(9, 9) == 'resize_top_left'
+    assert table.kind(199, 99) == 'resize_bottom_right' and table.kind(199, 0) == 'resize_top_right'
+    assert table.kind(100, 0) == 'resize_top' and table.kind(100, 99) == 'resize_bottom'
+    assert table.kind(0, 50) == 'resize_left' and table.kind(199, 50) == 'resize_right'
+    assert table.kind(100, 6) == 'draggable' and table.kind(100, 29) == 'draggable' and table.kind(100, 30) == 'normal'
+    with pytest.raises(ValueError):
+        border_regions(0)
+
+
+def test_relayout_on_resize(window):
+    width, height = window.size
+    window.set_hit_regions(border_regions(4))
+    assert window.hit_test(width - 1, height // 2) == 'resize_right'
+    window.size = (width + 100, height + 50)
+    # The resize events are processed before the task queued after them.
+    run_in_event_thread(lambda: None)
+    assert window.hit_test(width + 99, height // 2) == 'resize_right'
+    assert window.hit_test(width - 1, height // 2) == 'normal'
+    window.set_hit_regions([('draggable', Rectangle(0, 0, 10, 10))])
+    assert window.hit_test(5, 5) == 'draggable' and window.hit_test(0, height // 2) == 'normal'
+    window.set_hit_regions(None)
+    assert window.hit_test(5, 5) == 'normal'
@@ -0,0 +1,62 @@
+from dragiyski.ui import inject, input
+from dragiyski.ui._thread import run_in_event_thread
+from sdl2 import SDL_MOUSEMOTION, SDL_WINDOWEVENT, SDL_WINDOWEVENT_EXPOSED
+import numpy
+import queue
+import time
+import pytest
+
+
+def test_inject_descriptions(window):
+    received = queue.SimpleQueue()
+    window.start_worker(on_event=received.put)
+    events = [{'type': 'window', 'event': 'exposed'}, {'type': 'mouse_motion', 'x': 5, 'y': 6, 'xrel': 5, 'yrel': 6}]
+    assert inject.inject(events, window=window) == 2
+    first = received.get(timeout=5)
+    second = received.get(timeout=5)
+    assert (first.type, first.window.windowID, first.window.event) == (SDL_WINDOWEVENT, window.id, SDL_WINDOWEVENT_EXPOSED)
+    assert (second.type, second.motion.windowID, second.motion.x, second.motion.y) == (SDL_MOUSEMOTION, window.id, 5, 6)
+    assert first.common.timestamp > 0
+
+
+def test_inject_updates_input_state(window):
+    input.mouse_state()
+    key = input.scancode('Space')
+    inject.inject([{'type': 'key_down', 'scancode': key}, {'type': 'mouse_button_down', 'button': 1, 'x': 3, 'y': 4}], window=window)
+    run_in_event_thread(lambda: None)
+    state = input.mouse_state()
+    assert input.keyboard_state()[key] and state.left and (state.x, state.y) == (3, 4)
+    inject.inject([{'type': 'key_up', 'scancode': key}, {'type': 'mouse_button_up', 'button': 1, 'x': 3, 'y': 4}], window=window)
+    run_in_event_thread(lambda: None)
+    assert not input.keyboard_state()[key] and not input.mouse_state().left
+
+
+def test_inject_array(window):
+    events = numpy.zeros(1000, dtype=inject.event_dtype('window'))
+    events['type'] = SDL_WINDOWEVENT
+    events['event'] = SDL_WINDOWEVENT_EXPOSED
+    assert inject.inject(events, window=window) == 1000
+    # The caller's array is not modified.
+    assert (events['windowID'] == 0).all() and (events['timestamp'] == 0).all()
+    run_in_event_thread(lambda: None)
+    with pytest.raises(ValueError):
+        inject.inject(numpy.zeros(1, dtype=numpy.int32))
+
+
+def test_event_generator(window):
+    received = queue.SimpleQueue()
+    window.start_worker(on_event=received.put)
+    events = numpy.zeros(1, dtype=inject.event_dtype('motion'))
+    events['type'] = SDL_MOUSEMOTION
+    with inject.EventGenerator(events, 2000, window=window, duration=0.2) as generator:
+        assert generator.rate == 2000
+    assert generator.injected + generator.dropped == 400
+    assert generator.elapsed >= 0.2
+    deadline = time.monotonic() + 5
+    count = 0
+    while count < generator.injected and time.monotonic() < deadline:
+        received.get(timeout=5)
+        count += 1
+    assert count == generator.injected
+    with pytest.raises(ValueError):
+        inject.EventGenerator(events, 0)
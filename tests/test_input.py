@@ -0,0 +1,62 @@
+from dragiyski.ui import input
+from dragiyski.ui._thread import run_in_event_thread
+from sdl2 import (
+    SDL_BUTTON_RIGHT,
+    SDL_Event,
+    SDL_KEYDOWN,
+    SDL_KEYUP,
+    SDL_MOUSEBUTTONDOWN,
+    SDL_MOUSEBUTTONUP,
+    SDL_MOUSEMOTION,
+    SDL_PushEvent
+)
+
+
+def push(sdl_event: SDL_Event):
+    assert SDL_PushEvent(sdl_event) == 1
+    # The events are processed before the task queued after them.
+    run_in_event_thread(lambda: None)
+
+
+def test_keyboard_state(window):
+    keys = input.keyboard_state()
+    assert keys is input.keyboard_state()
+    assert not keys.flags.writeable
+    key = input.scancode('A')
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_KEYDOWN
+    sdl_event.key.windowID = window.id
+    sdl_event.key.keysym.scancode = key
+    push(sdl_event)
+    assert keys[key] and keys.sum() == 1
+    sdl_event.type = SDL_KEYUP
+    push(sdl_event)
+    assert not keys[key]
+
+
+def test_mouse_state(window):
+    input.mouse_state()
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_MOUSEMOTION
+    sdl_event.motion.windowID = window.id
+    for (x, y) in ((5, 7), (8, 3)):
+        sdl_event.motion.x = x
+        sdl_event.motion.y = y
+        sdl_event.motion.xrel = 2
+        sdl_event.motion.yrel = -1
+        push(sdl_event)
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_MOUSEBUTTONDOWN
+    sdl_event.button.windowID = window.id
+    sdl_event.button.button = SDL_BUTTON_RIGHT
+    sdl_event.button.x = 9
+    sdl_event.button.y = 4
+    push(sdl_event)
+    state = input.mouse_state()
+    assert (state.x, state.y, state.relative_x, state.relative_y) == (9, 4, 4, -2)
+    assert state.right and not state.left
+    # The relative motion is reset by each call.
+    assert input.mouse_state().relative_x == 0
+    sdl_event.type = SDL_MOUSEBUTTONUP
+    push(sdl_event)
+    assert not input.mouse_state().right
@@ -0,0 +1,74 @@
+from dragiyski.ui import joystick
+from dragiyski.ui._thread import post_in_event_thread, run_in_event_thread
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def device():
+    device_index = joystick.attach_virtual(axes=2, buttons=3, hats=1)
+    try:
+        device = joystick.Joystick.open(device_index, capacity=8)
+        try:
+            yield device
+        finally:
+            # An open joystick keeps the UI event thread (and the test process) alive.
+            device.close()
+    finally:
+        joystick.detach_virtual(device_index)
+
+
+def wait_for(device, kind: int, index: int, value: int):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        latest = device.latest(1)
+        if len(latest) > 0 and (latest['kind'][0], latest['index'][0], latest['value'][0]) == (kind, index, value):
+            return
+        time.sleep(0.005)
+    raise TimeoutError
+
+
+def test_virtual_samples(device):
+    assert (device.axes, device.buttons, device.hats) == (2, 3, 1)
+    device.set_virtual_axis(0, 1000)
+    wait_for(device, joystick.AXIS, 0, 1000)
+    device.set_virtual_button(1, True)
+    wait_for(device, joystick.BUTTON, 1, 1)
+    device.set_virtual_hat(0, 1)
+    wait_for(device, joystick.HAT, 0, 1)
+    samples, position = device.read()
+    assert position == device.position
+    assert list(samples['kind'][-3:]) == [joystick.AXIS, joystick.BUTTON, joystick.HAT]
+    assert list(samples['index'][-3:]) == [0, 1, 0]
+    assert list(samples['value'][-3:]) == [1000, 1, 1]
+    assert len(device.read(position)[0]) == 0
+
+
+def test_ring_buffer_overwrites_oldest(device):
+    start = device.position
+    for value in range(1, 13):
+        # libSDL2 reports only the last value set before the devices are updated.
+        device.set_virtual_axis(1, value * 100)
+        wait_for(device, joystick.AXIS, 1, value * 100)
+    samples, position = device.read()
+    # Only the newest `capacity` samples are kept.
+    assert position >= start + 12 and len(samples) == device.capacity == 8
+    assert list(samples['value']) == [value * 100 for value in range(5, 13)]
+    assert list(device.latest(2)['value']) == [1100, 1200]
+    # A reader that fell behind gets what is left in the buffer.
+    assert len(device.read(start)[0]) == 8
+
+
+def test_open_and_close_in_event_thread():
+    def open_and_close():
+        device_index = joystick.attach_virtual()
+        # The listener of the device is removed before the UI event thread checks for listeners.
+        joystick.Joystick.open(device_index).close()
+        joystick.detach_virtual(device_index)
+
+    run_in_event_thread(open_and_close)
+    # The UI event thread is still there to run a task.
+    ran = threading.Event()
+    post_in_event_thread(ran.set)
+    assert ran.wait(5)
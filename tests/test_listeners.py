@@ -0,0 +1,81 @@
+from dragiyski.ui import _event, _thread
+from dragiyski.ui._event_emitter import EventEmitter
+from dragiyski.ui._thread import run_in_event_thread
+import dragiyski.ui as ui
+import gc
+import tracemalloc
+
+
+class View:
+    def __init__(self):
+        self.payload = bytearray(10000)
+
+    def on_event(self, *args):
+        pass
+
+
+def registrations(emitter: EventEmitter):
+    return (
+        len(_thread.window_map),
+        len(_thread.event_listeners),
+        sum(len(listeners) for listeners in _event.event_listener_by_type.values()),
+        len(emitter._EventEmitter__listeners.get('view', ()))
+    )
+
+
+def test_cycles_do_not_leak():
+    emitter = EventEmitter()
+
+    def cycles(count: int):
+        for _ in range(count):
+            cycle()
+
+    def cycle():
+        window = ui.Window.create(title='cycle', position=ui.Window.Position(0, 0, 32, 32), visible=False)
+        view = View()
+        emitter.add_event_listener('view', view.on_event, weak=True)
+        ui.ui_event('window_resized', window=window)(view.on_event)
+        ui.ui_event('window_moved', weak=True)(view.on_event)
+        _thread.add_event_listener(view, weak=True)
+        window.destroy()
+
+    # In the UI event thread, so that the calls do not wait for it to wake up (the dummy video driver polls for events).
+    run_in_event_thread(cycles, 100)
+    gc.collect()
+    assert registrations(emitter) == (0, 0, 0, 0)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        run_in_event_thread(cycles, 5000)
+        gc.collect()
+        grown = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert registrations(emitter) == (0, 0, 0, 0)
+    # A leaked view alone would be 10KB per cycle.
+    assert grown < 200000
+
+
+def test_weak_listener_dropped_after_collect():
+    emitter = EventEmitter()
+    view = View()
+    assert emitter.add_event_listener('view', view.on_event, weak=True)
+    # Already registered, weakly or not.
+    assert not emitter.add_event_listener('view', view.on_event)
+    _thread.add_event_listener(view, weak=True)
+    assert registrations(emitter)[1:] == (1, 0, 1)
+    del view
+    gc.collect()
+    assert registrations(emitter)[1:] == (0, 0, 0)
+
+
+def test_strong_listener_kept():
+    emitter = EventEmitter()
+    view = View()
+    assert emitter.add_event_listener('view', view.on_event)
+    assert emitter.remove_event_listener('view', view.on_event)
+    assert not emitter.remove_event_listener('view', view.on_event)
+    function = ui.ui_event('quit')(lambda: None)
+    assert len(_thread.event_listeners) == 1
+    _event.event_listener_by_type['quit'][0].remove()
+    assert function is not None and registrations(emitter)[1:] == (0, 0, 0)
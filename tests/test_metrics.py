@@ -0,0 +1,56 @@
+from dragiyski.ui import metrics
+from dragiyski.ui._thread import run_in_event_thread
+from sdl2 import SDL_Event, SDL_PushEvent, SDL_WINDOWEVENT, SDL_WINDOWEVENT_EXPOSED
+import queue
+import pytest
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    try:
+        yield
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def push_exposed(window):
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_WINDOWEVENT
+    sdl_event.window.windowID = window.id
+    sdl_event.window.event = SDL_WINDOWEVENT_EXPOSED
+    assert SDL_PushEvent(sdl_event) == 1
+    run_in_event_thread(lambda: None)
+
+
+def test_snapshot(window, enabled):
+    for _ in range(10):
+        run_in_event_thread(lambda: None)
+    # Without a worker, no listener runs for the event.
+    push_exposed(window)
+    received = queue.SimpleQueue()
+    window.start_worker(on_event=received.put)
+    push_exposed(window)
+    received.get(timeout=5)
+    snapshot = metrics.snapshot()
+    assert snapshot['enabled']
+    assert snapshot['events_received']['windowevent'] >= 2
+    assert snapshot['events_dispatched'] == {'windowevent': 1}
+    histograms = snapshot['histograms']
+    assert histograms['task_time']['count'] >= 10
+    assert histograms['call_round_trip']['count'] >= 10
+    assert histograms['listener_latency']['count'] == 1
+    task_time = histograms['task_time']
+    assert task_time['min'] <= task_time['p50'] <= task_time['p99'] <= task_time['max']
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    assert snapshot['events_received'] == {} and snapshot['histograms']['task_time']['count'] == 0
+
+
+def test_disabled():
+    metrics.reset()
+    assert not metrics.is_enabled()
+    run_in_event_thread(lambda: None)
+    assert metrics.snapshot()['histograms']['task_time']['count'] == 0
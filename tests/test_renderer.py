@@ -0,0 +1,34 @@
+import numpy
+import pytest
+
+
+def rgb(pixels, x: int, y: int):
+    # ARGB8888 is stored as B, G, R, A on little endian machines.
+    blue, green, red, alpha = pixels[y, x]
+    return (red, green, blue)
+
+
+def test_primitives(window):
+    renderer = window.renderer(software=True)
+    renderer.clear()
+    renderer.draw_points(numpy.array([[1, 1], [3, 1]], dtype=numpy.int32), (255, 0, 0))
+    renderer.draw_points(numpy.array([[5.0, 1.0]], dtype=numpy.float32), (0, 255, 0, 255))
+    renderer.draw_lines([[0, 10], [9, 10], [9, 15]], (0, 0, 255))
+    renderer.fill_rects(numpy.array([[20, 20, 4, 4]], dtype=numpy.float64), (255, 255, 0))
+    renderer.draw_rects(numpy.array([[30, 30, 5, 5]], dtype=numpy.int64), (0, 255, 255))
+    # Nothing to draw.
+    renderer.fill_rects(numpy.zeros((0, 4), dtype=numpy.int32), (1, 2, 3))
+    pixels = renderer.read_pixels()
+    assert rgb(pixels, 1, 1) == rgb(pixels, 3, 1) == (255, 0, 0) and rgb(pixels, 2, 1) == (0, 0, 0)
+    assert rgb(pixels, 5, 1) == (0, 255, 0)
+    assert rgb(pixels, 5, 10) == rgb(pixels, 9, 13) == (0, 0, 255)
+    assert rgb(pixels, 21, 21) == rgb(pixels, 23, 23) == (255, 255, 0) and rgb(pixels, 24, 24) == (0, 0, 0)
+    assert rgb(pixels, 30, 32) == rgb(pixels, 34, 34) == (0, 255, 255) and rgb(pixels, 32, 32) == (0, 0, 0)
+
+
+def test_invalid_shape(window):
+    renderer = window.renderer(software=True)
+    with pytest.raises(ValueError):
+        renderer.draw_points(numpy.zeros((3, 3), dtype=numpy.int32))
+    with pytest.raises(ValueError):
+        renderer.fill_rects(numpy.zeros((2, 2), dtype=numpy.int32))
@@ -0,0 +1,85 @@
+from dragiyski.ui._thread import (
+    get_event_thread,
+    post_in_event_thread,
+    run_in_event_thread,
+    run_in_event_thread_async,
+    run_in_event_thread_async_with_timeout,
+    run_in_event_thread_with_timeout
+)
+import asyncio
+import threading
+import time
+import pytest
+
+
+def test_execute():
+    assert run_in_event_thread(threading.current_thread) is get_event_thread()
+    with pytest.raises(ZeroDivisionError):
+        run_in_event_thread(lambda: 1 / 0)
+
+
+def test_execute_until_timeout_withdraws_task():
+    ran = []
+    gate = threading.Event()
+    # Keep the UI event thread busy, so that the tasks queued meanwhile have not started.
+    blocker = post_in_event_thread(gate.wait)
+    with pytest.raises(TimeoutError):
+        run_in_event_thread_with_timeout(0.05, ran.append, 'timeout')
+    task = post_in_event_thread(ran.append, 'cancel')
+    assert task.cancel()
+    assert task.cancelled() and task.done()
+    gate.set()
+    blocker.wait()
+    assert run_in_event_thread(lambda: ran) == []
+
+
+def test_execute_until_deadline_passed():
+    with pytest.raises(TimeoutError):
+        get_event_thread().execute_until(time.monotonic() - 1, lambda: None)
+    assert run_in_event_thread_with_timeout(1, lambda: 5) == 5
+
+
+def test_cancel_started_task():
+    started = threading.Event()
+    gate = threading.Event()
+
+    def work():
+        started.set()
+        gate.wait()
+        return 3
+
+    task = post_in_event_thread(work)
+    started.wait()
+    assert not task.cancel()
+    gate.set()
+    assert task.wait(5)
+    assert task.result() == 3 and not task.cancelled()
+
+
+def test_async_deadline_and_cancel():
+    ran = []
+    gate = threading.Event()
+
+    async def main():
+        blocker = post_in_event_thread(gate.wait)
+        with pytest.raises(TimeoutError):
+            await run_in_event_thread_async_with_timeout(0.05, ran.append, 'timeout')
+        future = run_in_event_thread_async(ran.append, 'cancel')
+        future.cancel()
+        # The task is withdrawn by a done callback, in the next iteration of the loop.
+        await asyncio.sleep(0)
+        gate.set()
+        blocker.wait()
+        assert await run_in_event_thread_async(lambda: 'after') == 'after'
+
+    asyncio.run(main())
+    assert ran == []
+
+
+def test_async_result():
+    async def main():
+        assert await run_in_event_thread_async(lambda: 42) == 42
+        with pytest.raises(ZeroDivisionError):
+            await run_in_event_thread_async_with_timeout(1, lambda: 1 / 0)
+
+    asyncio.run(main())
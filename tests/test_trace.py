@@ -0,0 +1,47 @@
+from dragiyski.ui import trace
+from dragiyski.ui._thread import run_in_event_thread
+import json
+import pytest
+
+
+@pytest.fixture
+def enabled():
+    trace.enable(capacity=16)
+    try:
+        yield
+    finally:
+        trace.disable()
+        trace.clear()
+
+
+def named_task():
+    pass
+
+
+def test_dump(enabled, tmp_path):
+    with trace.span('user_span', frame=1):
+        run_in_event_thread(named_task)
+    trace.dump(tmp_path / 'trace.json')
+    with open(tmp_path / 'trace.json', encoding='utf-8') as file:
+        data = json.load(file)
+    events = data['traceEvents']
+    spans = {event['name']: event for event in events if event['ph'] == 'X'}
+    assert spans['user_span']['args'] == {'frame': '1'} and spans['user_span']['cat'] == 'user'
+    assert any(name.endswith('named_task') for name in spans)
+    for event in spans.values():
+        assert event['dur'] >= 0 and isinstance(event['ts'], float) and isinstance(event['tid'], int)
+    names = {event['args']['name'] for event in events if event['ph'] == 'M'}
+    assert 'dragiyski.ui.event' in names
+
+
+def test_ring_capacity(enabled):
+    for index in range(40):
+        with trace.span(f'span{index}'):
+            pass
+    spans = [event['name'] for event in trace.events() if event['ph'] == 'X']
+    # The oldest spans are overwritten.
+    assert spans == [f'span{index}' for index in range(24, 40)]
+    trace.disable()
+    with trace.span('ignored'):
+        pass
+    assert 'ignored' not in {event['name'] for event in trace.events()}
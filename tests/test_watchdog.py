@@ -0,0 +1,33 @@
+from dragiyski.ui import watchdog
+from dragiyski.ui._thread import run_in_event_thread
+import time
+
+
+def stalled_task():
+    time.sleep(0.3)
+
+
+def test_reports_stalled_task():
+    reports = []
+    watchdog.start(0.1, reports.append, interval=0.02)
+    try:
+        assert watchdog.is_running()
+        run_in_event_thread(stalled_task)
+        run_in_event_thread(lambda: None)
+    finally:
+        watchdog.stop()
+    assert len(reports) == 1
+    report = reports[0]
+    assert isinstance(report, watchdog.StallReport)
+    assert report.task.endswith('stalled_task') and 0.1 <= report.duration < 0.3
+    assert any('stalled_task' in line for line in report.stack)
+    assert 'stalled_task' in report.format()
+
+
+def test_stopped():
+    reports = []
+    watchdog.start(0.05, reports.append)
+    watchdog.stop()
+    assert not watchdog.is_running()
+    run_in_event_thread(stalled_task)
+    assert reports == []
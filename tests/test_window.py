@@ -0,0 +1,98 @@
+from dragiyski.ui import _thread
+from dragiyski.ui._thread import run_in_event_thread
+from sdl2 import SDL_Event, SDL_PushEvent, SDL_SetWindowSize, SDL_WINDOWEVENT, SDL_WINDOWEVENT_EXPOSED
+import dragiyski.ui as ui
+import numpy
+import pytest
+import queue
+
+
+def test_headless_enabled():
+    assert ui.headless.is_enabled()
+
+
+def test_create_and_destroy():
+    window = ui.Window.create(title='test', position=ui.Window.Position(0, 0, 32, 24), visible=False)
+    window_id = window.id
+    assert window_id is not None
+    assert window.size == (32, 24)
+    window.destroy()
+    assert window.id is None
+    with pytest.raises(ui.Window.NotFound):
+        window.surface()
+
+
+def test_create_rejects_unknown_arguments():
+    with pytest.raises(TypeError):
+        ui.Window.create(size=(32, 24))
+
+def test_surface_round_trip(window):
+    surface = window.surface()
+    assert (surface.width, surface.height) == (64, 48)
+    frame = numpy.random.default_rng(0).integers(0, 256, (48, 64, surface.bytes_per_pixel), dtype=numpy.uint8)
+    with surface:
+        surface.array()[...] = frame
+    surface.update()
+    with window.surface() as current:
+        assert numpy.array_equal(current.array(), frame)
+
+
+def test_capture(window):
+    surface = window.surface()
+    with surface:
+        surface.array()[...] = 0x40
+    surface.update()
+    assert (window.capture() == 0x40).all()
+
+
+def test_present_texture(window):
+    renderer = window.renderer(software=True)
+    texture = renderer.create_texture(64, 48)
+    frame = numpy.zeros((48, 64, 4), dtype=numpy.uint8)
+    # ARGB8888 is stored as B, G, R, A on little endian machines.
+    frame[..., 0] = 10
+    frame[..., 1] = 20
+    frame[..., 2] = 30
+    frame[..., 3] = 255
+    texture.upload(frame)
+    renderer.clear()
+    renderer.copy(texture)
+    renderer.present()
+    assert numpy.array_equal(renderer.read_pixels(), frame)
+    texture.destroy()
+
+
+def test_texture_upload(window):
+    renderer = window.renderer(software=True)
+    texture = renderer.create_texture(64, 48)
+    frame = numpy.random.default_rng(0).integers(0, 256, (48, 64, texture.bytes_per_pixel), dtype=numpy.uint8)
+    texture.upload(frame)
+    with texture:
+        assert numpy.array_equal(texture.array(), frame)
+    renderer.clear()
+    renderer.copy(texture)
+    renderer.present()
+    texture.destroy()
+
+
+def test_state_follows_resize_without_listener(window):
+    # Only the window keeps the UI event thread pumping the libSDL2 events.
+    assert len(_thread.event_listeners) == 0
+    run_in_event_thread(SDL_SetWindowSize, window._Window__window, 100, 80)
+    # The resize events are queued before the task, so they are processed by the time it returns.
+    run_in_event_thread(lambda: None)
+    assert window.size == (100, 80)
+
+
+def test_worker_receives_window_events(window):
+    received = queue.SimpleQueue()
+    worker = window.start_worker(on_event=received.put)
+    assert _thread.event_listeners == frozenset([worker])
+    sdl_event = SDL_Event()
+    sdl_event.type = SDL_WINDOWEVENT
+    sdl_event.window.windowID = window.id
+    sdl_event.window.event = SDL_WINDOWEVENT_EXPOSED
+    assert SDL_PushEvent(sdl_event) == 1
+    assert received.get(timeout=5).window.event == SDL_WINDOWEVENT_EXPOSED
+    window.destroy()
+    assert len(_thread.event_listeners) == 0